@@ -0,0 +1,109 @@
+import os
+import json
+import tempfile
+import threading
+
+
+CONTENT_PATH = 'anti_bq_content.json'
+
+
+class AntiBQContentStore:
+    """Cached view of anti_bq_content.json shared by the dialog and workers.
+
+    The file is parsed again only when its mtime/size changes, and writes go
+    through a temp file + rename so readers never see a torn file.
+    """
+
+    def __init__(self, path=CONTENT_PATH):
+        self.path = path
+        self.lock = threading.RLock()
+        self.data = {}
+        self.stamp = None
+        self.version = 0
+
+    def snapshot(self):
+        # Trả về dict dùng chung (chỉ đọc) cùng số phiên bản để bên ngoài biết khi nào cần build lại index
+        with self.lock:
+            self._refresh()
+            return self.version, self.data
+
+    def load(self):
+        with self.lock:
+            self._refresh()
+            return dict(self.data)
+
+    def get(self, title):
+        with self.lock:
+            self._refresh()
+            return self.data.get(title)
+
+    def set(self, title, content):
+        with self.lock:
+            self._refresh()
+            data = dict(self.data)
+            data[title] = content
+            self.save(data)
+
+    def update(self, entries):
+        # Đọc-sửa-ghi trong cùng một khóa để không mất bản ghi của worker khác
+        with self.lock:
+            self._refresh()
+            data = dict(self.data)
+            data.update(entries)
+            self.save(data)
+
+    def delete(self, title):
+        with self.lock:
+            self._refresh()
+            if title in self.data:
+                data = dict(self.data)
+                del data[title]
+                self.save(data)
+
+    def save(self, data):
+        with self.lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.anti_bq_', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            # Dict mới thay cho dict cũ, các snapshot đang được đọc không bị sửa dưới tay
+            self.data = dict(data)
+            self.stamp = self._stat()
+            self.version += 1
+
+    def _refresh(self):
+        stamp = self._stat()
+        if stamp == self.stamp:
+            return
+        if stamp is None:
+            data = {}
+        else:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except ValueError as e:
+                # File hỏng/sửa tay sai: báo một lần cho phiên bản file này, giữ dữ liệu đọc được lần trước
+                print(f"Không đọc được {self.path}, dùng nội dung đã tải trước đó: {str(e)}")
+                self.stamp = stamp
+                return
+        self.data = data
+        self.stamp = stamp
+        self.version += 1
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+anti_bq_store = AntiBQContentStore()
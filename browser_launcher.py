@@ -0,0 +1,280 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+import os
+import json
+import time
+import psutil
+import tempfile
+import threading
+from subprocess import CREATE_NO_WINDOW
+import win32api
+
+from .worker_pool import find_free_port
+
+
+DRIVER_INDEX_PATH = os.path.join(os.path.expanduser('~'), 'AppData', 'Local', 'ChromeDriver', 'driver_index.json')
+FIREFOX_BINARY = r"C:/Program Files/Mozilla Firefox/firefox.exe"
+
+# Chế độ nhẹ: Studio vẫn hoạt động khi không tải ảnh, font, avatar và video xem trước
+LEAN_BLOCKED_URLS = [
+    '*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.m4a',
+    '*i.ytimg.com/*', '*yt3.ggpht.com/*', '*googlevideo.com/*',
+]
+
+LEAN_CHROME_ARGS = [
+    '--disable-extensions',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--blink-settings=imagesEnabled=false',
+    '--autoplay-policy=user-gesture-required',
+    '--mute-audio',
+    '--disable-features=Translate,MediaRouter,OptimizationHints',
+]
+
+LEAN_CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+}
+
+LEAN_FIREFOX_PREFS = {
+    'permissions.default.image': 2,
+    'gfx.downloadable_fonts.enabled': False,
+    'browser.display.use_document_fonts': 0,
+    'media.autoplay.default': 5,
+    'media.preload.default': 0,
+    'media.preload.auto': 0,
+    'dom.min_background_timeout_value': 4,
+    'dom.timeout.enable_budget_timer_throttling': False,
+    'extensions.enabledScopes': 0,
+}
+
+
+class ChromeDriverResolver:
+    """Resolve Chrome Portable -> browser version -> ChromeDriver executable.
+
+    Results are kept in a JSON index on disk, keyed by the browser binary path
+    and invalidated by its mtime/size, so once a browser has been seen the
+    lookup needs neither win32api nor the network.
+    """
+
+    def __init__(self, index_path=DRIVER_INDEX_PATH):
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self.index = None
+
+    def get_chrome_exe(self, chrome_path):
+        chrome_dir = os.path.dirname(chrome_path)
+        return os.path.join(chrome_dir, 'App', 'Chrome-bin', 'chrome.exe')
+
+    def get_chrome_version(self, chrome_path):
+        chrome_exe = self.get_chrome_exe(chrome_path)
+        try:
+            stat = os.stat(chrome_exe)
+        except OSError as e:
+            print(f"Version detection error: {str(e)}")
+            return None
+
+        key = os.path.normcase(os.path.abspath(chrome_exe))
+        with self.lock:
+            browser = self._load()['browsers'].get(key)
+            if browser and browser['mtime'] == stat.st_mtime and browser['size'] == stat.st_size:
+                return browser['version']
+
+        try:
+            version_info = win32api.GetFileVersionInfo(chrome_exe, '\\')
+            ms = version_info['FileVersionMS']
+            ls = version_info['FileVersionLS']
+            version = f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+        except Exception as e:
+            print(f"Version detection error: {str(e)}")
+            return None
+
+        with self.lock:
+            index = self._load()
+            index['browsers'][key] = {'mtime': stat.st_mtime, 'size': stat.st_size, 'version': version}
+            self._save(index)
+        return version
+
+    def resolve(self, chrome_path):
+        chrome_version = self.get_chrome_version(chrome_path)
+        if not chrome_version:
+            raise Exception("Unable to detect Chrome version")
+
+        with self.lock:
+            driver_path = self._find_cached_driver(chrome_version, same_major=False)
+        if driver_path:
+            return driver_path
+
+        try:
+            driver_path = ChromeDriverManager(driver_version=chrome_version).install()
+        except Exception as e:
+            # Không có mạng: dùng driver cùng major version đã tải trước đó
+            with self.lock:
+                driver_path = self._find_cached_driver(chrome_version, same_major=True)
+            if driver_path:
+                print(f"ChromeDriver download failed ({e}), using cached {driver_path}")
+                return driver_path
+            raise Exception(f"ChromeDriver download failed: {str(e)}")
+
+        with self.lock:
+            index = self._load()
+            index['drivers'][chrome_version] = driver_path
+            self._save(index)
+        return driver_path
+
+    def _find_cached_driver(self, chrome_version, same_major):
+        drivers = self._load()['drivers']
+        candidates = [chrome_version]
+        if same_major:
+            major = chrome_version.split('.')[0]
+            candidates = sorted((version for version in drivers if version.split('.')[0] == major),
+                                reverse=True)
+        for version in candidates:
+            driver_path = drivers.get(version)
+            if driver_path and os.path.isfile(driver_path):
+                return driver_path
+        return None
+
+    def _load(self):
+        if self.index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+            self.index.setdefault('browsers', {})
+            self.index.setdefault('drivers', {})
+        return self.index
+
+    def _save(self, index):
+        directory = os.path.dirname(self.index_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.index_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+
+driver_resolver = ChromeDriverResolver()
+
+
+def launch_chrome_driver(chrome_path, debug_port=None, max_retries=3, lean=False):
+    try:
+        options = webdriver.ChromeOptions()
+        options.binary_location = chrome_path
+
+        # Add additional stability options
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument(f'--remote-debugging-port={debug_port or find_free_port()}')
+        options.add_argument('--start-maximized')
+        options.page_load_strategy = 'normal'
+
+        if lean:
+            for argument in LEAN_CHROME_ARGS:
+                options.add_argument(argument)
+            options.add_experimental_option('prefs', LEAN_CHROME_PREFS)
+            options.page_load_strategy = 'eager'
+
+        data_dir = os.path.join(os.path.dirname(chrome_path), 'Data')
+        if os.path.exists(data_dir):
+            options.add_argument(f'--user-data-dir={data_dir}')
+
+        driver_path = driver_resolver.resolve(chrome_path)
+        service = Service(executable_path=driver_path)
+        service.creation_flags = CREATE_NO_WINDOW
+
+        # Add retry mechanism
+        for attempt in range(max_retries):
+            try:
+                driver = webdriver.Chrome(service=service, options=options)
+                driver.set_window_size(1320, 960)
+                # Test driver by executing simple command
+                driver.execute_script('return document.readyState')
+                if lean:
+                    driver.execute_cdp_cmd('Network.enable', {})
+                    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+                return driver
+            except Exception as e:
+                if attempt == max_retries - 1:
+                    raise e
+                time.sleep(2)
+
+    except Exception as e:
+        raise Exception(f"Failed to setup Chrome: {str(e)}")
+
+
+def launch_firefox_driver(profile_path, lean=False):
+    firefox_options = webdriver.FirefoxOptions()
+    firefox_options.binary_location = FIREFOX_BINARY
+    firefox_options.add_argument("-profile")
+    firefox_options.add_argument(os.fspath(profile_path))
+
+    if lean:
+        for name, value in LEAN_FIREFOX_PREFS.items():
+            firefox_options.set_preference(name, value)
+        firefox_options.page_load_strategy = 'eager'
+
+    driver = webdriver.Firefox(options=firefox_options)
+    driver.set_window_size(1320, 960)
+    return driver
+
+
+def get_driver_rss(driver):
+    # Tổng RSS của driver và toàn bộ tiến trình trình duyệt con của nó
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return 0
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def benchmark_launch_modes(launch, url="https://studio.youtube.com", runs=3):
+    """Compare RSS and page-ready time of normal vs lean launch mode.
+
+    launch is called as launch(lean) and must return a new driver, e.g.
+    lambda lean: launch_chrome_driver(chrome_path, lean=lean).
+    """
+    results = {}
+    for lean in (False, True):
+        mode = 'lean' if lean else 'normal'
+        samples = []
+        for _ in range(runs):
+            driver = launch(lean)
+            try:
+                started = time.perf_counter()
+                driver.get(url)
+                while driver.execute_script('return document.readyState') == 'loading':
+                    time.sleep(0.05)
+                ready = time.perf_counter() - started
+                # Để trang render xong rồi mới đo bộ nhớ
+                time.sleep(3)
+                samples.append((ready, get_driver_rss(driver)))
+            finally:
+                driver.quit()
+
+        results[mode] = {
+            'page_ready_s': sum(ready for ready, _ in samples) / len(samples),
+            'rss_mb': sum(rss for _, rss in samples) / len(samples) / (1024 * 1024),
+        }
+        print(f"{mode}: page ready {results[mode]['page_ready_s']:.2f}s, "
+              f"RSS {results[mode]['rss_mb']:.0f} MB (avg of {runs})")
+
+    return results
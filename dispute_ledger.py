@@ -0,0 +1,109 @@
+import time
+import hashlib
+import sqlite3
+import threading
+
+
+LEDGER_PATH = 'dispute_ledger.db'
+
+SUBMITTED = 'submitted'
+ALREADY_DISPUTED = 'already_disputed'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+DONE_OUTCOMES = (SUBMITTED, ALREADY_DISPUTED)
+
+
+class DisputeLedger:
+    """Durable record of every claim the anti-BQ worker has handled.
+
+    One row per (video id, claim id) with the asset title, a hash of the
+    dispute text, the time and the outcome, plus every claim id seen on a
+    video's copyright page. A re-run skips a video without opening that page
+    only when every claim seen there has a finished dispute.
+    """
+
+    def __init__(self, path=LEDGER_PATH):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS disputes ('
+                ' video_id TEXT NOT NULL,'
+                ' claim_id TEXT NOT NULL,'
+                ' asset_title TEXT NOT NULL,'
+                ' template_hash TEXT,'
+                ' outcome TEXT NOT NULL,'
+                ' updated_at REAL NOT NULL,'
+                ' PRIMARY KEY (video_id, claim_id))'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS disputes_outcome ON disputes (video_id, outcome)')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS claims_seen ('
+                ' video_id TEXT NOT NULL,'
+                ' claim_id TEXT NOT NULL,'
+                ' PRIMARY KEY (video_id, claim_id))'
+            )
+            self.conn.commit()
+
+    def template_hash(self, text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest() if text else None
+
+    def record(self, video_id, claim_id, asset_title, outcome, dispute_text=None):
+        # Kết quả yếu hơn không ghi đè kết quả mạnh hơn: đã gửi > đã kháng sẵn > bỏ qua/lỗi
+        if outcome == SUBMITTED:
+            protected = ()
+        elif outcome == ALREADY_DISPUTED:
+            protected = (SUBMITTED,)
+        else:
+            protected = DONE_OUTCOMES
+        condition = f"WHERE disputes.outcome NOT IN ({', '.join('?' * len(protected))})" if protected else ''
+        with self.lock:
+            self.conn.execute(
+                'INSERT INTO disputes '
+                '(video_id, claim_id, asset_title, template_hash, outcome, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (video_id, claim_id) DO UPDATE SET '
+                'asset_title = excluded.asset_title, template_hash = excluded.template_hash, '
+                f'outcome = excluded.outcome, updated_at = excluded.updated_at {condition}',
+                (video_id, claim_id, asset_title, self.template_hash(dispute_text), outcome, time.time())
+                + protected)
+            self.conn.commit()
+
+    def done_claims(self, video_id):
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT claim_id FROM disputes WHERE video_id = ? AND outcome IN (?, ?)',
+                (video_id,) + DONE_OUTCOMES).fetchall()
+        return {claim_id for claim_id, in rows}
+
+    def record_seen(self, video_id, claim_ids):
+        # Các claim đọc được trên trang bản quyền của video
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO claims_seen (video_id, claim_id) VALUES (?, ?)',
+                [(video_id, claim_id) for claim_id in claim_ids])
+            self.conn.commit()
+
+    def covered_videos(self, video_ids):
+        # video id -> số claim đã thấy, chỉ gồm video mà mọi claim đã thấy đều kháng xong
+        covered = {}
+        video_ids = list(video_ids)
+        with self.lock:
+            # Chia nhỏ để không vượt giới hạn số tham số của SQLite
+            for start in range(0, len(video_ids), 500):
+                chunk = video_ids[start:start + 500]
+                placeholders = ', '.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f'SELECT seen.video_id, COUNT(*), COUNT(disputes.claim_id) FROM claims_seen AS seen '
+                    f'LEFT JOIN disputes ON disputes.video_id = seen.video_id '
+                    f'AND disputes.claim_id = seen.claim_id AND disputes.outcome IN (?, ?) '
+                    f'WHERE seen.video_id IN ({placeholders}) GROUP BY seen.video_id',
+                    DONE_OUTCOMES + tuple(chunk)).fetchall()
+                covered.update((video_id, seen) for video_id, seen, done in rows if seen == done)
+        return covered
+
+
+dispute_ledger = DisputeLedger()
@@ -0,0 +1,85 @@
+import os
+import random
+
+from .thumbnail_prep import index_thumbnails
+
+
+MAX_TAGS_LENGTH = 500
+
+
+class EditPlan:
+    """What to write into each video's details page, by row index.
+
+    Titles are taken one per line; the description may use {title}; from a
+    thumbnail folder each video gets the image named like its title, or
+    else the next image in name order.
+    """
+
+    def __init__(self, titles, description, tags, thumbnail_path='', random_tags=False):
+        self.titles = [title.strip() for title in titles if title.strip()]
+        self.description = description
+        self.tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+        self.random_tags = random_tags
+        self.thumbnail_index = {}
+        if os.path.isdir(thumbnail_path):
+            self.thumbnail_index = index_thumbnails(thumbnail_path)
+            self.thumbnails = list(self.thumbnail_index.values())
+        elif os.path.isfile(thumbnail_path):
+            self.thumbnails = [thumbnail_path]
+        else:
+            self.thumbnails = []
+
+    @classmethod
+    def from_channel_frame(cls, channel_frame):
+        return cls(channel_frame.title_edit.toPlainText().splitlines(),
+                   channel_frame.desc_edit.toPlainText().strip(),
+                   channel_frame.tags_edit.toPlainText(),
+                   channel_frame.thumb_path_edit.text().strip(),
+                   channel_frame.random_tags_cb.isChecked())
+
+    def is_empty(self):
+        return not (self.titles or self.description or self.tags or self.thumbnails)
+
+    def count(self, row_count):
+        # Có danh sách tiêu đề thì chỉ sửa đúng số video đó, không thì áp dụng cho mọi hàng
+        return min(row_count, len(self.titles)) if self.titles else row_count
+
+    def for_index(self, index, current_title=''):
+        title = self.titles[index] if index < len(self.titles) else None
+        description = None
+        if self.description:
+            description = self.description.replace('{title}', title or current_title)
+        return {
+            'title': title,
+            'description': description,
+            'tags': self._tags_text(),
+            'thumbnail': self._thumbnail_for(index, title, current_title),
+        }
+
+    def _thumbnail_for(self, index, title, current_title):
+        if not self.thumbnails:
+            return None
+        # Ưu tiên ảnh trùng tên với video (tên file gốc hoặc tiêu đề mới)
+        for name in (current_title, title):
+            if name and name.lower() in self.thumbnail_index:
+                return self.thumbnail_index[name.lower()]
+        return self.thumbnails[index % len(self.thumbnails)]
+
+    def _tags_text(self):
+        if not self.tags:
+            return None
+        tags = list(self.tags)
+        if self.random_tags:
+            random.shuffle(tags)
+        # Studio giới hạn tổng độ dài tag 500 ký tự
+        selected = []
+        length = 0
+        for tag in tags:
+            extra = len(tag) + (1 if selected else 0)
+            if length + extra > MAX_TAGS_LENGTH:
+                if self.random_tags:
+                    continue
+                break
+            selected.append(tag)
+            length += extra
+        return ','.join(selected)
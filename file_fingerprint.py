@@ -0,0 +1,184 @@
+import os
+import mmap
+import time
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+FINGERPRINT_PATH = 'upload_fingerprints.db'
+EDGE_BYTES = 1024 * 1024
+SAMPLE_BYTES = 64 * 1024
+SAMPLE_COUNT = 8
+
+
+def partial_fingerprint(path):
+    """Identify a file's content from its size and a few sampled regions.
+
+    Hashes the first and last MB plus SAMPLE_COUNT evenly spaced blocks
+    from the middle, read through mmap, so a multi-GB video costs ~2.5 MB
+    of I/O. Renamed or moved copies get the same fingerprint.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha1(size.to_bytes(8, 'big'))
+    if size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if size <= 2 * EDGE_BYTES + SAMPLE_COUNT * SAMPLE_BYTES:
+                digest.update(data)
+            else:
+                digest.update(data[:EDGE_BYTES])
+                middle = size - 2 * EDGE_BYTES - SAMPLE_BYTES
+                for index in range(1, SAMPLE_COUNT + 1):
+                    offset = EDGE_BYTES + middle * index // (SAMPLE_COUNT + 1)
+                    digest.update(data[offset:offset + SAMPLE_BYTES])
+                digest.update(data[-EDGE_BYTES:])
+    return f"{size:x}-{digest.hexdigest()}"
+
+
+def full_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4 * 1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FingerprintIndex:
+    """Catch the same video being queued twice or uploaded to several channels.
+
+    Uploaded files are kept in SQLite keyed by partial fingerprint, so a
+    lookup is one indexed query regardless of history size. Files sitting
+    in any channel's list in this session are tracked in memory.
+    """
+
+    def __init__(self, path=FINGERPRINT_PATH, max_workers=4):
+        self.lock = threading.Lock()
+        self.max_workers = max_workers
+        self.executor = None
+        self.cache = {}
+        self.full_hashes = {}
+        self.queued = {}
+        self.queued_paths = {}
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS uploads ('
+                ' fingerprint TEXT NOT NULL,'
+                ' channel TEXT NOT NULL,'
+                ' channel_name TEXT NOT NULL,'
+                ' path TEXT NOT NULL,'
+                ' full_hash TEXT,'
+                ' uploaded_at REAL NOT NULL,'
+                ' PRIMARY KEY (fingerprint, channel))'
+            )
+            self.conn.commit()
+
+    def fingerprint(self, path):
+        # Cache theo (đường dẫn, kích thước, mtime) để không đọc lại file chưa đổi
+        stat = os.stat(path)
+        key = os.path.normcase(os.path.abspath(path))
+        cached = self.cache.get(key)
+        if cached and cached[0] == (stat.st_size, stat.st_mtime_ns):
+            return cached[1]
+        fingerprint = partial_fingerprint(path)
+        self.cache[key] = ((stat.st_size, stat.st_mtime_ns), fingerprint)
+        return fingerprint
+
+    def fingerprint_many(self, paths):
+        # None cho file không đọc được
+        paths = list(paths)
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return list(self.executor.map(self._safe_fingerprint, paths))
+
+    def _safe_fingerprint(self, path):
+        try:
+            return self.fingerprint(path)
+        except OSError as e:
+            print(f"Không tính được fingerprint {path}: {str(e)}")
+            return None
+
+    def same_content(self, path, other_path, other_hash=None):
+        # Xác nhận bằng hash toàn bộ file; file gốc đã bị xóa thì dùng hash đã lưu
+        try:
+            if other_hash is None:
+                other_hash = self._full_hash(other_path)
+            return self._full_hash(path) == other_hash
+        except OSError as e:
+            raise Exception(f"không so được hash toàn bộ với {other_path}: {e.strerror or str(e)}")
+
+    def prefetch_full_hashes(self, path, queued_path, fingerprint):
+        # Tính trước hash toàn bộ của file mới và các bản cùng fingerprint (lỗi đọc để same_content báo sau)
+        history = self.uploaded(fingerprint)
+        others = [other for _, other in self.queued_copies(fingerprint, queued_path)]
+        if not others and not history:
+            return
+        others += [row[1] for row in history if not row[2]]
+        for candidate in [path] + others:
+            try:
+                self._full_hash(candidate)
+            except OSError:
+                pass
+
+    def _full_hash(self, path):
+        key = (os.path.normcase(os.path.abspath(path)), self.fingerprint(path))
+        if key not in self.full_hashes:
+            self.full_hashes[key] = full_hash(path)
+        return self.full_hashes[key]
+
+    def queue(self, fingerprint, channel_name, path):
+        # Một fingerprint có thể có nhiều file khi hash toàn bộ đã xác nhận chúng khác nhau
+        with self.lock:
+            self.queued.setdefault(fingerprint, {})[path] = channel_name
+            self.queued_paths[path] = fingerprint
+
+    def queued_copies(self, fingerprint, path):
+        # [(kênh, đường dẫn)] của các file cùng fingerprint đang nằm trong danh sách
+        with self.lock:
+            copies = self.queued.get(fingerprint, {})
+            return [(channel_name, other) for other, channel_name in copies.items() if other != path]
+
+    def unqueue(self, path):
+        with self.lock:
+            fingerprint = self.queued_paths.pop(path, None)
+            copies = self.queued.get(fingerprint)
+            if copies is not None:
+                copies.pop(path, None)
+                if not copies:
+                    del self.queued[fingerprint]
+
+    def uploaded(self, fingerprint):
+        # [(tên kênh, đường dẫn, full hash, thời điểm upload)] của các lần upload trước
+        with self.lock:
+            return self.conn.execute(
+                'SELECT channel_name, path, full_hash, uploaded_at FROM uploads WHERE fingerprint = ?',
+                (fingerprint,)).fetchall()
+
+    def record_uploaded(self, channel, channel_name, paths):
+        rows = []
+        for path in paths:
+            try:
+                fingerprint = self.fingerprint(path)
+            except OSError:
+                continue
+            key = (os.path.normcase(os.path.abspath(path)), fingerprint)
+            rows.append((fingerprint, channel, channel_name, path, self.full_hashes.get(key), time.time()))
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO uploads '
+                '(fingerprint, channel, channel_name, path, full_hash, uploaded_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)', rows)
+            self.conn.commit()
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+
+fingerprint_index = FingerprintIndex()
@@ -0,0 +1,119 @@
+import os
+import json
+import psutil
+import threading
+
+
+REGISTRY_PATH = 'webdriver_processes.json'
+
+
+class ProcessRegistry:
+    """Record the driver/browser process tree spawned for each WebDriver.
+
+    Cleanup only touches processes we started (matched by pid and create
+    time) and waits just until they exit. Trees left behind by a crashed run
+    are reaped on the next startup.
+    """
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.app_pid = os.getpid()
+        self.app_started = psutil.Process(self.app_pid).create_time()
+        self.entries = self._load()
+
+    def register(self, driver):
+        root_pid = self._driver_pid(driver)
+        if not root_pid:
+            return
+        processes = self._tree([{'pid': root_pid, 'created': None}])
+        with self.lock:
+            self.entries[str(root_pid)] = {
+                'app_pid': self.app_pid,
+                'app_started': self.app_started,
+                'processes': [{'pid': p.pid, 'created': p.create_time()} for p in processes],
+            }
+            self._save()
+
+    def cleanup(self, driver, timeout=5):
+        root_pid = self._driver_pid(driver)
+        if not root_pid:
+            return
+        with self.lock:
+            entry = self.entries.pop(str(root_pid), None)
+            self._save()
+        if entry:
+            self._terminate(entry['processes'], timeout)
+
+    def reap_orphans(self, timeout=5):
+        with self.lock:
+            orphans = {key: entry for key, entry in self.entries.items()
+                       if not self._is_alive(entry['app_pid'], entry['app_started'])}
+            for key in orphans:
+                del self.entries[key]
+            self._save()
+
+        for key, entry in orphans.items():
+            print(f"Reaping orphaned driver tree {key} from a previous run")
+            self._terminate(entry['processes'], timeout)
+        return len(orphans)
+
+    def _terminate(self, records, timeout):
+        processes = self._tree(records)
+        for process in processes:
+            try:
+                process.terminate()
+            except psutil.Error:
+                pass
+        # Chỉ chờ đúng các tiến trình của mình thoát, không sleep cố định
+        _, alive = psutil.wait_procs(processes, timeout=timeout)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(alive, timeout=timeout)
+
+    def _tree(self, records):
+        # Lấy lại cây con tại thời điểm dọn vì Chrome/Firefox sinh thêm tiến trình sau khi khởi động
+        found = {}
+        for record in records:
+            try:
+                process = psutil.Process(record['pid'])
+                if record['created'] is not None and process.create_time() != record['created']:
+                    # PID đã được hệ điều hành cấp cho tiến trình khác
+                    continue
+                found[process.pid] = process
+                for child in process.children(recursive=True):
+                    found[child.pid] = child
+            except psutil.Error:
+                continue
+        return list(found.values())
+
+    def _is_alive(self, pid, created):
+        try:
+            return psutil.Process(pid).create_time() == created
+        except psutil.Error:
+            return False
+
+    def _driver_pid(self, driver):
+        try:
+            return driver.service.process.pid
+        except AttributeError:
+            return None
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(temp_path, self.path)
+
+
+process_registry = ProcessRegistry()
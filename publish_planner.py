@@ -0,0 +1,224 @@
+import re
+import time
+import sqlite3
+import threading
+from bisect import bisect_left
+from datetime import datetime, timedelta, time as day_time
+
+
+SCHEDULE_PATH = 'publish_schedule.db'
+SLOT_FORMAT = '%Y-%m-%d %H:%M'
+DAY_MINUTES = 24 * 60
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y')
+
+TIME_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})$')
+WINDOW_PATTERN = re.compile(r'^(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})$')
+
+
+def _minutes(hour, minute, text):
+    hour, minute = int(hour), int(minute)
+    if hour > 24 or minute > 59 or (hour == 24 and minute):
+        raise Exception(f"Giờ không hợp lệ: {text}")
+    return hour * 60 + minute
+
+
+def parse_times(text):
+    # "08:00, 12:30" -> [480, 750] (phút trong ngày, đã sắp xếp, bỏ trùng)
+    minutes = set()
+    for part in re.split(r'[,;\s]+', text.strip()):
+        if not part:
+            continue
+        match = TIME_PATTERN.match(part)
+        if not match:
+            raise Exception(f"Giờ không hợp lệ: {part}")
+        minutes.add(_minutes(match.group(1), match.group(2), part) % DAY_MINUTES)
+    return sorted(minutes)
+
+
+def parse_blackouts(text):
+    # "22:00-06:00, 2026-12-25" -> ([(1320, 360)], {date(2026, 12, 25)})
+    windows = []
+    dates = set()
+    for part in re.split(r'[,;]+', text):
+        part = part.strip()
+        if not part:
+            continue
+        match = WINDOW_PATTERN.match(part)
+        if match:
+            windows.append((_minutes(match.group(1), match.group(2), part),
+                            _minutes(match.group(3), match.group(4), part)))
+            continue
+        for fmt in DATE_FORMATS:
+            try:
+                dates.add(datetime.strptime(part, fmt).date())
+                break
+            except ValueError:
+                continue
+        else:
+            raise Exception(f"Khung cấm không hợp lệ: {part}")
+    return windows, dates
+
+
+def in_windows(minute, windows):
+    for start, end in windows:
+        # Khung qua nửa đêm (22:00-06:00) có start > end
+        if start <= minute < end if start <= end else (minute >= start or minute < end):
+            return True
+    return False
+
+
+def format_studio_date(slot, sample=''):
+    # Gõ ngày theo đúng định dạng Studio đang hiển thị trong ô chọn ngày
+    if 'thg' in sample:
+        return f"{slot.day} thg {slot.month}, {slot.year}"
+    if re.match(r'^\d{1,2}/\d{1,2}/\d{4}$', sample.strip()):
+        return slot.strftime('%d/%m/%Y')
+    return f"{slot.strftime('%b')} {slot.day}, {slot.year}"
+
+
+def format_studio_time(slot, sample=''):
+    if re.search(r'[AP]M', sample, re.IGNORECASE):
+        hour = slot.hour % 12 or 12
+        return f"{hour}:{slot.minute:02d} {'AM' if slot.hour < 12 else 'PM'}"
+    return slot.strftime('%H:%M')
+
+
+class PublishPlan:
+    """Staggered publish times for a batch of videos.
+
+    Slots come either from fixed times of day or from a fixed interval, and
+    skip blackout windows (times of day) and blackout dates. When the
+    pattern repeats daily, slot i is computed directly as
+    (valid day i // per_day, time i % per_day) instead of stepping through
+    the calendar, so thousands of slots cost one pass.
+    """
+
+    def __init__(self, start, times=(), interval_minutes=0, blackout_windows=(), blackout_dates=()):
+        self.start = start.replace(second=0, microsecond=0)
+        if self.start < start:
+            self.start += timedelta(minutes=1)
+        self.interval_minutes = interval_minutes
+        self.blackout_windows = list(blackout_windows)
+        self.blackout_dates = set(blackout_dates)
+        self.day_slots = self._day_slots(times)
+
+    @classmethod
+    def from_text(cls, start, times_text='', interval_minutes=0, blackouts_text=''):
+        times = parse_times(times_text) if not interval_minutes else ()
+        if not interval_minutes and not times:
+            raise Exception("Chưa nhập giờ đăng hoặc khoảng cách giữa các video")
+        windows, dates = parse_blackouts(blackouts_text)
+        return cls(start, times, interval_minutes, windows, dates)
+
+    def _day_slots(self, times):
+        if self.interval_minutes:
+            if DAY_MINUTES % self.interval_minutes:
+                # Khoảng cách không chia hết một ngày: mỗi ngày lệch giờ khác nhau
+                return None
+            start_minute = self.start.hour * 60 + self.start.minute
+            minutes = range(start_minute % self.interval_minutes, DAY_MINUTES, self.interval_minutes)
+        else:
+            minutes = times
+        return [minute for minute in minutes if not in_windows(minute, self.blackout_windows)]
+
+    def slots(self, count):
+        if count <= 0:
+            return []
+        if self.day_slots is None:
+            return self._stepped_slots(count)
+        if not self.day_slots:
+            raise Exception("Khung giờ cấm che hết các giờ đăng")
+
+        per_day = len(self.day_slots)
+        first = 0
+        if self.start.date() not in self.blackout_dates:
+            first = bisect_left(self.day_slots, self.start.hour * 60 + self.start.minute)
+        dates = self._valid_dates((first + count - 1) // per_day + 1)
+        midnights = [datetime.combine(date, day_time()) for date in dates]
+        offsets = [timedelta(minutes=minute) for minute in self.day_slots]
+
+        slots = []
+        for position in range(first, first + count):
+            day, slot = divmod(position, per_day)
+            slots.append(midnights[day] + offsets[slot])
+        return slots
+
+    def free_slots(self, count, taken=()):
+        # Bỏ các slot đã có video khác đặt lịch, phần thiếu lấy từ các slot kế tiếp.
+        # Trả về (slot, các slot trùng đã bỏ qua)
+        taken = set(taken)
+        slots = self.slots(count + len(taken))
+        skipped = [slot for slot in slots if slot in taken]
+        return [slot for slot in slots if slot not in taken][:count], skipped
+
+    def _valid_dates(self, needed):
+        dates = []
+        date = self.start.date()
+        while len(dates) < needed:
+            if date not in self.blackout_dates:
+                dates.append(date)
+            date += timedelta(days=1)
+        return dates
+
+    def _stepped_slots(self, count):
+        step = timedelta(minutes=self.interval_minutes)
+        # Nếu nhảy quá ngần này bước mà không có slot nào thì khung cấm đã che hết
+        max_skips = (len(self.blackout_dates) + 2) * DAY_MINUTES // self.interval_minutes + 1
+        slots = []
+        slot = self.start
+        skipped = 0
+        while len(slots) < count:
+            minute = slot.hour * 60 + slot.minute
+            if slot.date() in self.blackout_dates or in_windows(minute, self.blackout_windows):
+                skipped += 1
+                if skipped > max_skips:
+                    raise Exception("Khung giờ cấm che hết các giờ đăng")
+            else:
+                slots.append(slot)
+                skipped = 0
+            slot += step
+        return slots
+
+
+class PublishSchedule:
+    """Publish times already given to videos, per channel.
+
+    Studio's content list shows only the date of a scheduled video, so the
+    exact times set by this tool are kept here so new batches skip slots
+    already taken by videos scheduled in an earlier run.
+    """
+
+    def __init__(self, path=SCHEDULE_PATH):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS schedule ('
+                ' channel TEXT NOT NULL,'
+                ' video_id TEXT NOT NULL,'
+                ' publish_at TEXT NOT NULL,'
+                ' updated_at REAL NOT NULL,'
+                ' PRIMARY KEY (channel, video_id))'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS schedule_time ON schedule (channel, publish_at)')
+            self.conn.commit()
+
+    def record(self, channel, video_id, publish_at):
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO schedule (channel, video_id, publish_at, updated_at) VALUES (?, ?, ?, ?)',
+                (channel, video_id, publish_at.strftime(SLOT_FORMAT), time.time()))
+            self.conn.commit()
+
+    def upcoming(self, channel, now=None):
+        # video id -> thời gian đăng, chỉ các lịch chưa tới
+        since = (now or datetime.now()).strftime(SLOT_FORMAT)
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT video_id, publish_at FROM schedule WHERE channel = ? AND publish_at >= ?',
+                (channel, since)).fetchall()
+        return {video_id: datetime.strptime(publish_at, SLOT_FORMAT) for video_id, publish_at in rows}
+
+
+publish_schedule = PublishSchedule()
@@ -0,0 +1,70 @@
+import time
+import threading
+
+
+class TokenBucket:
+    """Allow bursts of up to `burst` actions and `rate_per_hour` on average.
+
+    acquire() blocks the calling worker thread until a token is available.
+    """
+
+    def __init__(self, rate_per_hour, burst):
+        self.condition = threading.Condition()
+        self.rate_per_hour = rate_per_hour
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def set_rate(self, rate_per_hour, burst=None):
+        with self.condition:
+            self._refill()
+            self.rate_per_hour = rate_per_hour
+            if burst is not None:
+                self.burst = burst
+                self.tokens = min(self.tokens, burst)
+            self.condition.notify_all()
+
+    def acquire(self):
+        started = time.monotonic()
+        with self.condition:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return time.monotonic() - started
+                wait = (1 - self.tokens) * 3600 / self.rate_per_hour
+                # Thức dậy định kỳ để nhận tốc độ mới nếu người dùng thay đổi
+                self.condition.wait(min(wait, 1.0))
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_per_hour / 3600)
+        self.updated = now
+
+
+class TokenBucketRegistry:
+    """One TokenBucket per key (channel profile), shared across runs."""
+
+    def __init__(self, rate_per_hour=60, burst=3):
+        self.lock = threading.Lock()
+        self.rate_per_hour = rate_per_hour
+        self.burst = burst
+        self.buckets = {}
+
+    def get(self, key):
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_per_hour, self.burst)
+                self.buckets[key] = bucket
+            return bucket
+
+    def set_rate(self, rate_per_hour):
+        with self.lock:
+            self.rate_per_hour = rate_per_hour
+            buckets = list(self.buckets.values())
+        for bucket in buckets:
+            bucket.set_rate(rate_per_hour)
+
+
+dispute_limits = TokenBucketRegistry()
@@ -0,0 +1,93 @@
+import threading
+
+from .process_registry import process_registry
+
+
+class BrowserSessionPool:
+    """Keep one warm WebDriver per browser profile and reuse it across jobs.
+
+    Keys are ('firefox', profile_id) or ('chrome', chrome_path). A driver is
+    health-checked before it is handed out and recycled after max_jobs jobs.
+    """
+
+    def __init__(self, max_jobs=20):
+        self.max_jobs = max_jobs
+        self.lock = threading.Lock()
+        self.sessions = {}
+
+    def set_max_jobs(self, max_jobs):
+        self.max_jobs = max(1, max_jobs)
+
+    def has_sessions(self):
+        with self.lock:
+            return bool(self.sessions)
+
+    def acquire(self, key, factory):
+        with self.lock:
+            session = self.sessions.get(key)
+            if session and session['in_use']:
+                raise Exception(f"Profile đang được sử dụng bởi tác vụ khác: {key[1]}")
+            if session:
+                session['in_use'] = True
+
+        if session:
+            if self.is_alive(session['driver']):
+                print(f"Reusing browser session for {key[1]} (job {session['jobs'] + 1})")
+                return session['driver']
+            print(f"Browser session for {key[1]} is dead, starting a new one")
+            self.discard(key)
+
+        driver = factory()
+        process_registry.register(driver)
+        with self.lock:
+            self.sessions[key] = {'driver': driver, 'jobs': 0, 'in_use': True}
+        return driver
+
+    def release(self, key, driver, healthy=True):
+        with self.lock:
+            session = self.sessions.get(key)
+            if not session or session['driver'] is not driver:
+                session = None
+            else:
+                session['jobs'] += 1
+                session['in_use'] = False
+                if healthy and session['jobs'] < self.max_jobs:
+                    return
+
+        if session:
+            self.discard(key)
+        else:
+            self.quit_driver(driver)
+
+    def discard(self, key):
+        with self.lock:
+            session = self.sessions.pop(key, None)
+        if session:
+            self.quit_driver(session['driver'])
+
+    def shutdown(self):
+        with self.lock:
+            sessions = list(self.sessions.values())
+            self.sessions.clear()
+        for session in sessions:
+            self.quit_driver(session['driver'])
+
+    def is_alive(self, driver):
+        try:
+            driver.execute_script('return document.readyState')
+            return True
+        except Exception:
+            return False
+
+    def quit_driver(self, driver):
+        if not driver:
+            return
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Error quitting driver: {e}")
+        # Đảm bảo cả cây tiến trình driver/trình duyệt đã thoát
+        process_registry.cleanup(driver)
+
+
+session_pool = BrowserSessionPool()
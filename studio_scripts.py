@@ -0,0 +1,219 @@
+# Các đoạn JavaScript chạy trong trang Studio, mỗi lần gọi chỉ tốn một round trip WebDriver
+
+# Chờ bảng tiến trình upload thay đổi (sớm nhất minMs, muộn nhất maxMs) rồi trả về toàn bộ trạng thái
+UPLOAD_PROGRESS_SNAPSHOT_JS = """
+const [minMs, maxMs, done] = arguments;
+function text(root, selector) {
+    const el = root.querySelector(selector);
+    return el ? el.textContent.trim() : '';
+}
+function visible(el) {
+    if (!el) return false;
+    const rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+}
+function snapshot() {
+    const monitor = document.querySelector('ytcp-multi-progress-monitor');
+    if (!monitor) return {found: false, done: false, count: '', eta: '', files: []};
+    const files = Array.from(monitor.querySelectorAll('ytcp-multi-progress-monitor-item, li.row')).map(item => {
+        const bar = item.querySelector('tp-yt-paper-progress, [role="progressbar"]');
+        let percent = bar ? Number(bar.getAttribute('value') || bar.getAttribute('aria-valuenow')) : NaN;
+        const status = text(item, '.progress-status-text, #status, .status');
+        if (isNaN(percent)) {
+            const match = status.match(/(\\d+)\\s*%/);
+            percent = match ? Number(match[1]) : 0;
+        }
+        const error = text(item, '.error-message, .error-text, [class*="error"]');
+        let state = 'uploading';
+        if (error) state = 'error';
+        else if (percent >= 100 || item.querySelector('[icon*="check"], .check-icon')) state = 'uploaded';
+        return {
+            name: text(item, '#title, .title, .file-name, .video-title'),
+            percent: Math.max(0, Math.min(100, Math.round(percent))),
+            state: state,
+            status: status,
+            eta: text(item, '#eta, .eta'),
+            error: error,
+        };
+    });
+    const close = monitor.querySelector('ytcp-icon-button#close-button');
+    return {
+        found: true,
+        done: visible(close),
+        count: text(monitor, '.header .count, .count'),
+        eta: text(monitor, '#eta'),
+        files: files,
+    };
+}
+const monitor = document.querySelector('ytcp-multi-progress-monitor');
+if (!monitor || !maxMs) {
+    done(snapshot());
+} else {
+    const started = Date.now();
+    let finished = false;
+    const finish = () => {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        done(snapshot());
+    };
+    const observer = new MutationObserver(() => {
+        const elapsed = Date.now() - started;
+        if (elapsed >= minMs) finish();
+        else setTimeout(finish, minMs - elapsed);
+    });
+    const timer = setTimeout(finish, maxMs);
+    observer.observe(monitor, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+"""
+
+# Đọc toàn bộ hàng video của trang Content trong một lần gọi
+# arguments: selector danh sách, selector hàng, id ô hạn chế
+VIDEO_ROWS_SNAPSHOT_JS = """
+const [listSelector, rowSelector, restrictionId] = arguments;
+function text(root, selector) {
+    const el = root.querySelector(selector);
+    return el ? el.textContent.replace(/\\s+/g, ' ').trim() : '';
+}
+const list = document.querySelector(listSelector);
+if (!list) return [];
+return Array.from(list.querySelectorAll(rowSelector)).map((row, index) => {
+    const link = row.querySelector('a[href*="/video/"]');
+    const match = link ? link.getAttribute('href').match(/\\/video\\/([^/?#]+)/) : null;
+    const restriction = text(row, '#' + restrictionId);
+    // Chỉ lấy tooltip của chính ô hạn chế; không đọc được số claim thì trả null (không rõ)
+    const tooltip = text(row, '#' + restrictionId + ' tp-yt-paper-tooltip')
+        || text(row, '#' + restrictionId + ' ~ tp-yt-paper-tooltip');
+    const claims = (tooltip || restriction).match(/(\\d+)/);
+    return {
+        index: index,
+        id: match ? match[1] : '',
+        title: text(row, '#video-title'),
+        restriction: restriction,
+        // querySelector trả phần tử đầu theo thứ tự DOM (chính ô chứa nhãn), nên hỏi nhãn trước
+        visibility: text(row, '.tablecell-visibility .label-span') || text(row, '.tablecell-visibility'),
+        claims: claims ? Number(claims[1]) : (restriction ? null : 0),
+    };
+});
+"""
+
+# Đọc toàn bộ claim trong trang bản quyền của một video
+# arguments: XPath hàng claim, selector tiêu đề nội dung, selector trạng thái kháng cáo
+CLAIM_ROWS_SNAPSHOT_JS = """
+const [rowXPath, assetSelector, statusSelector] = arguments;
+function text(root, selector) {
+    const el = root.querySelector(selector);
+    return el ? el.textContent.replace(/\\s+/g, ' ').trim() : '';
+}
+const result = document.evaluate(rowXPath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const seen = {};
+const claims = [];
+for (let index = 0; index < result.snapshotLength; index++) {
+    const row = result.snapshotItem(index);
+    const assetTitle = text(row, assetSelector);
+    const claimant = text(row, '.claimant, #claimant, [class*="claimant"]');
+    let id = row.getAttribute('data-claim-id') || row.getAttribute('claim-id') || '';
+    if (!id) {
+        // Không có id trên DOM: ghép tiêu đề + bên khiếu nại + thứ tự xuất hiện
+        const base = assetTitle + '|' + claimant;
+        seen[base] = (seen[base] || 0) + 1;
+        id = base + '|' + seen[base];
+    }
+    claims.push({
+        index: index,
+        id: id,
+        asset_title: assetTitle,
+        claimant: claimant,
+        disputed: !!row.querySelector(statusSelector),
+    });
+}
+return claims;
+"""
+
+# Chọn số hàng mỗi trang lớn nhất ở chân bảng Content, trả về số đã chọn (0 nếu không đổi được)
+SET_MAX_PAGE_SIZE_JS = """
+const done = arguments[arguments.length - 1];
+const select = document.querySelector('ytcp-table-footer ytcp-select#page-size, ytcp-select#page-size');
+if (!select) {
+    done(0);
+} else {
+    const trigger = select.querySelector('ytcp-dropdown-trigger, #trigger') || select;
+    trigger.click();
+    const started = Date.now();
+    const timer = setInterval(() => {
+        const items = Array.from(document.querySelectorAll('tp-yt-paper-listbox tp-yt-paper-item'))
+            .map(item => ({item: item, size: parseInt(item.textContent.trim(), 10)}))
+            .filter(entry => entry.size > 0 && entry.item.getBoundingClientRect().height > 0);
+        if (items.length) {
+            clearInterval(timer);
+            const largest = items.reduce((a, b) => (b.size > a.size ? b : a));
+            largest.item.click();
+            done(largest.size);
+        } else if (Date.now() - started > 3000) {
+            clearInterval(timer);
+            done(0);
+        }
+    }, 100);
+}
+"""
+
+# Điền tiêu đề/mô tả và mở phần "Hiện thêm" (chứa ô tag) trên trang chi tiết video trong một lần gọi
+# arguments: tiêu đề, mô tả (null = giữ nguyên), có cần ô tag hay không
+FILL_VIDEO_DETAILS_JS = """
+const [title, description, showTags] = arguments;
+function fill(selector, value) {
+    const box = document.querySelector(selector);
+    if (!box) return false;
+    box.focus();
+    document.execCommand('selectAll', false, null);
+    document.execCommand('insertText', false, value);
+    box.dispatchEvent(new Event('input', {bubbles: true}));
+    return true;
+}
+const result = {title: true, description: true};
+if (title !== null) result.title = fill('ytcp-video-title #textbox, #title-textarea #textbox', title);
+if (description !== null) {
+    result.description = fill('ytcp-video-description #textbox, #description-textarea #textbox', description);
+}
+if (showTags && !document.querySelector('ytcp-form-input-container#tags-container')) {
+    const toggle = document.querySelector('ytcp-button#toggle-button');
+    if (toggle) toggle.click();
+}
+return result;
+"""
+
+# Xóa toàn bộ tag hiện có rồi trả về ô nhập tag
+CLEAR_TAGS_JS = """
+const container = document.querySelector('ytcp-form-input-container#tags-container');
+if (!container) return null;
+const clear = container.querySelector('#clear-button');
+if (clear) clear.click();
+return container.querySelector('input#text-input, input');
+"""
+
+# Chọn playlist theo tên trong trang chi tiết video, trả về true nếu đã chọn
+SELECT_PLAYLIST_JS = """
+const [name, done] = arguments;
+const trigger = document.querySelector('ytcp-video-metadata-playlists ytcp-dropdown-trigger');
+if (!trigger) {
+    done(false);
+} else {
+    trigger.click();
+    const started = Date.now();
+    const timer = setInterval(() => {
+        const dialog = document.querySelector('ytcp-playlist-dialog');
+        const labels = dialog ? Array.from(dialog.querySelectorAll('.checkbox-label, #checkbox-label')) : [];
+        if (labels.length || Date.now() - started > 5000) {
+            clearInterval(timer);
+            const label = labels.find(el => el.textContent.trim() === name);
+            const item = label ? label.closest('li, ytcp-ve, label') : null;
+            const checkbox = item ? item.querySelector('[role="checkbox"]') : null;
+            if (checkbox && checkbox.getAttribute('aria-checked') !== 'true') checkbox.click();
+            const doneButton = dialog ? dialog.querySelector('ytcp-button.done-button, #done-button') : null;
+            if (doneButton) doneButton.click();
+            done(!!checkbox);
+        }
+    }, 100);
+}
+"""
@@ -0,0 +1,196 @@
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+import time
+
+
+# Chờ phần tử đạt trạng thái mong muốn ngay trong trang: MutationObserver báo khi
+# DOM đổi, interval ngắn bắt các thay đổi chỉ do CSS/animation.
+WAIT_FOR_ELEMENT_JS = """
+const [by, value, state, timeoutMs, done] = arguments;
+function find() {
+    if (by === 'xpath') {
+        return document.evaluate(value, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (by === 'id') return document.getElementById(value);
+    return document.querySelector(value);
+}
+function visible(el) {
+    if (!el || !el.isConnected) return false;
+    const rect = el.getBoundingClientRect();
+    const style = getComputedStyle(el);
+    return rect.width > 0 && rect.height > 0 &&
+        style.visibility !== 'hidden' && style.display !== 'none';
+}
+function check() {
+    const el = find();
+    if (state === 'gone') return visible(el) ? null : true;
+    if (state === 'present') return el;
+    if (!visible(el)) return null;
+    if (state === 'clickable' &&
+        (el.disabled || el.getAttribute('aria-disabled') === 'true')) return null;
+    return el;
+}
+let finished = false;
+const observer = new MutationObserver(() => { const r = check(); if (r) finish(r); });
+const poll = setInterval(() => { const r = check(); if (r) finish(r); }, 100);
+const timer = setTimeout(() => finish(null), timeoutMs);
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearInterval(poll);
+    clearTimeout(timer);
+    done(result);
+}
+const first = check();
+if (first) {
+    finish(first);
+} else {
+    observer.observe(document, {childList: true, subtree: true, attributes: true});
+}
+"""
+
+# Chờ DOM yên lặng quiet_ms (hết animation/render) hoặc chờ lần thay đổi kế tiếp
+WAIT_FOR_DOM_JS = """
+const [mode, selector, quietMs, timeoutMs, done] = arguments;
+const target = (selector && document.querySelector(selector)) || document;
+let finished = false;
+let quietTimer = null;
+function finish(changed) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(timer);
+    done(changed);
+}
+const observer = new MutationObserver(() => {
+    if (mode === 'change') { finish(true); return; }
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish(true), quietMs);
+});
+const timer = setTimeout(() => finish(false), timeoutMs);
+observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+if (mode === 'settle') quietTimer = setTimeout(() => finish(true), quietMs);
+"""
+
+JS_LOCATORS = {
+    By.XPATH: 'xpath',
+    By.ID: 'id',
+    By.CSS_SELECTOR: 'css',
+}
+
+EC_STATES = {
+    'present': EC.presence_of_element_located,
+    'visible': EC.visibility_of_element_located,
+    'clickable': EC.element_to_be_clickable,
+    'gone': EC.invisibility_of_element_located,
+}
+
+
+class StudioWaiter:
+    """Event-driven replacement for fixed time.sleep calls in Studio flows.
+
+    Every wait returns as soon as the page reaches the target state and its
+    real duration is recorded in self.timings under the given label.
+    """
+
+    def __init__(self, driver, timeout=10):
+        self.driver = driver
+        self.timeout = timeout
+        self.timings = []
+
+    def element(self, by, value, state='visible', timeout=None, label=None):
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        result = None
+        try:
+            if by in JS_LOCATORS:
+                self.driver.set_script_timeout(timeout + 5)
+                result = self.driver.execute_async_script(
+                    WAIT_FOR_ELEMENT_JS, JS_LOCATORS[by], value, state, int(timeout * 1000))
+            else:
+                result = self._fallback(by, value, state, timeout)
+        except TimeoutException:
+            result = None
+        except WebDriverException:
+            # Trang đang điều hướng dở dang, dùng cơ chế chờ của Selenium
+            result = self._fallback(by, value, state, timeout)
+        finally:
+            self._record(label or value, started, bool(result))
+
+        if not result:
+            raise TimeoutException(f"Timed out waiting for {state} element: {value}")
+        return result
+
+    def click(self, by, value, timeout=None, label=None):
+        element = self.element(by, value, 'clickable', timeout, label)
+        try:
+            element.click()
+        except WebDriverException:
+            # Phần tử bị overlay che, click bằng JavaScript
+            self.driver.execute_script("arguments[0].click();", element)
+        return element
+
+    def gone(self, by, value, timeout=None, label=None):
+        try:
+            self.element(by, value, 'gone', timeout, label)
+            return True
+        except TimeoutException:
+            return False
+
+    def until(self, condition, timeout=None, label='condition'):
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=0.1,
+                                   ignored_exceptions=(WebDriverException,)).until(condition)
+            ok = True
+            return result
+        finally:
+            self._record(label, started, ok)
+
+    def settled(self, quiet_ms=250, timeout=3, selector=None, label='dom settled'):
+        return self._wait_dom('settle', selector, quiet_ms, timeout, label)
+
+    def changed(self, selector=None, timeout=1, label='dom changed'):
+        return self._wait_dom('change', selector, 0, timeout, label)
+
+    def _wait_dom(self, mode, selector, quiet_ms, timeout, label):
+        started = time.perf_counter()
+        changed = False
+        try:
+            self.driver.set_script_timeout(timeout + 5)
+            changed = bool(self.driver.execute_async_script(
+                WAIT_FOR_DOM_JS, mode, selector, quiet_ms, int(timeout * 1000)))
+        except WebDriverException:
+            pass
+        finally:
+            self._record(label, started, changed)
+        return changed
+
+    def _fallback(self, by, value, state, timeout):
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                EC_STATES[state]((by, value)))
+        except TimeoutException:
+            return None
+
+    def _record(self, label, started, ok):
+        self.timings.append((label, time.perf_counter() - started, ok))
+
+    def report(self):
+        totals = {}
+        for label, seconds, ok in self.timings:
+            count, total, slowest = totals.get(label, (0, 0.0, 0.0))
+            totals[label] = (count + 1, total + seconds, max(slowest, seconds))
+
+        lines = [f"Wait timings ({len(self.timings)} waits, "
+                 f"{sum(seconds for _, seconds, _ in self.timings):.2f}s total):"]
+        for label, (count, total, slowest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {label}: {count}x, total {total:.2f}s, max {slowest:.2f}s")
+        return "\n".join(lines)
@@ -0,0 +1,130 @@
+import os
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:
+    # Pillow là tùy chọn: không có thì thumbnail được gửi nguyên file gốc, Studio tự báo nếu quá lớn
+    Image = None
+    print("Pillow chưa được cài (pip install Pillow): thumbnail sẽ dùng nguyên file gốc")
+
+
+THUMBNAIL_CACHE_DIR = 'thumbnail_cache'
+THUMBNAIL_MAX_BYTES = 2 * 1024 * 1024
+THUMBNAIL_MAX_SIZE = (1280, 720)
+THUMBNAIL_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+JPEG_QUALITIES = (90, 85, 80, 70, 60, 50, 40)
+
+
+def index_thumbnails(folder):
+    # Tên file bỏ đuôi (chữ thường) -> đường dẫn ảnh, quét thư mục một lần
+    index = {}
+    try:
+        names = sorted(os.listdir(folder))
+    except OSError:
+        return index
+    for name in names:
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in THUMBNAIL_EXTENSIONS:
+            index.setdefault(stem.lower(), os.path.join(folder, name))
+    return index
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def prepare_thumbnail(path, cache_dir=THUMBNAIL_CACHE_DIR):
+    """Return a path Studio will accept for this image.
+
+    Images already under 2 MB and within 1280x720 are used as-is, checked
+    from the header alone; others are resized and re-encoded as JPEG into
+    cache_dir, named by the source's content hash so each image is
+    converted only once. Without Pillow the source is returned unchanged.
+    """
+    if Image is None:
+        return path
+    with Image.open(path) as image:
+        fits = (image.width <= THUMBNAIL_MAX_SIZE[0] and image.height <= THUMBNAIL_MAX_SIZE[1])
+        if fits and os.path.getsize(path) <= THUMBNAIL_MAX_BYTES and image.format in ('JPEG', 'PNG'):
+            return path
+
+    cached = os.path.join(cache_dir, f"{file_digest(path)}.jpg")
+    if os.path.exists(cached):
+        return cached
+
+    with Image.open(path) as image:
+        image = image.convert('RGB')
+        image.thumbnail(THUMBNAIL_MAX_SIZE, Image.LANCZOS)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{cached}.{os.getpid()}.tmp"
+        for quality in JPEG_QUALITIES:
+            image.save(temp_path, 'JPEG', quality=quality, optimize=True)
+            if os.path.getsize(temp_path) <= THUMBNAIL_MAX_BYTES:
+                break
+        os.replace(temp_path, cached)
+    return cached
+
+
+class ThumbnailPreparer:
+    """Prepare thumbnails in a process pool ahead of the editor.
+
+    prepare() only submits work; get() waits for that one image, which is
+    normally finished long before the editor reaches its video.
+    """
+
+    def __init__(self, max_workers=None, cache_dir=THUMBNAIL_CACHE_DIR):
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self.executor = None
+        self.futures = {}
+
+    def _key(self, path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def prepare(self, path):
+        key = self._key(path)
+        with self.lock:
+            future = self.futures.get(key)
+            if future is None:
+                if self.executor is None:
+                    self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                future = self.executor.submit(prepare_thumbnail, key, self.cache_dir)
+                self.futures[key] = future
+        return future
+
+    def prepare_many(self, paths):
+        if Image is None:
+            return
+        for path in paths:
+            self.prepare(path)
+
+    def get(self, path, timeout=120):
+        if Image is None:
+            return path
+        try:
+            return self.prepare(path).result(timeout)
+        except Exception as e:
+            raise Exception(f"Không chuẩn bị được thumbnail {path}: {str(e)}")
+        finally:
+            # Ảnh dùng lại sau đó sẽ lấy từ thumbnail_cache, không giữ future suốt phiên
+            with self.lock:
+                self.futures.pop(self._key(path), None)
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+            self.futures = {}
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+thumbnail_preparer = ThumbnailPreparer()
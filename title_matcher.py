@@ -0,0 +1,272 @@
+import re
+import math
+import time
+import random
+import string
+import threading
+import unicodedata
+from collections import Counter, deque
+
+from .anti_bq_store import anti_bq_store
+
+
+FUZZY_THRESHOLD = 0.75
+
+# Các từ Studio/uploader hay gắn thêm vào tiêu đề, không giúp phân biệt bài hát
+NOISE_TOKENS = {
+    'official', 'music', 'video', 'mv', 'lyric', 'lyrics', 'audio', 'visualizer',
+    'hd', '4k', 'full', 'version', 'ft', 'feat',
+}
+
+
+def normalize_title(text):
+    # NFKD + bỏ dấu, bỏ dấu câu và từ nhiễu, sắp xếp token để không phụ thuộc thứ tự từ
+    text = unicodedata.normalize('NFKD', text.replace('đ', 'd').replace('Đ', 'D'))
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    tokens = [token for token in re.split(r'[\W_]+', text) if token and token not in NOISE_TOKENS]
+    return ' '.join(sorted(tokens))
+
+
+def title_trigrams(normalized):
+    grams = set()
+    for token in normalized.split():
+        padded = f" {token} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+class AhoCorasickIndex:
+    """Multi-pattern substring automaton over lowercased template titles.
+
+    search() walks the text once and returns the longest pattern that occurs
+    anywhere in it, so lookup cost depends on the claim title, not on the
+    number of templates.
+    """
+
+    def __init__(self, patterns):
+        # goto[state] là dict ký tự -> state kế tiếp, state 0 là gốc
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [-1]
+        self.patterns = []
+
+        for pattern in patterns:
+            key = pattern.lower()
+            if not key:
+                continue
+            state = 0
+            for char in key:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(-1)
+                state = next_state
+            # Nhiều tiêu đề trùng nhau sau khi lowercase: giữ tiêu đề xuất hiện trước
+            if self.output[state] == -1:
+                self.output[state] = len(self.patterns)
+                self.patterns.append(pattern)
+
+        self._build_links()
+
+    def _build_links(self):
+        # best[state]: pattern dài nhất kết thúc tại state, tính cả các suffix qua fail link
+        self.best = list(self.output)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0) if state else 0
+                if self.best[next_state] == -1:
+                    self.best[next_state] = self.best[self.fail[next_state]]
+                queue.append(next_state)
+
+    def search(self, text):
+        goto, fail, best = self.goto, self.fail, self.best
+        state = 0
+        found = -1
+        found_length = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            match = best[state]
+            if match != -1:
+                length = len(self.patterns[match])
+                if length > found_length:
+                    found, found_length = match, length
+        return self.patterns[found] if found != -1 else None
+
+    def __len__(self):
+        return len(self.patterns)
+
+
+class TrigramIndex:
+    """Inverted trigram index over normalized template titles.
+
+    best() scores candidates with the Dice coefficient of their trigram sets.
+    Shared trigram counts are accumulated straight from the posting lists,
+    so a lookup never compares the query against every template.
+    """
+
+    def __init__(self, titles):
+        self.titles = []
+        self.sizes = []
+        self.postings = {}
+        for title in titles:
+            grams = title_trigrams(normalize_title(title))
+            if not grams:
+                continue
+            title_id = len(self.titles)
+            self.titles.append(title)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(title_id)
+
+    def best(self, text, threshold=FUZZY_THRESHOLD):
+        query = title_trigrams(normalize_title(text))
+        if not query:
+            return None
+
+        # Dice >= threshold buộc số trigram chung >= threshold * |q| / (2 - threshold)
+        size = len(query)
+        min_shared = max(1, math.ceil(threshold * size / (2 - threshold)))
+        known = [gram for gram in query if gram in self.postings]
+        if len(known) < min_shared:
+            return None
+        shared = Counter()
+        for gram in known:
+            shared.update(self.postings[gram])
+
+        best_id, best_score = None, threshold
+        for title_id, count in shared.items():
+            if count < min_shared:
+                continue
+            score = 2 * count / (size + self.sizes[title_id])
+            if score >= best_score:
+                best_id, best_score = title_id, score
+        if best_id is None:
+            return None
+        return self.titles[best_id], best_score
+
+    def __len__(self):
+        return len(self.titles)
+
+
+class TitleMatcher:
+    """Claim title -> dispute template lookup backed by the anti-BQ store.
+
+    Exact substring matches come from the Aho-Corasick automaton; when none
+    is found the trigram index tries a normalized fuzzy match. Both indexes
+    are rebuilt lazily whenever the store version changes.
+    """
+
+    def __init__(self, store=anti_bq_store, threshold=FUZZY_THRESHOLD):
+        self.store = store
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.version = None
+        self.index = None
+        self.fuzzy = None
+        self.data = {}
+
+    def set_threshold(self, threshold):
+        self.threshold = threshold
+
+    def _refresh(self):
+        version, data = self.store.snapshot()
+        if version != self.version:
+            self.index = AhoCorasickIndex(data.keys())
+            self.fuzzy = None
+            self.version = version
+            self.data = data
+
+    def match(self, claim_title):
+        # Trả về (tiêu đề mẫu, nội dung) khớp cụ thể nhất, hoặc None
+        with self.lock:
+            self._refresh()
+            index, data = self.index, self.data
+        saved_title = index.search(claim_title)
+        if saved_title is None:
+            return self.match_fuzzy(claim_title)
+        return saved_title, data[saved_title]
+
+    def match_fuzzy(self, claim_title):
+        with self.lock:
+            self._refresh()
+            if self.fuzzy is None:
+                self.fuzzy = TrigramIndex(self.data.keys())
+            fuzzy, data = self.fuzzy, self.data
+        found = fuzzy.best(claim_title, self.threshold)
+        if found is None:
+            return None
+        saved_title, score = found
+        print(f"Fuzzy match '{claim_title}' -> '{saved_title}' ({score:.2f})")
+        return saved_title, data[saved_title]
+
+    def get_content(self, claim_title):
+        match = self.match(claim_title)
+        return match[1] if match else None
+
+
+title_matcher = TitleMatcher()
+
+
+def linear_title_scan(data, claim_title):
+    # Cách tìm cũ: duyệt toàn bộ dict, khớp đầu tiên theo thứ tự lưu
+    for saved_title, content in data.items():
+        if saved_title.lower() in claim_title.lower():
+            return content
+    return None
+
+
+def benchmark_title_matching(sizes=(1000, 10000, 100000), lookups=200, seed=0):
+    """Compare the linear scan against the Aho-Corasick index.
+
+    Builds a synthetic template library of each size and times lookups for
+    claim titles that embed one template (or none, every fourth lookup).
+    """
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + ' '
+
+    def random_title(low, high):
+        return ''.join(rng.choice(alphabet) for _ in range(rng.randint(low, high))).strip() or 'x'
+
+    results = {}
+    for size in sizes:
+        data = {}
+        while len(data) < size:
+            data[random_title(12, 40)] = f"dispute {len(data)}"
+        titles = list(data)
+        claims = []
+        for i in range(lookups):
+            claim = random_title(20, 60)
+            if i % 4:
+                claim = f"{claim} {rng.choice(titles)} (official video)"
+            claims.append(claim)
+
+        started = time.perf_counter()
+        index = AhoCorasickIndex(data.keys())
+        build_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for claim in claims:
+            linear_title_scan(data, claim)
+        linear_ms = (time.perf_counter() - started) * 1000 / lookups
+
+        started = time.perf_counter()
+        for claim in claims:
+            index.search(claim)
+        indexed_ms = (time.perf_counter() - started) * 1000 / lookups
+
+        results[size] = {'build_s': build_s, 'linear_ms': linear_ms, 'indexed_ms': indexed_ms}
+        print(f"{size} templates: build {build_s:.2f}s, linear {linear_ms:.3f} ms/lookup, "
+              f"indexed {indexed_ms:.4f} ms/lookup")
+
+    return results
@@ -0,0 +1,82 @@
+import os
+import time
+import sqlite3
+import threading
+
+
+JOURNAL_PATH = 'upload_journal.db'
+
+QUEUED = 'queued'
+TRANSFERRING = 'transferring'
+UPLOADED = 'uploaded'
+FAILED = 'failed'
+
+DONE_STATES = (UPLOADED,)
+
+
+class UploadJournal:
+    """Durable per-channel record of which files made it to Studio.
+
+    Rows are keyed by channel + file identity (path, size, mtime) and every
+    state change is committed immediately, so a run restarted after a crash
+    can skip files that were already uploaded.
+    """
+
+    def __init__(self, path=JOURNAL_PATH):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS uploads ('
+                ' channel TEXT NOT NULL,'
+                ' file_key TEXT NOT NULL,'
+                ' path TEXT NOT NULL,'
+                ' state TEXT NOT NULL,'
+                ' updated_at REAL NOT NULL,'
+                ' PRIMARY KEY (channel, file_key))'
+            )
+            self.conn.commit()
+
+    def file_key(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return os.path.normcase(os.path.abspath(path))
+        return f"{os.path.normcase(os.path.abspath(path))}|{stat.st_size}|{int(stat.st_mtime)}"
+
+    def enqueue(self, channel, paths):
+        now = time.time()
+        rows = [(channel, self.file_key(path), path, QUEUED, now) for path in paths]
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO uploads (channel, file_key, path, state, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)', rows)
+            self.conn.commit()
+
+    def mark(self, channel, paths, state):
+        now = time.time()
+        rows = [(state, now, channel, self.file_key(path)) for path in paths]
+        with self.lock:
+            self.conn.executemany(
+                'UPDATE uploads SET state = ?, updated_at = ? WHERE channel = ? AND file_key = ?', rows)
+            self.conn.commit()
+
+    def states(self, channel, paths):
+        keys = {self.file_key(path): path for path in paths}
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT file_key, state FROM uploads WHERE channel = ?', (channel,)).fetchall()
+        return {keys[key]: state for key, state in rows if key in keys}
+
+    def pending(self, channel, paths):
+        states = self.states(channel, paths)
+        return [path for path in paths if states.get(path) not in DONE_STATES]
+
+    def completed(self, channel, paths):
+        states = self.states(channel, paths)
+        return [path for path in paths if states.get(path) in DONE_STATES]
+
+
+upload_journal = UploadJournal()
@@ -3,7 +3,8 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog,
     QSizePolicy, QRadioButton, QButtonGroup, QLineEdit, QListWidget,
     QProgressBar, QFrame, QComboBox, QScrollArea, QMessageBox, QCheckBox,
-    QGroupBox, QTextEdit, QDateEdit, QSpinBox, QDialog, 
+    QGroupBox, QTextEdit, QDateEdit, QSpinBox, QDialog, QApplication,
+    QTableWidget, QTableWidgetItem, QHeaderView,
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QDate, QTimer
 from PyQt5.QtGui import QDragEnterEvent, QDropEvent
@@ -14,7 +15,6 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
 
 from selenium.common.exceptions import (
@@ -22,7 +22,6 @@ from selenium.common.exceptions import (
     ElementNotInteractableException, ElementClickInterceptedException,
     UnexpectedAlertPresentException, InvalidSelectorException, WebDriverException
 )
-from webdriver_manager.chrome import ChromeDriverManager
 
 # Standard Library Imports
 import os
@@ -34,194 +33,131 @@ import requests
 import zipfile
 import io
 import traceback
-from subprocess import CREATE_NO_WINDOW
-import win32api
+from collections import deque
+from urllib.parse import quote
+from datetime import datetime, timedelta
 from PyQt5.QtWidgets import QInputDialog, QMessageBox
 from PyQt5.QtCore import Qt
 from PyQt5.QtCore import QEventLoop
 from .selectors import YouTubeSelectors as YTS
+from .worker_pool import ChannelWorkerPool, find_free_port
+from .session_pool import session_pool
+from .process_registry import process_registry
+from .browser_launcher import launch_chrome_driver, launch_firefox_driver
+from .studio_waits import StudioWaiter
+from .studio_scripts import (
+    UPLOAD_PROGRESS_SNAPSHOT_JS, VIDEO_ROWS_SNAPSHOT_JS, CLAIM_ROWS_SNAPSHOT_JS, SET_MAX_PAGE_SIZE_JS,
+    FILL_VIDEO_DETAILS_JS, CLEAR_TAGS_JS, SELECT_PLAYLIST_JS,
+)
+from .edit_plan import EditPlan
+from .video_manifest import VideoManifest, parse_publish_time
+from .thumbnail_prep import thumbnail_preparer
+from .video_probe import video_prober, format_probe
+from .file_fingerprint import fingerprint_index
+from .publish_planner import PublishPlan, publish_schedule, format_studio_date, format_studio_time
+from .anti_bq_store import anti_bq_store
+from .title_matcher import title_matcher
+from .rate_limiter import dispute_limits
+from .dispute_ledger import dispute_ledger, SUBMITTED, ALREADY_DISPUTED, SKIPPED, FAILED
+from .upload_journal import upload_journal, TRANSFERRING, UPLOADED, FAILED as UPLOAD_FAILED
+
+# Studio nhận tối đa 15 file trong một hộp thoại upload
+STUDIO_MAX_FILES_PER_UPLOAD = 15
+# Hạn chờ một lượt upload: thời gian cố định cộng thời gian truyền hết dung lượng ở tốc độ tối thiểu
+UPLOAD_BASE_TIMEOUT = 10 * 60
+UPLOAD_MIN_BYTES_PER_SECOND = 256 * 1024
+
+# Trang chi tiết bản quyền của một video, mở thẳng theo id
+STUDIO_COPYRIGHT_URL = "https://studio.youtube.com/video/{video_id}/copyright"
+STUDIO_EDIT_URL = "https://studio.youtube.com/video/{video_id}/edit"
+# Studio chỉ nhận lịch đăng ở tương lai
+PUBLISH_LEAD_MINUTES = 15
+# Nhãn cột "Chế độ hiển thị" của video không cần đổi trạng thái nữa, so khớp cả nhãn
+# ("Không công khai" là Unlisted, không phải Public)
+PUBLISHED_VISIBILITY = ('public', 'công khai', 'scheduled', 'đã lên lịch', 'lên lịch')
+
+# Bộ lọc "Bản quyền" của trang Content, áp qua tham số filter trên URL
+STUDIO_COPYRIGHT_FILTER = [{"name": "HAS_COPYRIGHT_CLAIM", "value": "VIDEO_HAS_COPYRIGHT_CLAIM"}]
+
+
+def studio_file_name_matches(file_path, name):
+    # Studio hiển thị tên file (có thể bỏ đuôi), so khớp theo tên gốc
+    base_name = os.path.basename(file_path)
+    return name in (base_name, os.path.splitext(base_name)[0])
 
 
 class UploadWorker(QThread):
     progress_updated = pyqtSignal(int, str)
+    file_progress_updated = pyqtSignal(str, int, str, str)
+    files_uploaded = pyqtSignal(list)
     upload_complete = pyqtSignal()
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, channel_frame):
+    def __init__(self, channel_frame, debug_port=None):
         super().__init__()
         self.channel_frame = channel_frame
+        self.debug_port = debug_port or find_free_port()
+        self.session_key = channel_frame.get_upload_profile_key()
+        self.journal_channel = f"{self.session_key[0]}:{self.session_key[1]}"
+        self.driver = None
+        self.batches = []
+        self.max_batch_attempts = 3
     
-    def cleanup_driver(self):
+    def cleanup_driver(self, healthy=True):
         try:
             if hasattr(self, 'driver') and self.driver:
-                self.driver.quit()
+                session_pool.release(self.session_key, self.driver, healthy)
+                self.driver = None
         except Exception as e:
             print(f"Error cleaning up driver: {e}")
 
-    def close_webdriver_processes(self):
-        try:
-                for process in psutil.process_iter(['pid', 'name']):
-                    # Only target chromedriver.exe and geckodriver.exe
-                    if process.info['name'] in ['chromedriver.exe', 'geckodriver.exe']:
-                        psutil.Process(process.info['pid']).terminate()
-                time.sleep(2)
-        except Exception as e:
-            print(f"Error closing WebDriver processes: {e}")
+    def create_driver(self):
+        if self.channel_frame.firefox_radio.isChecked():
+            self.setup_firefox_driver()
+        else:
+            self.setup_chrome_driver()
+        return self.driver
 
     def run(self):
+        healthy = True
         try:
-            self.close_webdriver_processes()
-            if self.channel_frame.firefox_radio.isChecked():
-                self.setup_firefox_driver()
-            else:
-                self.setup_chrome_driver()
+            self.driver = session_pool.acquire(self.session_key, self.create_driver)
                 
-            self.perform_upload()
+            healthy = self.perform_upload()
             
         except Exception as e:
+            healthy = False
             self.error_occurred.emit(str(e))
+        finally:
+            self.cleanup_driver(healthy)
 
     def setup_firefox_driver(self):
         selected_profile = self.channel_frame.profile_combo.currentText()
         profile_id = self.channel_frame.profiles_dict[selected_profile]
         profile_path = os.path.expanduser(f'~\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\{profile_id}')
         
-        firefox_options = webdriver.FirefoxOptions()
-        firefox_options.binary_location = r"C:/Program Files/Mozilla Firefox/firefox.exe"
-        firefox_options.add_argument("-profile")
-        firefox_options.add_argument(os.fspath(profile_path))
-        
-        self.driver = webdriver.Firefox(options=firefox_options)
-        self.driver.set_window_size(1320, 960)
-
-    def get_chrome_version(self, chrome_path):
-        try:
-            chrome_dir = os.path.dirname(chrome_path)
-            chrome_exe = os.path.join(chrome_dir, 'App', 'Chrome-bin', 'chrome.exe')
-            version_info = win32api.GetFileVersionInfo(chrome_exe, '\\')
-            ms = version_info['FileVersionMS']
-            ls = version_info['FileVersionLS']
-            version = f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
-            return version
-        except Exception as e:
-            print(f"Version detection error: {str(e)}")
-            return None
+        self.driver = launch_firefox_driver(profile_path, self.channel_frame.lean_mode_cb.isChecked())
 
     def setup_chrome_driver(self):
-        try:
-            chrome_path = self.channel_frame.chrome_path_edit.text().strip()
-            
-            # Add initial delay for stability
-            time.sleep(2)
-            
-            chrome_version = self.get_chrome_version(chrome_path)
-            if not chrome_version:
-                raise Exception("Unable to detect Chrome version")
-                
-            options = webdriver.ChromeOptions()
-            options.binary_location = chrome_path
-            
-            # Add additional stability options
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--remote-debugging-port=9222')
-            options.add_argument('--start-maximized')
-            options.page_load_strategy = 'normal'
-            
-            data_dir = os.path.join(os.path.dirname(chrome_path), 'Data')
-            if os.path.exists(data_dir):
-                options.add_argument(f'--user-data-dir={data_dir}')
-            
-            driver_path = ChromeDriverManager(driver_version=chrome_version).install()
-            service = Service(executable_path=driver_path)
-            service.creation_flags = CREATE_NO_WINDOW
-            
-            # Add retry mechanism
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    self.driver = webdriver.Chrome(service=service, options=options)
-                    self.driver.set_window_size(1320, 960)
-                    # Test driver by executing simple command
-                    self.driver.execute_script('return document.readyState')
-                    break
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    time.sleep(2)
-                    
-        except Exception as e:
-            raise Exception(f"Failed to setup Chrome: {str(e)}")
-
-    def download_chromedriver(self, chrome_version):
-        try:
-            # Create storage directory
-            user_home = os.path.expanduser('~')
-            chromedriver_dir = os.path.join(user_home, 'AppData', 'Local', 'ChromeDriver')
-            os.makedirs(chromedriver_dir, exist_ok=True)
-            
-            # Extract major version from Chrome Portable
-            major_version = chrome_version.split('.')[0]
-            
-            # Set driver version based on Chrome version
-            driver_version_map = {
-                "129": "129.0.6668.59",
-                "128": "128.0.6462.59",
-                # Add more versions as needed
-            }
-            
-            driver_version = driver_version_map.get(major_version)
-            if not driver_version:
-                raise Exception(f"Unsupported Chrome version: {major_version}")
-                
-            # Download matching ChromeDriver
-            driver_path = ChromeDriverManager(driver_version=driver_version).install()
-            
-            # Move to our managed location
-            final_path = os.path.join(chromedriver_dir, f"chromedriver_{major_version}.exe")
-            shutil.copy2(driver_path, final_path)
-            
-            return final_path
-            
-        except Exception as e:
-            raise Exception(f"ChromeDriver download failed: {str(e)}")
-
-    def find_existing_chromedriver(self, driver_dir, chrome_version):
-        try:
-            for root, dirs, files in os.walk(driver_dir):
-                if 'chromedriver.exe' in files:
-                    driver_path = os.path.join(root, 'chromedriver.exe')
-                    # Verify driver version matches Chrome version
-                    import subprocess
-                    output = subprocess.check_output([driver_path, '--version']).decode()
-                    if f"ChromeDriver {chrome_version}." in output:
-                        return driver_path
-            return None
-        except:
-            return None
+        chrome_path = self.channel_frame.chrome_path_edit.text().strip()
+        self.driver = launch_chrome_driver(chrome_path, self.debug_port,
+                                           lean=self.channel_frame.lean_mode_cb.isChecked())
 
     def perform_upload(self):
+        self.waiter = StudioWaiter(self.driver, 15)
+        self.last_states = {}
         try:
-            wait = WebDriverWait(self.driver, 15)
             self.driver.get("https://studio.youtube.com")
-            time.sleep(5)
 
             # Check login status
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            if "Sign in" in self.driver.page_source:
-                self.error_occurred.emit("Not logged in")
-                return False
-
-            # Click create button
-            create_button = wait.until(EC.element_to_be_clickable((By.XPATH, '//ytcp-button[@id="create-icon"]')))
-            create_button.click()
-            time.sleep(2)
-
-            # Click upload button 
-            upload_button = wait.until(EC.element_to_be_clickable((By.XPATH, '//tp-yt-paper-item[@id="text-item-0"]')))
-            upload_button.click()
-            time.sleep(2)
+            try:
+                self.waiter.element(
+                    By.XPATH, '//ytcp-button[@id="create-icon"]', 'clickable', label='studio loaded')
+            except TimeoutException:
+                if "Sign in" in self.driver.page_source:
+                    self.error_occurred.emit("Not logged in")
+                    return False
+                raise
 
             # Prepare video paths and upload
             video_paths = []
@@ -230,71 +166,261 @@ class UploadWorker(QThread):
                 normalized_path = os.path.abspath(file_path).replace('/', '\\')
                 video_paths.append(normalized_path)
 
-            # Upload files
-            file_input = wait.until(EC.presence_of_element_located((By.XPATH, '//input[@type="file"]')))
-            file_input.send_keys('\n'.join(video_paths))
-            
-            # Wait for upload progress monitor to appear
-            time.sleep(5)
-            
-            while True:
-                try:
-                    # Check for upload progress header
-                    progress_header = wait.until(EC.presence_of_element_located(
-                        (By.CLASS_NAME, "header.style-scope.ytcp-multi-progress-monitor")
-                    ))
-                    
-                    # Get upload count status
-                    count_element = progress_header.find_element(By.CLASS_NAME, "count.style-scope.ytcp-multi-progress-monitor")
-                    count_text = count_element.text
-                    self.progress_updated.emit(50, f"Uploading: {count_text}")
-                    
-                    # Check for remaining time
-                    try:
-                        eta_element = self.driver.find_element(By.ID, "eta")
-                        if eta_element.is_displayed():
-                            eta_text = eta_element.text
-                            self.progress_updated.emit(75, f"Uploading: {count_text} - {eta_text}")
-                    except:
-                        pass
-                    
-                    # Check if upload is complete and close button is available
-                    try:
-                        close_button = self.driver.find_element(
-                            By.XPATH, 
-                            '//ytcp-icon-button[@id="close-button" and contains(@class, "style-scope ytcp-multi-progress-monitor")]'
-                        )
-                        if close_button.is_displayed():
-                            self.progress_updated.emit(100, "Upload complete!")
-                            close_button.click()
-                            time.sleep(2)  # Wait for dialog to close
-                            self.upload_complete.emit()
-                            return True
-                    except:
-                        pass
-                    
-                    time.sleep(1)
-                    
-                except StaleElementReferenceException:
-                    time.sleep(1)
-                    continue
-                except Exception as e:
-                    self.error_occurred.emit(f"Error monitoring upload progress: {str(e)}")
+            # Bỏ qua các file đã upload ở lần chạy trước (kể cả lần bị crash giữa chừng)
+            upload_journal.enqueue(self.journal_channel, video_paths)
+            completed = upload_journal.completed(self.journal_channel, video_paths)
+            if completed:
+                print(f"Skipping {len(completed)} file(s) already uploaded to this channel")
+                self.files_uploaded.emit(completed)
+            video_paths = upload_journal.pending(self.journal_channel, video_paths)
+            if not video_paths:
+                self.progress_updated.emit(100, "Tất cả video đã được upload trước đó")
+                self.upload_complete.emit()
+                return True
+
+            # Chia video_list thành các lượt, mỗi lượt không vượt giới hạn file của Studio
+            batch_size = self.channel_frame.batch_size_spin.value()
+            self.batches = [
+                {'files': video_paths[i:i + batch_size], 'status': 'pending', 'attempts': 0, 'error': ''}
+                for i in range(0, len(video_paths), batch_size)
+            ]
+
+            # Mở lượt kế tiếp ngay khi lượt trước truyền xong, không chờ Studio xử lý
+            for index, batch in enumerate(self.batches):
+                self.upload_batch(index, batch)
+
+            # Thử lại riêng các lượt bị lỗi
+            for index, batch in enumerate(self.batches):
+                while batch['status'] == 'failed' and batch['attempts'] < self.max_batch_attempts:
+                    print(f"Retrying batch {index + 1}: {batch['error']}")
+                    self.upload_batch(index, batch)
+
+            self.wait_for_all_uploads()
+
+            failed = [batch for batch in self.batches if batch['status'] == 'failed']
+            if failed:
+                details = "; ".join(f"{len(batch['files'])} file ({batch['error']})" for batch in failed)
+                self.error_occurred.emit(f"{len(failed)}/{len(self.batches)} lượt upload thất bại: {details}")
+                return False
+
+            # Áp dụng manifest cho các video vừa upload, dùng luôn phiên trình duyệt hiện tại
+            manifest = self.channel_frame.get_manifest()
+            if manifest:
+                self.progress_updated.emit(95, "Đang áp dụng manifest")
+                uploaded_names = {manifest.match_name(path) for path in video_paths}
+                results = EditVideoInfo(self.driver, self.progress_updated).start_manifest_process(
+                    manifest, uploaded_names, self.journal_channel)
+                failed = [result for result in results if result["status"] != "success"]
+                if failed:
+                    details = "; ".join(f"{result['title']}: {result['error']}" for result in failed)
+                    self.error_occurred.emit(f"Upload xong nhưng {len(failed)} video chưa áp dụng manifest: {details}")
                     return False
 
+            self.progress_updated.emit(100, "Upload complete!")
+            self.upload_complete.emit()
+            return True
+
         except Exception as e:
             self.error_occurred.emit(str(e))
             return False
         finally:
-            if self.driver:
-                self.driver.quit()
+            print(self.waiter.report())
+
+    def upload_batch(self, index, batch):
+        batch['attempts'] += 1
+        batch['status'] = 'transferring'
+        batch['error'] = ''
+        label = f"Lượt {index + 1}/{len(self.batches)}"
+        uploaded = set()
+        try:
+            # Click create button
+            self.waiter.click(By.XPATH, '//ytcp-button[@id="create-icon"]', label='create button')
+
+            # Click upload button 
+            self.waiter.click(By.XPATH, '//tp-yt-paper-item[@id="text-item-0"]', label='upload menu item')
+
+            # Upload files
+            file_input = self.waiter.element(By.XPATH, '//input[@type="file"]', 'present', label='file input')
+            file_input.send_keys('\n'.join(batch['files']))
+            upload_journal.mark(self.journal_channel, batch['files'], TRANSFERRING)
+
+            # Wait for upload progress monitor to appear
+            self.waiter.element(By.CSS_SELECTOR, "ytcp-multi-progress-monitor .header", 'present',
+                                timeout=30, label='progress monitor')
+
+            # Đóng hộp thoại upload để mở được lượt tiếp theo, việc truyền file vẫn tiếp tục
+            try:
+                self.waiter.click(By.CSS_SELECTOR, "ytcp-uploads-dialog #close-button", timeout=5,
+                                  label='close uploads dialog')
+                self.waiter.gone(By.CSS_SELECTOR, "ytcp-uploads-dialog tp-yt-paper-dialog", timeout=5,
+                                 label='uploads dialog closed')
+            except TimeoutException:
+                pass
+
+            failures = 0
+            deadline = time.time() + self.batch_timeout(batch['files'])
+            while True:
+                if time.time() > deadline:
+                    # Hàng kẹt ở trạng thái đang truyền/đang xử lý: trả lượt về cho vòng thử lại
+                    pending = [path for path in batch['files'] if path not in uploaded]
+                    batch['status'] = 'failed'
+                    batch['error'] = f"Quá hạn chờ {len(pending)} file truyền xong"
+                    upload_journal.mark(self.journal_channel, pending, UPLOAD_FAILED)
+                    batch['files'] = pending
+                    return
+                snapshot = self.poll_upload_progress(label)
+                if snapshot is None:
+                    failures += 1
+                    if failures >= 5:
+                        raise Exception("Error monitoring upload progress")
+                    continue
+                failures = 0
+                stale_errors = batch.get('stale_errors', {})
+                files = [self.find_file_state(snapshot, path, stale_errors.get(path, 0)) for path in batch['files']]
+                newly_uploaded = [path for path, file in zip(batch['files'], files)
+                                  if file and file['state'] == 'uploaded' and path not in uploaded]
+                if newly_uploaded:
+                    uploaded.update(newly_uploaded)
+                    upload_journal.mark(self.journal_channel, newly_uploaded, UPLOADED)
+                    self.files_uploaded.emit(newly_uploaded)
+
+                errors = [file['error'] or file['status'] for file in files if file and file['state'] == 'error']
+                if errors:
+                    batch['status'] = 'failed'
+                    batch['error'] = errors[0]
+                    failed_files = [path for path, file in zip(batch['files'], files)
+                                    if file and file['state'] == 'error']
+                    upload_journal.mark(self.journal_channel, failed_files, UPLOAD_FAILED)
+                    # Hàng lỗi của lượt này vẫn nằm trong bảng tiến trình khi thử lại
+                    batch['stale_errors'] = {path: self.count_error_rows(snapshot, path) for path in failed_files}
+                    # Lần thử lại chỉ gửi các file chưa lên được
+                    batch['files'] = [path for path in batch['files'] if path not in uploaded]
+                    return
+                if all(file and file['state'] == 'uploaded' for file in files):
+                    batch['status'] = 'transferred'
+                    return
+                # Nút đóng hiện mà không còn hàng nào đang truyền: file chưa từng xuất hiện trong bảng
+                # tiến trình không lên được, để lượt thử lại gửi lại (nút đóng có thể còn từ lượt trước)
+                if snapshot['done'] and not any(file and file['state'] == 'uploading' for file in files):
+                    missing = [path for path, file in zip(batch['files'], files) if not file]
+                    batch['status'] = 'failed'
+                    batch['error'] = f"Studio không hiển thị {len(missing)} file trong bảng tiến trình"
+                    upload_journal.mark(self.journal_channel, missing, UPLOAD_FAILED)
+                    batch['files'] = missing
+                    return
+
+        except Exception as e:
+            batch['status'] = 'failed'
+            batch['error'] = str(e)
+            batch['files'] = [path for path in batch['files'] if path not in uploaded]
+            print(f"Batch {index + 1} failed: {str(e)}")
+
+    def batch_timeout(self, files):
+        total_size = 0
+        for path in files:
+            try:
+                total_size += os.path.getsize(path)
+            except OSError:
+                pass
+        return UPLOAD_BASE_TIMEOUT + total_size / UPLOAD_MIN_BYTES_PER_SECOND
+
+    def find_file_state(self, snapshot, file_path, stale_errors=0):
+        # Ưu tiên hàng chưa lỗi mới nhất; các hàng lỗi cũ (stale_errors) của lần thử trước bị bỏ qua
+        matches = [file for file in snapshot['files'] if studio_file_name_matches(file_path, file['name'])]
+        active = [file for file in matches if file['state'] != 'error']
+        if active:
+            return active[-1]
+        if len(matches) > stale_errors:
+            return matches[-1]
+        return None
+
+    def count_error_rows(self, snapshot, file_path):
+        return sum(1 for file in snapshot['files']
+                   if file['state'] == 'error' and studio_file_name_matches(file_path, file['name']))
+
+    def poll_upload_progress(self, label):
+        try:
+            # Một lần gọi script trả về trạng thái của mọi file trong bảng tiến trình
+            self.driver.set_script_timeout(30)
+            snapshot = self.driver.execute_async_script(UPLOAD_PROGRESS_SNAPSHOT_JS, 500, 2000)
+        except WebDriverException:
+            self.waiter.settled(label='progress monitor re-render')
+            return None
+
+        if not snapshot['found']:
+            self.waiter.element(By.CSS_SELECTOR, "ytcp-multi-progress-monitor", 'present',
+                                label='progress monitor')
+            return None
+
+        files = snapshot['files']
+        for file in files:
+            state = (file['percent'], file['state'], file['eta'], file['error'])
+            if self.last_states.get(file['name']) != state:
+                self.last_states[file['name']] = state
+                detail = file['error'] or file['eta'] or file['status']
+                self.file_progress_updated.emit(file['name'], file['percent'], file['state'], detail)
+
+        percent = sum(file['percent'] for file in files) // len(files) if files else 0
+        message = f"{label} - Uploading: {snapshot['count']}"
+        if snapshot['eta']:
+            message += f" - {snapshot['eta']}"
+        self.progress_updated.emit(min(percent, 99), message)
+        return snapshot
+
+    def wait_for_all_uploads(self):
+        close_xpath = '//ytcp-icon-button[@id="close-button" and contains(@class, "style-scope ytcp-multi-progress-monitor")]'
+        failures = 0
+        # Mọi lượt đã truyền xong (hoặc đã bỏ), nút đóng chỉ còn chờ bảng tiến trình cập nhật
+        deadline = time.time() + UPLOAD_BASE_TIMEOUT
+        while True:
+            if time.time() > deadline:
+                raise Exception(f"Bảng tiến trình upload không báo hoàn tất sau {UPLOAD_BASE_TIMEOUT // 60} phút")
+            snapshot = self.poll_upload_progress("Hoàn tất")
+            if snapshot is None:
+                failures += 1
+                if failures >= 5:
+                    raise Exception("Error monitoring upload progress")
+                continue
+            failures = 0
+
+            # Check if upload is complete and close button is available
+            if snapshot['done']:
+                # Từng file đã được ghi UPLOADED khi hàng của nó báo truyền xong
+                self.driver.find_element(By.XPATH, close_xpath).click()
+                self.waiter.gone(By.XPATH, close_xpath, label='progress monitor closed')
+                return
+
+class VideoCheckWorker(QThread):
+    """Probe headers and fingerprint newly added files off the GUI thread."""
+    checked = pyqtSignal(list)
+
+    def __init__(self, files, confirm_full_hash):
+        super().__init__()
+        self.files = files
+        self.confirm_full_hash = confirm_full_hash
+
+    def run(self):
+        paths = [file_path for file_path, _ in self.files]
+        probes = video_prober.probe_many(paths)
+        fingerprints = fingerprint_index.fingerprint_many(paths)
+        if self.confirm_full_hash:
+            # Tính sẵn hash toàn bộ của các file có khả năng trùng, luồng giao diện chỉ còn đọc cache
+            for (file_path, normalized_path), fingerprint in zip(self.files, fingerprints):
+                if fingerprint:
+                    fingerprint_index.prefetch_full_hashes(file_path, normalized_path, fingerprint)
+        self.checked.emit([(file_path, normalized_path, probe, fingerprint)
+                           for (file_path, normalized_path), probe, fingerprint
+                           in zip(self.files, probes, fingerprints)])
 
 class ChannelFrame(QFrame):
     def __init__(self, channel_name):
         super().__init__()
         self.anti_bq_manager = AntiBQManagerDialog(self)
         self.setFrameStyle(QFrame.StyledPanel)
+        self.channel_name = channel_name
         self.video_files = []
+        self.checking_files = set()
+        self.check_workers = []
         self.profiles_dict = {}
         self.chrome_path = ""
         self.remove_after_upload = False
@@ -362,6 +488,25 @@ class ChannelFrame(QFrame):
         video_controls.addWidget(add_video_btn)
         video_controls.addWidget(remove_video_btn)
         video_controls.addWidget(self.remove_videos_cb)
+
+        batch_controls = QHBoxLayout()
+        self.batch_size_spin = QSpinBox()
+        self.batch_size_spin.setRange(1, STUDIO_MAX_FILES_PER_UPLOAD)
+        self.batch_size_spin.setValue(STUDIO_MAX_FILES_PER_UPLOAD)
+        batch_controls.addWidget(QLabel("Số video mỗi lượt upload:"))
+        batch_controls.addWidget(self.batch_size_spin)
+
+        # Phát hiện file trùng nội dung (kể cả đã đổi tên) trong mọi kênh và các lần upload trước
+        self.full_hash_cb = QCheckBox("Xác nhận file trùng bằng hash toàn bộ file (chậm)")
+
+        # Manifest: tiêu đề/mô tả/tag/thumbnail/playlist riêng cho từng video
+        manifest_controls = QHBoxLayout()
+        self.manifest_path_edit = QLineEdit()
+        self.manifest_path_edit.setPlaceholderText("Manifest CSV/JSONL (tùy chọn)")
+        manifest_select_btn = QPushButton("Chọn manifest")
+        manifest_select_btn.clicked.connect(self.select_manifest_file)
+        manifest_controls.addWidget(self.manifest_path_edit)
+        manifest_controls.addWidget(manifest_select_btn)
         
         add_video_btn.clicked.connect(self.add_videos)
         remove_video_btn.clicked.connect(self.remove_video)
@@ -370,6 +515,9 @@ class ChannelFrame(QFrame):
         left_panel.addWidget(QLabel("Danh sách video:"))
         left_panel.addWidget(self.video_list)
         left_panel.addLayout(video_controls)
+        left_panel.addLayout(batch_controls)
+        left_panel.addWidget(self.full_hash_cb)
+        left_panel.addLayout(manifest_controls)
 
         # Right Panel - Settings
         right_panel = QVBoxLayout()
@@ -391,6 +539,10 @@ class ChannelFrame(QFrame):
         function_layout.addWidget(self.anti_bq_function)
         function_group.setLayout(function_layout)
 
+        # Chế độ nhẹ: chặn ảnh, font, video xem trước để chạy được nhiều kênh hơn
+        self.lean_mode_cb = QCheckBox("Chế độ nhẹ (tiết kiệm RAM)")
+        self.lean_mode_cb.setToolTip("Chặn ảnh, font, avatar, video xem trước và tiện ích mở rộng của trình duyệt")
+
         # Upload Frame (contains all upload-related options)
         self.upload_frame = QFrame()
         upload_layout = QVBoxLayout()
@@ -521,6 +673,23 @@ class ChannelFrame(QFrame):
         time_layout.addWidget(self.time_edit)
         time_group.setLayout(time_layout)
 
+        # Khoảng cách giữa các video, 0 = dùng các giờ cố định ở trên
+        interval_group = QGroupBox("Cách nhau (phút, 0 = theo giờ cố định)")
+        interval_layout = QVBoxLayout()
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(0, 7 * 24 * 60)
+        self.interval_spin.setSingleStep(15)
+        interval_layout.addWidget(self.interval_spin)
+        interval_group.setLayout(interval_layout)
+
+        # Khung giờ và ngày không đăng
+        blackout_group = QGroupBox("Không đăng vào")
+        blackout_layout = QVBoxLayout()
+        self.blackout_edit = QLineEdit()
+        self.blackout_edit.setPlaceholderText("22:00-06:00, 2026-12-25")
+        blackout_layout.addWidget(self.blackout_edit)
+        blackout_group.setLayout(blackout_layout)
+
         # Ngày tháng
         date_group = QGroupBox("Ngày tháng")
         date_layout = QVBoxLayout()
@@ -534,12 +703,14 @@ class ChannelFrame(QFrame):
         video_count_group = QGroupBox("Số video cần xử lý")
         video_count_layout = QVBoxLayout()
         self.video_count_spin = QSpinBox()
-        self.video_count_spin.setMinimum(1)
+        self.video_count_spin.setRange(1, 10000)
         video_count_layout.addWidget(self.video_count_spin)
         video_count_group.setLayout(video_count_layout)
 
         edit_status_layout.addWidget(status_group)
         edit_status_layout.addWidget(time_group)
+        edit_status_layout.addWidget(interval_group)
+        edit_status_layout.addWidget(blackout_group)
         edit_status_layout.addWidget(date_group)
         edit_status_layout.addWidget(video_count_group)
         self.edit_status_frame.setLayout(edit_status_layout)
@@ -583,6 +754,10 @@ class ChannelFrame(QFrame):
         self.anti_bq_chrome_frame.setLayout(anti_bq_chrome_layout)
         self.anti_bq_chrome_frame.hide()
         
+        self.anti_bq_unattended_cb = QCheckBox("Tự động quét tất cả trang")
+        self.anti_bq_unattended_cb.setToolTip("Lọc video có bản quyền, hiển thị tối đa hàng mỗi trang và quét hết không cần hỏi")
+        self.anti_bq_unattended_cb.setChecked(True)
+        
         # Content management button
         manage_content_btn = QPushButton("Quản lý nội dung kháng BQ")
         
@@ -590,6 +765,7 @@ class ChannelFrame(QFrame):
         anti_bq_layout.addWidget(anti_bq_browser_group)
         anti_bq_layout.addWidget(self.anti_bq_profile_frame)
         anti_bq_layout.addWidget(self.anti_bq_chrome_frame)
+        anti_bq_layout.addWidget(self.anti_bq_unattended_cb)
         anti_bq_layout.addWidget(manage_content_btn)
         
         self.anti_bq_frame.setLayout(anti_bq_layout)
@@ -628,6 +804,7 @@ class ChannelFrame(QFrame):
         # Add components to right panel
         right_panel.addWidget(header)
         right_panel.addWidget(function_group)
+        right_panel.addWidget(self.lean_mode_cb)
         right_panel.addWidget(self.action_type_group)
         right_panel.addWidget(self.upload_frame)
         right_panel.addWidget(self.edit_info_frame)  # Thêm frame sửa thông tin
@@ -658,6 +835,25 @@ class ChannelFrame(QFrame):
             self.edit_info_frame.hide()
             self.edit_status_frame.show()
 
+    def select_manifest_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Chọn manifest", "", "Manifest (*.csv *.jsonl *.ndjson)")
+        if file_path:
+            self.manifest_path_edit.setText(file_path)
+
+    def get_manifest(self):
+        path = self.manifest_path_edit.text().strip()
+        return VideoManifest(path) if path else None
+
+    def get_publish_plan(self):
+        # Chọn Public thì không cần lịch
+        if self.public_radio.isChecked():
+            return None
+        start = datetime.combine(self.date_edit.date().toPyDate(), datetime.min.time())
+        start = max(start, datetime.now() + timedelta(minutes=PUBLISH_LEAD_MINUTES))
+        return PublishPlan.from_text(start, self.time_edit.text(), self.interval_spin.value(),
+                                     self.blackout_edit.text())
+
     def select_thumb_folder(self):
         folder = QFileDialog.getExistingDirectory(self, "Chọn thư mục chứa ảnh thumbnail")
         if folder:
@@ -719,12 +915,12 @@ class ChannelFrame(QFrame):
             selected_profile = self.anti_bq_profile_combo.currentText()
             if selected_profile in self.profiles_dict:
                 profile_id = self.profiles_dict[selected_profile]
-                self.close_existing_firefox()
+                profile_path = os.path.expanduser(f'~\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\{profile_id}')
+                self.close_existing_firefox(profile_path)
                 
                 try:
                     firefox_options = webdriver.FirefoxOptions()
                     firefox_options.binary_location = r"C:/Program Files/Mozilla Firefox/firefox.exe"
-                    profile_path = os.path.expanduser(f'~\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\{profile_id}')
                     firefox_options.add_argument("-profile")
                     firefox_options.add_argument(os.fspath(profile_path))
                     
@@ -778,17 +974,56 @@ class ChannelFrame(QFrame):
     def toggle_remove_videos(self, checked):
         self.remove_after_upload = checked
 
+    def remove_uploaded_files(self, paths):
+        # Chỉ nhận các file đã được ghi nhận upload xong trong journal
+        if not self.remove_after_upload:
+            return
+        uploaded = {os.path.normcase(path) for path in paths}
+        for i in reversed(range(self.video_list.count())):
+            item_path = os.path.abspath(self.video_list.item(i).text()).replace('/', '\\')
+            if os.path.normcase(item_path) in uploaded:
+                fingerprint_index.unqueue(self.video_list.item(i).text())
+                self.video_list.takeItem(i)
+
+    def record_uploaded_files(self, paths):
+        # Lưu fingerprint để lần sau phát hiện file này (hoặc bản sao đổi tên) đã lên kênh nào
+        kind, value = self.get_upload_profile_key()
+        fingerprint_index.record_uploaded(f"{kind}:{value}", self.channel_name, paths)
+
+    def get_upload_profile_key(self):
+        # Hai kênh dùng chung profile không được chạy cùng lúc
+        if self.firefox_radio.isChecked():
+            return ('firefox', self.profiles_dict.get(self.profile_combo.currentText()))
+        return ('chrome', os.path.normcase(os.path.abspath(self.chrome_path_edit.text().strip())))
+
+    def get_upload_channel_key(self):
+        # Khóa ổn định của kênh khi lưu lịch sử; tên "Kênh N" đổi theo thứ tự các kênh
+        kind, value = self.get_upload_profile_key()
+        return f"{kind}:{value}"
+
+    def get_anti_bq_profile_key(self):
+        if self.anti_bq_firefox_radio.isChecked():
+            return ('firefox', self.profiles_dict.get(self.anti_bq_profile_combo.currentText()))
+        return ('chrome', os.path.normcase(os.path.abspath(self.anti_bq_chrome_path_edit.text().strip())))
+
+    def get_selected_profile(self):
+        selected_profile = self.profile_combo.currentText()
+        if selected_profile not in self.profiles_dict:
+            return None
+        profile_id = self.profiles_dict[selected_profile]
+        return os.path.expanduser(f'~\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\{profile_id}')
+
     def open_profile_for_check(self):
         if self.firefox_radio.isChecked():
             selected_profile = self.profile_combo.currentText()
             if selected_profile in self.profiles_dict:
                 profile_id = self.profiles_dict[selected_profile]
-                self.close_existing_firefox()
+                profile_path = os.path.expanduser(f'~\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\{profile_id}')
+                self.close_existing_firefox(profile_path)
                 
                 try:
                     firefox_options = webdriver.FirefoxOptions()
                     firefox_options.binary_location = r"C:/Program Files/Mozilla Firefox/firefox.exe"
-                    profile_path = os.path.expanduser(f'~\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\{profile_id}')
                     firefox_options.add_argument("-profile")
                     firefox_options.add_argument(os.fspath(profile_path))
                     
@@ -802,14 +1037,28 @@ class ChannelFrame(QFrame):
             QMessageBox.information(self, "Thông báo", 
                 "Tính năng này chỉ khả dụng cho Firefox!")
 
-    def close_existing_firefox(self):
-        for process in psutil.process_iter(['pid', 'name']):
+    def close_existing_firefox(self, profile_path):
+        # Firefox khóa profile đang mở: chỉ đóng các Firefox đang dùng đúng profile này
+        # (và cây trình duyệt bỏ lại từ lần chạy bị crash), không đụng tới phiên của kênh khác
+        process_registry.reap_orphans()
+        target = os.path.normcase(os.path.abspath(profile_path))
+        processes = []
+        for process in psutil.process_iter(['name', 'cmdline']):
             try:
-                if process.info['name'] == 'firefox.exe':
-                    psutil.Process(process.info['pid']).terminate()
-                    time.sleep(1)  # Đợi process đóng hoàn toàn
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                if (process.info['name'] or '').lower() != 'firefox.exe':
+                    continue
+                cmdline = process.info['cmdline'] or []
+                if any(os.path.normcase(os.path.abspath(arg)) == target for arg in cmdline[1:]):
+                    processes.append(process)
+                    processes.extend(process.children(recursive=True))
+            except psutil.Error:
                 continue
+        for process in processes:
+            try:
+                process.terminate()
+            except psutil.Error:
+                pass
+        psutil.wait_procs(processes, timeout=5)
 
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
@@ -850,13 +1099,89 @@ class ChannelFrame(QFrame):
 
     def add_files_to_list(self, files):
         valid_extensions = ('.mp4', '.avi', '.mkv')
+        existing_items = {self.video_list.item(i).text() for i in range(self.video_list.count())}
+        existing_items |= self.checking_files
+        new_files = []
         for file_path in files:
             if file_path.lower().endswith(valid_extensions):
                 normalized_path = os.path.abspath(file_path).replace('/', '\\')
-                existing_items = [self.video_list.item(i).text() 
-                                for i in range(self.video_list.count())]
                 if normalized_path not in existing_items:
-                    self.video_list.addItem(normalized_path)
+                    existing_items.add(normalized_path)
+                    new_files.append((file_path, normalized_path))
+        
+        if not new_files:
+            return
+        
+        # Đọc header (không giải mã) và fingerprint ở luồng riêng, ổ mạng chậm không làm treo giao diện
+        self.checking_files.update(normalized_path for _, normalized_path in new_files)
+        worker = VideoCheckWorker(new_files, self.full_hash_cb.isChecked())
+        worker.checked.connect(self.on_files_checked)
+        worker.finished.connect(lambda: self.check_workers.remove(worker))
+        self.check_workers.append(worker)
+        worker.start()
+
+    def on_files_checked(self, checked):
+        confirm = self.full_hash_cb.isChecked()
+        rejected = []
+        uploaded_before = []
+        for file_path, normalized_path, probe, fingerprint in checked:
+            self.checking_files.discard(normalized_path)
+            name = os.path.basename(file_path)
+            if probe['error']:
+                rejected.append(f"{name}: {probe['error']}")
+                continue
+            if fingerprint:
+                try:
+                    queued = self.find_queued_copy(file_path, normalized_path, fingerprint, confirm)
+                    history = fingerprint_index.uploaded(fingerprint)
+                    if confirm:
+                        history = [row for row in history
+                                   if fingerprint_index.same_content(file_path, row[1], row[2])]
+                except Exception as e:
+                    rejected.append(f"{name}: {str(e)}")
+                    continue
+                if queued:
+                    rejected.append(f"{name}: trùng với {queued[1]} ({queued[0]})")
+                    continue
+                if history:
+                    channels = ", ".join(sorted({row[0] for row in history}))
+                    uploaded_before.append((name, channels, file_path, normalized_path, probe, fingerprint))
+                    continue
+            self.add_video_item(normalized_path, probe, fingerprint)
+        
+        if uploaded_before:
+            details = "\n".join(f"{name}: {channels}" for name, channels, *_ in uploaded_before)
+            answer = QMessageBox.question(
+                self, "File đã upload",
+                f"Các file sau đã từng được upload:\n{details}\n\nVẫn thêm vào danh sách?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if answer == QMessageBox.Yes:
+                for name, _, file_path, normalized_path, probe, fingerprint in uploaded_before:
+                    # Hai bản của cùng một file đã upload có thể nằm trong cùng lượt thêm
+                    try:
+                        queued = self.find_queued_copy(file_path, normalized_path, fingerprint, confirm)
+                    except Exception as e:
+                        rejected.append(f"{name}: {str(e)}")
+                        continue
+                    if queued:
+                        rejected.append(f"{name}: trùng với {queued[1]} ({queued[0]})")
+                        continue
+                    self.add_video_item(normalized_path, probe, fingerprint)
+        if rejected:
+            QMessageBox.warning(self, "File video lỗi", "Các file sau không được thêm:\n" + "\n".join(rejected))
+
+    def find_queued_copy(self, file_path, normalized_path, fingerprint, confirm):
+        # Bản sao đang nằm trong danh sách của kênh bất kỳ; khi bật xác nhận chỉ tính file trùng hash toàn bộ
+        for channel_name, path in fingerprint_index.queued_copies(fingerprint, normalized_path):
+            if not confirm or fingerprint_index.same_content(file_path, path):
+                return channel_name, path
+        return None
+
+    def add_video_item(self, normalized_path, probe, fingerprint):
+        if fingerprint:
+            fingerprint_index.queue(fingerprint, self.channel_name, normalized_path)
+        self.video_list.addItem(normalized_path)
+        self.video_list.item(self.video_list.count() - 1).setToolTip(format_probe(probe))
 
     def add_videos(self):
         files, _ = QFileDialog.getOpenFileNames(
@@ -870,15 +1195,26 @@ class ChannelFrame(QFrame):
     def remove_video(self):
         current_row = self.video_list.currentRow()
         if current_row >= 0:
+            fingerprint_index.unqueue(self.video_list.item(current_row).text())
             self.video_list.takeItem(current_row)
 
+    def update_file_progress(self, name, percent, state, detail):
+        for i in range(self.video_list.count()):
+            item = self.video_list.item(i)
+            if studio_file_name_matches(item.text(), name):
+                item.setToolTip(f"{percent}% - {detail or state}")
+                if state == 'error':
+                    item.setForeground(Qt.red)
+                elif state == 'uploaded':
+                    item.setForeground(Qt.darkGreen)
+                break
+
     def process_next_edit_info(self):
         if self.upload_queue:
             channel_frame = self.upload_queue[0]
             editor = EditVideoInfo(channel_frame.driver, self.update_progress)
             try:
-                results = editor.start_edit_process()
-                # Xử lý kết quả
+                editor.start_edit_process(EditPlan.from_channel_frame(channel_frame))
             except Exception as e:
                 QMessageBox.critical(self, "Lỗi", f"Lỗi khi sửa thông tin: {str(e)}")
             finally:
@@ -891,8 +1227,9 @@ class ChannelFrame(QFrame):
             channel_frame = self.upload_queue[0]
             editor = EditVideoStatus(channel_frame.driver, self.update_progress)
             try:
-                results = editor.start_edit_process()
-                # Xử lý kết quả
+                editor.start_edit_process(channel_frame.get_publish_plan(),
+                                          channel_frame.video_count_spin.value(),
+                                          channel_frame.get_upload_channel_key())
             except Exception as e:
                 QMessageBox.critical(self, "Lỗi", f"Lỗi khi sửa trạng thái: {str(e)}")
             finally:
@@ -910,10 +1247,37 @@ class UploadYoutubeTab(QWidget):
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.channel_frames = []
         self.anti_bq_queue = []  # Thêm queue cho kháng BQ
+        # Dọn driver/trình duyệt còn sót lại từ lần chạy bị crash trước
+        process_registry.reap_orphans()
+        self.upload_pool = ChannelWorkerPool(self.create_upload_worker,
+                                             lambda frame: frame.get_upload_profile_key(),
+                                             parent=self)
+        self.upload_pool.channel_started.connect(self.on_upload_channel_started)
+        self.upload_pool.channel_progress.connect(self.on_upload_channel_progress)
+        self.upload_pool.channel_finished.connect(self.on_upload_channel_finished)
+        self.upload_pool.all_finished.connect(self.on_upload_pool_finished)
+        self.upload_channel_progress = {}
+        self.anti_bq_pool = ChannelWorkerPool(self.create_anti_bq_worker,
+                                              lambda frame: frame.get_anti_bq_profile_key(),
+                                              parent=self)
+        self.anti_bq_pool.channel_started.connect(self.on_anti_bq_channel_started)
+        self.anti_bq_pool.channel_progress.connect(self.on_anti_bq_channel_progress)
+        self.anti_bq_pool.channel_finished.connect(self.on_anti_bq_channel_finished)
+        self.anti_bq_pool.all_finished.connect(self.on_anti_bq_pool_finished)
+        self.anti_bq_channel_progress = {}
+        self.template_requests = []
+        self.template_dialog_open = False
         self.init_upload_ui()
         self.load_firefox_profiles()
         # Connect the signal to update progress bar
         self.progress_updated.connect(self.update_progress)
+        # Đóng toàn bộ trình duyệt trong pool khi thoát ứng dụng
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(session_pool.shutdown)
+            app.aboutToQuit.connect(thumbnail_preparer.shutdown)
+            app.aboutToQuit.connect(video_prober.shutdown)
+            app.aboutToQuit.connect(fingerprint_index.shutdown)
 
     def init_upload_ui(self):
         main_layout = QVBoxLayout()
@@ -934,10 +1298,35 @@ class UploadYoutubeTab(QWidget):
         add_channel_btn = QPushButton("Thêm Kênh Mới")
         self.upload_all_btn = QPushButton("Upload Tất Cả")  # Store as instance variable
         anti_bq_all_btn = QPushButton("Kháng BQ Tất Cả")
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, 10)
+        self.parallel_spin.setValue(2)
+        self.parallel_spin.setToolTip("Số kênh upload/kháng BQ cùng lúc")
+        self.recycle_spin = QSpinBox()
+        self.recycle_spin.setRange(1, 500)
+        self.recycle_spin.setValue(session_pool.max_jobs)
+        self.recycle_spin.setToolTip("Khởi động lại trình duyệt sau số lượt tác vụ này")
+        self.similarity_spin = QSpinBox()
+        self.similarity_spin.setRange(50, 100)
+        self.similarity_spin.setSuffix("%")
+        self.similarity_spin.setValue(int(title_matcher.threshold * 100))
+        self.similarity_spin.setToolTip("Độ giống tối thiểu để tự chọn nội dung kháng khi tiêu đề không khớp chính xác")
+        self.dispute_rate_spin = QSpinBox()
+        self.dispute_rate_spin.setRange(1, 600)
+        self.dispute_rate_spin.setValue(dispute_limits.rate_per_hour)
+        self.dispute_rate_spin.setToolTip("Số kháng cáo tối đa mỗi giờ cho mỗi kênh, tránh bị Studio giới hạn")
         
         controls.addWidget(add_channel_btn)
         controls.addWidget(self.upload_all_btn)  # Use instance variable
         controls.addWidget(anti_bq_all_btn)
+        controls.addWidget(QLabel("Số kênh song song:"))
+        controls.addWidget(self.parallel_spin)
+        controls.addWidget(QLabel("Tái tạo trình duyệt sau:"))
+        controls.addWidget(self.recycle_spin)
+        controls.addWidget(QLabel("Độ giống tiêu đề:"))
+        controls.addWidget(self.similarity_spin)
+        controls.addWidget(QLabel("Kháng cáo/giờ mỗi kênh:"))
+        controls.addWidget(self.dispute_rate_spin)
         
         # Progress bar
         self.progress_bar = QProgressBar()
@@ -955,260 +1344,125 @@ class UploadYoutubeTab(QWidget):
         add_channel_btn.clicked.connect(self.add_channel)
         self.upload_all_btn.clicked.connect(self.start_upload_all)  # Use instance variable
         anti_bq_all_btn.clicked.connect(self.start_anti_bq)
+        self.parallel_spin.valueChanged.connect(self.set_parallel_workers)
+        self.dispute_rate_spin.valueChanged.connect(dispute_limits.set_rate)
+        self.recycle_spin.valueChanged.connect(session_pool.set_max_jobs)
+        self.similarity_spin.valueChanged.connect(lambda value: title_matcher.set_threshold(value / 100))
+
+    def set_parallel_workers(self, value):
+        # Pool đang rảnh sẽ nhận giá trị mới khi bắt đầu lượt kế tiếp
+        if self.upload_pool.is_running():
+            self.upload_pool.set_max_workers(value)
+        if self.anti_bq_pool.is_running():
+            self.anti_bq_pool.set_max_workers(value)
 
     def start_anti_bq(self):
-        # Initialize anti-BQ queue
-        self.anti_bq_queue = []
-        
+        if self.anti_bq_pool.is_running():
+            self.status_label.setText("Đang kháng BQ, vui lòng chờ hoàn tất")
+            return
+            
         # Use channel_frames list instead of channel_tabs
-        for channel_frame in self.channel_frames:
-            if channel_frame.anti_bq_function.isChecked():
-                self.anti_bq_queue.append(channel_frame)
+        self.anti_bq_queue = [channel_frame for channel_frame in self.channel_frames
+                              if channel_frame.anti_bq_function.isChecked()]
                 
-        if self.anti_bq_queue:
-            self.process_next_anti_bq()
-        else:
+        if not self.anti_bq_queue:
             QMessageBox.information(self, "Thông báo", "Không có kênh nào để xử lý!")
-
-    def get_chrome_version(self, chrome_path):
-        try:
-            chrome_dir = os.path.dirname(chrome_path)
-            chrome_exe = os.path.join(chrome_dir, 'App', 'Chrome-bin', 'chrome.exe')
-            version_info = win32api.GetFileVersionInfo(chrome_exe, '\\')
-            ms = version_info['FileVersionMS']
-            ls = version_info['FileVersionLS']
-            version = f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
-            return version
-        except Exception as e:
-            print(f"Version detection error: {str(e)}")
-            return None
-
-    def setup_chrome_driver(self):
-        try:
-            chrome_path = self.channel_frame.chrome_path_edit.text().strip()
-            
-            # Add initial delay for stability
-            time.sleep(2)
-            
-            chrome_version = self.get_chrome_version(chrome_path)
-            if not chrome_version:
-                raise Exception("Unable to detect Chrome version")
-                
-            options = webdriver.ChromeOptions()
-            options.binary_location = chrome_path
-            
-            # Add additional stability options
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--remote-debugging-port=9222')
-            options.add_argument('--start-maximized')
-            options.page_load_strategy = 'normal'
-            
-            data_dir = os.path.join(os.path.dirname(chrome_path), 'Data')
-            if os.path.exists(data_dir):
-                options.add_argument(f'--user-data-dir={data_dir}')
-            
-            driver_path = ChromeDriverManager(driver_version=chrome_version).install()
-            service = Service(executable_path=driver_path)
-            service.creation_flags = CREATE_NO_WINDOW
-            
-            # Add retry mechanism
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    self.driver = webdriver.Chrome(service=service, options=options)
-                    self.driver.set_window_size(1320, 960)
-                    # Test driver by executing simple command
-                    self.driver.execute_script('return document.readyState')
-                    break
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    time.sleep(2)
-                    
-        except Exception as e:
-            raise Exception(f"Failed to setup Chrome: {str(e)}")
-
-    def download_chromedriver(self, chrome_version):
-        try:
-            # Create storage directory
-            user_home = os.path.expanduser('~')
-            chromedriver_dir = os.path.join(user_home, 'AppData', 'Local', 'ChromeDriver')
-            os.makedirs(chromedriver_dir, exist_ok=True)
-            
-            # Extract major version from Chrome Portable
-            major_version = chrome_version.split('.')[0]
-            
-            # Set driver version based on Chrome version
-            driver_version_map = {
-                "129": "129.0.6668.59",
-                "128": "128.0.6462.59",
-                # Add more versions as needed
-            }
-            
-            driver_version = driver_version_map.get(major_version)
-            if not driver_version:
-                raise Exception(f"Unsupported Chrome version: {major_version}")
-                
-            # Download matching ChromeDriver
-            driver_path = ChromeDriverManager(driver_version=driver_version).install()
-            
-            # Move to our managed location
-            final_path = os.path.join(chromedriver_dir, f"chromedriver_{major_version}.exe")
-            shutil.copy2(driver_path, final_path)
-            
-            return final_path
-            
-        except Exception as e:
-            raise Exception(f"ChromeDriver download failed: {str(e)}")
-
-    def find_existing_chromedriver(self, driver_dir, chrome_version):
-        try:
-            for root, dirs, files in os.walk(driver_dir):
-                if 'chromedriver.exe' in files:
-                    driver_path = os.path.join(root, 'chromedriver.exe')
-                    # Verify driver version matches Chrome version
-                    import subprocess
-                    output = subprocess.check_output([driver_path, '--version']).decode()
-                    if f"ChromeDriver {chrome_version}." in output:
-                        return driver_path
-            return None
-        except:
-            return None
-
-    def process_next_edit_info(self):
-        if not self.upload_queue:
-            self.on_all_uploads_complete()
             return
-            
-        channel_frame = self.upload_queue[0]
-        editor = EditVideoInfo(None, self.update_progress)
-        
-        try:
-            # Initialize browser
-            if channel_frame.firefox_radio.isChecked():
-                profile_path = channel_frame.get_selected_profile()
-                if not profile_path:
-                    raise Exception("Chưa chọn profile Firefox")
-                editor.setup_firefox_driver(profile_path)
-            else:
-                chrome_path = channel_frame.chrome_path_edit.text().strip()
-                chrome_version = self.get_chrome_version(chrome_path)
-                if not chrome_version:
-                    raise Exception("Unable to detect Chrome version")
-                editor.setup_chrome_driver(chrome_path, chrome_version)
-                
-            # Start edit process
-            results = editor.start_edit_process()
-            
-            # Process results
-            for result in results:
-                if result["status"] == "success":
-                    video = result["video"]
-                    editor.update_video_info(
-                        video,
-                        channel_frame.title_edit.toPlainText(),
-                        channel_frame.desc_edit.toPlainText(),
-                        channel_frame.tags_edit.toPlainText(),
-                        channel_frame.thumb_path_edit.text()
-                    )
-                    
-            self.upload_queue.pop(0)
-            self.process_next_edit_info()
-            
-        except Exception as e:
-            self.on_upload_error(str(e))
-        finally:
-            if hasattr(editor, 'driver'):
-                editor.driver.quit()
 
-    def show_input_dialog(self, title, message):
+        self.anti_bq_channel_progress = {}
+        self.progress_bar.setValue(0)
+        self.anti_bq_pool.set_max_workers(self.parallel_spin.value())
+        self.anti_bq_pool.start(self.anti_bq_queue)
+        self.anti_bq_queue = []
+
+    def show_input_dialog(self, title, message, worker=None):
+        worker = worker or self.current_worker
         dialog = QInputDialog(self)
         dialog.setWindowTitle(title)
         dialog.setLabelText(message)
         dialog.resize(500, 200)
         
         if dialog.exec_() == QDialog.Accepted:
-            self.current_worker.input_text = dialog.textValue()
-            self.current_worker.input_received.emit(dialog.textValue())
+            worker.input_text = dialog.textValue()
+            worker.input_received.emit(dialog.textValue())
         else:
-            self.current_worker.input_text = None
-            self.current_worker.input_received.emit("")
+            worker.input_text = None
+            worker.input_received.emit("")
 
-    def show_confirmation_dialog(self, title, message):
+    def show_confirmation_dialog(self, title, message, worker=None):
+        worker = worker or self.current_worker
         reply = QMessageBox.question(self, title, message,
                                    QMessageBox.Yes | QMessageBox.No)
         result = reply == QMessageBox.Yes
-        self.current_worker.confirmation_result = result
-        self.current_worker.confirmation_received.emit(result)
-
-    def process_next_anti_bq(self):
-        if self.anti_bq_queue:
-            channel_frame = self.anti_bq_queue[0]
-            # Initialize the current_worker first
-            self.current_worker = AntiBQWorker(channel_frame, channel_frame.anti_bq_manager)
-                
-            # Connect all signals after worker is initialized
-            self.current_worker.progress_updated.connect(self.update_progress)
-            self.current_worker.process_complete.connect(self.on_anti_bq_channel_complete)
-            self.current_worker.error_occurred.connect(self.on_anti_bq_error)
-            self.current_worker.request_input.connect(self.show_input_dialog)
-            self.current_worker.request_confirmation.connect(self.show_confirmation_dialog)
-                
-            # Start the worker
-            self.current_worker.start()
-            
-            self.status_label.setText(f"Đang xử lý kháng BQ {channel_frame.findChild(QLabel).text()}")
-        else:
-            self.on_all_anti_bq_complete()
-   
-    def on_anti_bq_complete(self):
-        # Remove completed channel from queue
-        if self.anti_bq_queue:
-            self.anti_bq_queue.pop(0)
-            
-        # Process next channel after delay
-        QTimer.singleShot(2000, self.process_next_anti_bq)
-
-    def process_next_anti_bq_channel(self):
-        if self.anti_bq_queue:
-            current_channel = self.anti_bq_queue[0]
-            self.current_worker = AntiBQWorker(current_channel, current_channel.anti_bq_manager)
-            
-            # Connect signals including dialog handlers
-            self.current_worker.progress_updated.connect(self.update_progress)
-            self.current_worker.process_complete.connect(self.on_anti_bq_channel_complete)
-            self.current_worker.error_occurred.connect(self.on_anti_bq_error)
-            self.current_worker.request_input.connect(self.show_input_dialog)
-            self.current_worker.request_confirmation.connect(self.show_confirmation_dialog)
-            
-            self.current_worker.start()
-
-            channel_frame = self.anti_bq_queue[0]
-            
-            # Kiểm tra và đóng Firefox trước khi bắt đầu
-            if channel_frame.anti_bq_firefox_radio.isChecked():
-                channel_frame.close_existing_firefox()
-            
-            # Create worker with just the channel_frame
-            self.status_label.setText(f"Đang xử lý kháng BQ {channel_frame.findChild(QLabel).text()}")
+        worker.confirmation_result = result
+        worker.confirmation_received.emit(result)
+
+    def create_anti_bq_worker(self, channel_frame, debug_port):
+        worker = AntiBQWorker(channel_frame, channel_frame.anti_bq_manager, debug_port)
+        # Trả lời đúng worker đã hỏi vì nhiều kênh chạy cùng lúc
+        worker.request_input.connect(
+            lambda title, message, worker=worker: self.show_input_dialog(title, message, worker))
+        worker.request_confirmation.connect(
+            lambda title, message, worker=worker: self.show_confirmation_dialog(title, message, worker))
+        worker.missing_templates.connect(
+            lambda titles, worker=worker: self.queue_template_request(worker, titles))
+        return worker
+
+    def queue_template_request(self, worker, titles):
+        # Nhiều kênh có thể cùng báo thiếu nội dung: xếp hàng, mỗi lúc chỉ mở một hộp thoại
+        self.template_requests.append((worker, titles))
+        if self.template_dialog_open:
+            return
+        self.template_dialog_open = True
+        try:
+            while self.template_requests:
+                worker, titles = self.template_requests.pop(0)
+                # Bỏ các tiêu đề đã được nhập ở hộp thoại của kênh trước
+                titles = [title for title in titles if title_matcher.match(title) is None]
+                if titles:
+                    self.status_label.setText(f"{worker.channel_frame.channel_name}: "
+                                              f"cần nhập nội dung kháng cho {len(titles)} tiêu đề")
+                    MissingTemplatesDialog(titles, self).exec_()
+                worker.templates_ready.emit()
+        finally:
+            self.template_dialog_open = False
+
+    def on_anti_bq_channel_started(self, channel_frame):
+        self.anti_bq_channel_progress[channel_frame] = 0
+        self.status_label.setText(f"Đang xử lý kháng BQ {channel_frame.channel_name}")
+
+    def on_anti_bq_channel_progress(self, channel_frame, value, message):
+        self.anti_bq_channel_progress[channel_frame] = value
+        self.status_label.setText(f"{channel_frame.channel_name}: {message}")
+        self.update_anti_bq_pool_progress()
+
+    def on_anti_bq_channel_finished(self, channel_frame, success, error):
+        self.anti_bq_channel_progress[channel_frame] = 100
+        pool = self.anti_bq_pool
+        if success:
+            message = f"Đã kháng BQ xong {channel_frame.channel_name}"
         else:
-            self.on_all_anti_bq_complete()
-
-    def on_anti_bq_channel_complete(self):
-        if self.anti_bq_queue:
-            self.anti_bq_queue.pop(0)  # Xóa kênh đã xử lý
-        self.process_next_anti_bq_channel()
+            message = f"Lỗi kháng BQ {channel_frame.channel_name}: {error}"
+        self.status_label.setText(f"{message} ({pool.finished_count}/{pool.total})")
+        self.update_anti_bq_pool_progress()
+
+    def update_anti_bq_pool_progress(self):
+        total = self.anti_bq_pool.total
+        if total:
+            self.progress_bar.setValue(sum(self.anti_bq_channel_progress.values()) // total)
+
+    def on_anti_bq_pool_finished(self):
+        errors = self.anti_bq_pool.errors
+        if errors:
+            details = "\n".join(f"{frame.channel_name}: {error}" for frame, error in errors.items())
+            QMessageBox.warning(self, "Error", f"Kháng BQ thất bại:\n{details}")
+        self.on_all_anti_bq_complete()
 
     def on_all_anti_bq_complete(self):
         QMessageBox.information(self, "Success", "Tất cả các kênh đã kháng BQ xong!")
         self.progress_bar.setValue(100)
         self.status_label.setText("Hoàn tất kháng BQ tất cả")
 
-    def on_anti_bq_error(self, error_message):
-        QMessageBox.warning(self, "Error", f"Kháng BQ thất bại: {error_message}")
-
     def add_channel(self):
         channel_frame = ChannelFrame(f"Kênh {len(self.channel_frames) + 1}")
         self.channels_layout.addWidget(channel_frame)
@@ -1286,6 +1540,11 @@ class UploadYoutubeTab(QWidget):
         if not self.upload_queue:
             self.status_label.setText("Không có kênh nào được chọn")
             return
+
+        # Kiểm tra toàn bộ manifest trước khi mở bất kỳ trình duyệt nào
+        if not self.validate_manifests(self.upload_queue):
+            self.upload_queue = []
+            return
             
         # Check which action is selected
         if self.current_channel_frame and self.current_channel_frame.upload_action.isChecked():
@@ -1298,129 +1557,184 @@ class UploadYoutubeTab(QWidget):
             # Start edit status process
             self.process_next_edit_status()
 
+    def validate_manifests(self, channel_frames):
+        for channel_frame in channel_frames:
+            manifest = channel_frame.get_manifest()
+            if not manifest:
+                continue
+            if not os.path.isfile(manifest.path):
+                QMessageBox.warning(self, "Lỗi", f"{channel_frame.channel_name}: không tìm thấy manifest {manifest.path}")
+                return False
+            self.status_label.setText(f"Đang kiểm tra manifest {channel_frame.channel_name}...")
+            QApplication.processEvents()
+            count, errors = manifest.validate()
+            if errors:
+                QMessageBox.warning(self, "Manifest không hợp lệ",
+                                    f"{channel_frame.channel_name} ({count} dòng):\n" + "\n".join(errors))
+                return False
+            self.status_label.setText(f"Manifest {channel_frame.channel_name}: {count} dòng hợp lệ")
+        return True
+
     def process_next_upload(self):
-        if self.upload_queue:
-            # Clear previous worker
-            if hasattr(self, 'current_worker') and self.current_worker:
-                self.current_worker.cleanup_driver()
-                self.current_worker = None
-                
-            channel_frame = self.upload_queue[0]
-            self.current_worker = UploadWorker(channel_frame)
-            
-            # Connect signals
-            self.current_worker.progress_updated.connect(self.update_progress)
-            self.current_worker.upload_complete.connect(self.on_channel_complete)
-            self.current_worker.error_occurred.connect(self.handle_upload_error)
-            
-            self.status_label.setText(f"Đang xử lý {channel_frame.findChild(QLabel).text()}")
-            self.current_worker.start()
+        if self.upload_pool.is_running():
+            self.status_label.setText("Đang upload, vui lòng chờ hoàn tất")
+            return
 
-    def on_channel_complete(self):
-        # Remove completed channel from queue
-        if self.upload_queue:
-            self.upload_queue.pop(0)
-        
-        # Cleanup current worker
-        if self.current_worker:
-            self.current_worker.cleanup_driver()
-            self.current_worker = None
-        
-        # Process next channel after a short delay
-        QTimer.singleShot(2000, self.process_next_upload)
+        self.upload_channel_progress = {}
+        self.progress_bar.setValue(0)
+        self.upload_pool.set_max_workers(self.parallel_spin.value())
+        self.upload_pool.start(self.upload_queue)
+        self.upload_queue = []
 
-    def handle_upload_error(self, error):
-        if error == "LOGIN_FAILED":
-            # Get current channel name for logging
-            current_channel = self.upload_queue[0].findChild(QLabel).text()
-            self.status_label.setText(f"Đăng nhập thất bại: {current_channel}")
-            
-            # Remove failed channel from queue
-            self.upload_queue.pop(0)
+    def create_upload_worker(self, channel_frame, debug_port):
+        self.current_worker = UploadWorker(channel_frame, debug_port)
+        self.current_worker.files_uploaded.connect(channel_frame.record_uploaded_files)
+        self.current_worker.files_uploaded.connect(channel_frame.remove_uploaded_files)
+        self.current_worker.file_progress_updated.connect(
+            lambda name, percent, state, detail, frame=channel_frame:
+                self.on_upload_file_progress(frame, name, percent, state, detail))
+        return self.current_worker
+
+    def on_upload_file_progress(self, channel_frame, name, percent, state, detail):
+        channel_frame.update_file_progress(name, percent, state, detail)
+        self.status_label.setText(f"{channel_frame.channel_name}: {name} {percent}% {detail}".strip())
+
+    def on_upload_channel_started(self, channel_frame):
+        self.upload_channel_progress[channel_frame] = 0
+        self.status_label.setText(f"Đang xử lý {channel_frame.channel_name}")
+
+    def on_upload_channel_progress(self, channel_frame, value, message):
+        self.upload_channel_progress[channel_frame] = value
+        self.status_label.setText(f"{channel_frame.channel_name}: {message}")
+        self.update_upload_pool_progress()
+
+    def on_upload_channel_finished(self, channel_frame, success, error):
+        self.upload_channel_progress[channel_frame] = 100
+        pool = self.upload_pool
+        if success:
+            message = f"Đã xong {channel_frame.channel_name}"
+        elif error == "LOGIN_FAILED":
+            message = f"Đăng nhập thất bại: {channel_frame.channel_name}"
+        else:
+            message = f"Lỗi {channel_frame.channel_name}: {error}"
+        self.status_label.setText(f"{message} ({pool.finished_count}/{pool.total})")
+        self.update_upload_pool_progress()
+
+    def update_upload_pool_progress(self):
+        total = self.upload_pool.total
+        if total:
+            self.progress_bar.setValue(sum(self.upload_channel_progress.values()) // total)
+
+    def on_upload_pool_finished(self):
+        self.current_worker = None
+        errors = self.upload_pool.errors
+        if errors:
+            details = "\n".join(f"{frame.channel_name}: {error}" for frame, error in errors.items())
+            QMessageBox.warning(self, "Error", f"Upload failed:\n{details}")
+        self.on_all_uploads_complete()
+
+    def create_channel_driver(self, channel_frame):
+        # Initialize browser first
+        if channel_frame.firefox_radio.isChecked():
+            profile_path = channel_frame.get_selected_profile()
+            if not profile_path:
+                raise Exception("Chưa chọn profile Firefox")
+                
+            # Setup Firefox driver
+            driver = launch_firefox_driver(profile_path, channel_frame.lean_mode_cb.isChecked())
             
-            # Process next channel if available
-            if self.upload_queue:
-                self.process_next_upload()
-            else:
-                self.on_all_uploads_complete()
         else:
-            # Handle other errors through existing error handler
-            self.on_upload_error(error)
+            # Setup Chrome Portable
+            chrome_path = channel_frame.chrome_path_edit.text().strip()
+            driver = launch_chrome_driver(chrome_path, lean=channel_frame.lean_mode_cb.isChecked())
+
+        return driver
 
     def process_next_edit_info(self):
         if not self.upload_queue:
             self.on_all_uploads_complete()
             return
             
-        channel_frame = self.upload_queue[0]
+        channel_frame = self.upload_queue.pop(0)
+        manifest = channel_frame.get_manifest()
+        plan = EditPlan.from_channel_frame(channel_frame)
+        if not manifest and plan.is_empty():
+            self.status_label.setText(f"{channel_frame.channel_name}: chưa nhập thông tin cần sửa")
+            self.process_next_edit_info()
+            return
+            
+        session_key = channel_frame.get_upload_profile_key()
+        driver = None
+        healthy = True
         
         try:
-            # Initialize browser first
-            if channel_frame.firefox_radio.isChecked():
-                profile_path = channel_frame.get_selected_profile()
-                if not profile_path:
-                    raise Exception("Chưa chọn profile Firefox")
-                    
-                # Setup Firefox driver
-                firefox_options = webdriver.FirefoxOptions()
-                firefox_options.binary_location = r"C:/Program Files/Mozilla Firefox/firefox.exe"
-                firefox_options.add_argument("-profile")
-                firefox_options.add_argument(os.fspath(profile_path))
-                
-                driver = webdriver.Firefox(options=firefox_options)
-                driver.set_window_size(1320, 960)
-                
-            else:
-                # Setup Chrome Portable
-                chrome_path = channel_frame.chrome_path_edit.text().strip()
-                chrome_version = self.get_chrome_version(chrome_path)
-                if not chrome_version:
-                    raise Exception("Unable to detect Chrome version")
-                    
-                options = webdriver.ChromeOptions()
-                options.binary_location = chrome_path
-                options.add_argument('--no-sandbox')
-                options.add_argument('--disable-dev-shm-usage')
-                options.add_argument('--disable-gpu')
-                options.add_argument('--remote-debugging-port=9222')
-                
-                data_dir = os.path.join(os.path.dirname(chrome_path), 'Data')
-                if os.path.exists(data_dir):
-                    options.add_argument(f'--user-data-dir={data_dir}')
-                
-                driver_path = ChromeDriverManager(driver_version=chrome_version).install()
-                service = Service(executable_path=driver_path)
-                service.creation_flags = CREATE_NO_WINDOW
-                
-                driver = webdriver.Chrome(service=service, options=options)
-                driver.set_window_size(1320, 960)
+            driver = session_pool.acquire(session_key, lambda: self.create_channel_driver(channel_frame))
                 
             # Create editor with initialized driver
             editor = EditVideoInfo(driver, self.progress_updated)  # Use self.progress_updated instead
                 
             # Start edit process
-            results = editor.start_edit_process()
+            if manifest:
+                results = editor.start_manifest_process(manifest, channel=channel_frame.get_upload_channel_key())
+            else:
+                results = editor.start_edit_process(plan)
             
             # Process results
-            for result in results:
-                if result["status"] == "success":
-                    video = result["video"]
-                    editor.update_video_info(
-                        video,
-                        channel_frame.title_edit.toPlainText(),
-                        channel_frame.desc_edit.toPlainText(),
-                        channel_frame.tags_edit.toPlainText(),
-                        channel_frame.thumb_path_edit.text()
-                    )
-                    
-            self.upload_queue.pop(0)
-            self.process_next_edit_info()
+            failed = [result for result in results if result["status"] != "success"]
+            self.status_label.setText(f"{channel_frame.channel_name}: đã sửa "
+                                      f"{len(results) - len(failed)}/{len(results)} video")
+            if failed:
+                details = "\n".join(f"{result['title']}: {result['error']}" for result in failed)
+                QMessageBox.warning(self, "Lỗi", f"Một số video chưa sửa được:\n{details}")
             
         except Exception as e:
+            healthy = False
             self.on_upload_error(str(e))
         finally:
-            if 'driver' in locals():
-                driver.quit()
+            if driver:
+                session_pool.release(session_key, driver, healthy)
+
+        self.process_next_edit_info()
+
+    def process_next_edit_status(self):
+        if not self.upload_queue:
+            self.on_all_uploads_complete()
+            return
+
+        channel_frame = self.upload_queue.pop(0)
+        session_key = channel_frame.get_upload_profile_key()
+        driver = None
+        healthy = True
+
+        try:
+            plan = channel_frame.get_publish_plan()
+        except Exception as e:
+            QMessageBox.warning(self, "Lỗi", f"{channel_frame.channel_name}: {str(e)}")
+            self.process_next_edit_status()
+            return
+
+        try:
+            driver = session_pool.acquire(session_key, lambda: self.create_channel_driver(channel_frame))
+            editor = EditVideoStatus(driver, self.progress_updated)
+            results = editor.start_edit_process(plan, channel_frame.video_count_spin.value(),
+                                                channel_frame.get_upload_channel_key())
+
+            done = [result for result in results if result["status"] == "success"]
+            moved = f", dời {len(editor.collisions)} lịch trùng" if editor.collisions else ""
+            self.status_label.setText(f"{channel_frame.channel_name}: đã đổi trạng thái "
+                                      f"{len(done)}/{len(results)} video{moved}")
+            problems = [result for result in results if result["status"] != "success"]
+            if problems:
+                details = "\n".join(f"{result['title']}: {result['error']}" for result in problems)
+                QMessageBox.warning(self, "Lỗi", f"Một số video chưa đổi được trạng thái:\n{details}")
+        except Exception as e:
+            healthy = False
+            QMessageBox.critical(self, "Lỗi", f"Lỗi khi sửa trạng thái: {str(e)}")
+        finally:
+            if driver:
+                session_pool.release(session_key, driver, healthy)
+
+        self.process_next_edit_status()
 
     def on_all_uploads_complete(self):
         QMessageBox.information(self, "Success", "Tất cả các kênh đã upload xong!")
@@ -1442,75 +1756,17 @@ class UploadYoutubeTab(QWidget):
 class EditVideoInfo:
     def __init__(self, driver, progress_callback=None):
         self.driver = driver
-        self.wait = WebDriverWait(self.driver, 20)
+        self.waiter = StudioWaiter(self.driver, 20)
         self.progress_updated = progress_callback
-        
-    def setup_firefox_driver(self, profile_path):
-        firefox_options = webdriver.FirefoxOptions()
-        firefox_options.binary_location = r"C:/Program Files/Mozilla Firefox/firefox.exe"
-        firefox_options.add_argument("-profile")
-        firefox_options.add_argument(os.fspath(profile_path))
-        
-        self.driver = webdriver.Firefox(options=firefox_options)
-        self.driver.set_window_size(1320, 960)
-        
-    def setup_chrome_driver(self):
-        try:
-            chrome_path = self.channel_frame.chrome_path_edit.text().strip()
-            
-            # Add initial delay for stability
-            time.sleep(2)
-            
-            chrome_version = self.get_chrome_version(chrome_path)
-            if not chrome_version:
-                raise Exception("Unable to detect Chrome version")
-                
-            options = webdriver.ChromeOptions()
-            options.binary_location = chrome_path
-            
-            # Add additional stability options
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--remote-debugging-port=9222')
-            options.add_argument('--start-maximized')
-            options.page_load_strategy = 'normal'
-            
-            data_dir = os.path.join(os.path.dirname(chrome_path), 'Data')
-            if os.path.exists(data_dir):
-                options.add_argument(f'--user-data-dir={data_dir}')
-            
-            driver_path = ChromeDriverManager(driver_version=chrome_version).install()
-            service = Service(executable_path=driver_path)
-            service.creation_flags = CREATE_NO_WINDOW
-            
-            # Add retry mechanism
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    self.driver = webdriver.Chrome(service=service, options=options)
-                    self.driver.set_window_size(1320, 960)
-                    # Test driver by executing simple command
-                    self.driver.execute_script('return document.readyState')
-                    break
-                except Exception as e:
-                    if attempt == max_retries - 1:
-                        raise e
-                    time.sleep(2)
-                    
-        except Exception as e:
-            raise Exception(f"Failed to setup Chrome: {str(e)}")
 
-    def start_edit_process(self):
+    def start_edit_process(self, plan):
         try:
-            self._navigate_to_content()
-            self._check_login()
-            self._access_content_tab()
-            self._access_uploads_tab()
-            video_list = self._get_video_list()
-            return self._process_videos(video_list)
+            rows = self._open_video_list()
+            return self._process_videos(rows, plan)
         except Exception as e:
             raise Exception(f"Lỗi trong quá trình sửa video: {str(e)}")
+        finally:
+            print(self.waiter.report())
 
     def _navigate_to_content(self):
         print("Đang truy cập YouTube Studio...")
@@ -1520,14 +1776,14 @@ class EditVideoInfo:
 
     def _check_login(self):
         print("Kiểm tra trạng thái đăng nhập...")
-        self.wait.until(EC.visibility_of_element_located((By.XPATH, YTS.AVATAR_BTN)))
+        self.waiter.element(By.XPATH, YTS.AVATAR_BTN, label='login avatar')
         if self.progress_updated:
             self.progress_updated.emit(20, "Đang kiểm tra login")
 
     def _access_content_tab(self):
         print("Truy cập tab Content...")
         try:
-            content_tab = self.wait.until(EC.visibility_of_element_located((By.XPATH, YTS.CONTENT_TAB)))
+            content_tab = self.waiter.element(By.XPATH, YTS.CONTENT_TAB, label='content tab')
             content_tab.click()
             if self.progress_updated:
                 self.progress_updated.emit(30, "Đang vào trang content")
@@ -1537,7 +1793,7 @@ class EditVideoInfo:
     def _access_uploads_tab(self):
         print("Truy cập tab Uploads...")
         try:
-            uploads_tab = self.wait.until(EC.visibility_of_element_located((By.XPATH, YTS.UPLOADS_TAB)))
+            uploads_tab = self.waiter.element(By.XPATH, YTS.UPLOADS_TAB, label='uploads tab')
             uploads_tab.click()
             if self.progress_updated:
                 self.progress_updated.emit(40, "Đang tải danh sách video")
@@ -1546,196 +1802,211 @@ class EditVideoInfo:
 
     def _get_video_list(self):
         print("Đang lấy danh sách video...")
-        video_container = self.wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "ytcp-video-section-content#video-list"))
-        )
+        video_container = self.waiter.element(
+            By.CSS_SELECTOR, "ytcp-video-section-content#video-list", 'present', label='video list')
         return video_container.find_elements(By.CSS_SELECTOR, "ytcp-video-row.style-scope.ytcp-video-section-content")
 
-    def _process_videos(self, video_list):
-        results = []
-        if not video_list:
+    def _open_video_list(self):
+        # Mở tab Uploads, hiện tối đa số hàng mỗi trang rồi đọc toàn bộ hàng một lần
+        self._navigate_to_content()
+        self._check_login()
+        self._access_content_tab()
+        self._access_uploads_tab()
+        self._get_video_list()
+        if self.driver.execute_async_script(SET_MAX_PAGE_SIZE_JS):
+            self.waiter.settled(selector=YTS.VIDEO_LIST, label='page size reload')
+        return [row for row in self._scan_video_rows() if row['id']]
+
+    def start_manifest_process(self, manifest, names=None, channel=None):
+        # Đọc manifest từng dòng; names giới hạn theo tên file (bỏ đuôi) khi gọi sau lượt upload
+        try:
+            ids_by_title = {row['title']: row['id'] for row in self._open_video_list()}
+            
+            results = []
+            schedules = []
+            # Lọc theo names trước khi đọc trước thumbnail, để chỉ chuẩn bị ảnh của các video sẽ sửa
+            rows = ((line_number, row) for line_number, row in manifest.rows()
+                    if row.get('key') and (names is None or manifest.match_name(row['key']) in names))
+            for line_number, row in self._prefetch_thumbnails(rows):
+                key = row['key']
+                video_id = key if manifest.is_video_id(key) else ids_by_title.get(manifest.match_name(key))
+                started = time.perf_counter()
+                if not video_id:
+                    results.append({"status": "error", "video_id": None, "title": key, "seconds": 0,
+                                    "error": f"dòng {line_number}: không tìm thấy video trên Studio"})
+                    continue
+                fields = {field: row[field] for field in ('title', 'description', 'tags', 'thumbnail', 'playlist')}
+                try:
+                    self._edit_video(video_id, fields)
+                    results.append({"status": "success", "video_id": video_id, "title": key,
+                                    "seconds": time.perf_counter() - started})
+                    if row['publish_at']:
+                        schedules.append((results[-1], parse_publish_time(row['publish_at'])))
+                except Exception as e:
+                    print(f"Lỗi xử lý dòng {line_number} ({key}): {str(e)}")
+                    results.append({"status": "error", "video_id": video_id, "title": key,
+                                    "seconds": time.perf_counter() - started, "error": str(e)})
+                if self.progress_updated:
+                    self.progress_updated.emit(90, f"Đã áp dụng manifest cho {len(results)} video")
+            
+            # Lịch đăng đặt qua hộp thoại chế độ hiển thị ở danh sách video, sau khi đã sửa xong thông tin
+            if schedules:
+                self._open_video_list()
+                for result, publish_at in schedules:
+                    try:
+                        self._set_visibility(result['video_id'], publish_at)
+                        if channel:
+                            publish_schedule.record(channel, result['video_id'], publish_at)
+                    except Exception as e:
+                        print(f"Lỗi đặt lịch {result['title']}: {str(e)}")
+                        result.update(status="error", error=f"không đặt được lịch {publish_at:%Y-%m-%d %H:%M}: {str(e)}")
+            
+            for result in results:
+                status = "OK" if result["status"] == "success" else f"ERROR {result['error']}"
+                print(f"{result['title']}: {result['seconds']:.1f}s {status}")
+            return results
+        except Exception as e:
+            raise Exception(f"Lỗi khi áp dụng manifest: {str(e)}")
+        finally:
+            print(self.waiter.report())
+
+    def _prefetch_thumbnails(self, rows, lookahead=8):
+        # Đọc trước vài dòng manifest để thumbnail được chuẩn bị trước khi tới lượt video đó
+        window = deque()
+        for item in rows:
+            if item[1].get('thumbnail'):
+                thumbnail_preparer.prepare(item[1]['thumbnail'])
+            window.append(item)
+            if len(window) > lookahead:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
+
+    def _scan_video_rows(self):
+        return self.driver.execute_script(
+            VIDEO_ROWS_SNAPSHOT_JS, YTS.VIDEO_LIST, YTS.VIDEO_ROW, YTS.RESTRICTIONS_TEXT) or []
+
+    def _process_videos(self, rows, plan):
+        if not rows:
             raise Exception("Không tìm thấy video nào trong danh sách")
             
-        print(f"Tìm thấy {len(video_list)} video")
+        count = plan.count(len(rows))
+        print(f"Tìm thấy {len(rows)} video, sẽ sửa {count} video")
+        
+        # Chuẩn bị toàn bộ thumbnail song song ngay từ đầu
+        edits = [plan.for_index(index, row['title']) for index, row in enumerate(rows[:count])]
+        thumbnail_preparer.prepare_many(fields['thumbnail'] for fields in edits if fields['thumbnail'])
         
-        for index, video in enumerate(video_list):
+        results = []
+        for index, row in enumerate(rows[:count]):
+            started = time.perf_counter()
             try:
-                # Wait for video row to be fully loaded
-                self.wait.until(EC.presence_of_element_located((
-                    By.CSS_SELECTOR, 
-                    "ytcp-video-row.style-scope.ytcp-video-section-content"
-                )))
-                
-                # Find and click the menu button first
-                menu_button = video.find_element(
-                    By.CSS_SELECTOR,
-                    "ytcp-button[aria-label='Tùy chọn']"
-                )
-                menu_button.click()
-                
-                # Wait for edit button in dropdown menu
-                edit_button = self.wait.until(
-                    EC.element_to_be_clickable((
-                        By.CSS_SELECTOR,
-                        "tp-yt-paper-item[test-id='EDIT']"
-                    ))
-                )
-                edit_button.click()
-                
-                # Handle the edit popup
-                popup_elements = self._handle_edit_popup()
-                
-                if self.progress_updated:
-                    progress = 40 + (50 * (index + 1) // len(video_list))
-                    self.progress_updated.emit(progress, f"Đang xử lý video {index + 1}/{len(video_list)}")
-                
-                results.append({"status": "success", "video": video})
-                
+                # Mỗi video chỉ mở trang chỉnh sửa một lần: điền đủ các trường, lưu, chờ lưu xong
+                self._edit_video(row['id'], edits[index])
+                results.append({"status": "success", "video_id": row['id'], "title": row['title'],
+                                "seconds": time.perf_counter() - started})
             except Exception as e:
                 print(f"Lỗi xử lý video {index + 1}: {str(e)}")
-                results.append({"status": "error", "video": video, "error": str(e)})
+                results.append({"status": "error", "video_id": row['id'], "title": row['title'],
+                                "seconds": time.perf_counter() - started, "error": str(e)})
+            
+            if self.progress_updated:
+                progress = 40 + (60 * (index + 1) // count)
+                self.progress_updated.emit(progress, f"Đã sửa video {index + 1}/{count}")
         
+        for result in results:
+            status = "OK" if result["status"] == "success" else f"ERROR {result['error']}"
+            print(f"{result['video_id']}: {result['seconds']:.1f}s {status}")
         return results
 
-
-    def _handle_edit_popup(self):
-        # Xử lý tiêu đề
-        title_input = self.wait.until(
-            EC.presence_of_element_located((
-                By.CSS_SELECTOR, 
-                "#container-content.style-scope.ytcp-social-suggestions-textbox"
-            ))
-        )
-
-        # Xử lý mô tả
-        desc_input = self.wait.until(
-            EC.presence_of_element_located((
-                By.CSS_SELECTOR,
-                "#container-content.style-scope.ytcp-social-suggestions-textbox:nth-child(2)"
-            ))
-        )
-
-        # Xử lý thumbnail
-        thumbnail_uploader = self.wait.until(
-            EC.presence_of_element_located((
-                By.CSS_SELECTOR,
-                "ytcp-thumbnail-uploader[image-size='IMAGE_2MB']"
-            ))
-        )
-
-        # Xử lý tags
-        toggle_button = self.wait.until(
-            EC.element_to_be_clickable((
-                By.CSS_SELECTOR,
-                "ytcp-button#toggle-button"
-            ))
-        )
-        toggle_button.click()
-
-        tags_container = self.wait.until(
-            EC.presence_of_element_located((
-                By.CSS_SELECTOR,
-                "ytcp-form-input-container#tags-container"
-            ))
-        )
-
-        return {
-            "title_input": title_input,
-            "desc_input": desc_input,
-            "thumbnail_uploader": thumbnail_uploader,
-            "tags_container": tags_container
-        }
-
-    def update_video_info(self, video_element, new_title, new_desc, new_tags, thumbnail_path=None):
+    def _edit_video(self, video_id, fields):
+        waiter = self.waiter
+        self.driver.get(STUDIO_EDIT_URL.format(video_id=video_id))
+        waiter.element(By.CSS_SELECTOR, "ytcp-video-title #textbox, #title-textarea #textbox",
+                       label='details title box')
+        
+        filled = self.driver.execute_script(
+            FILL_VIDEO_DETAILS_JS, fields['title'], fields['description'], fields['tags'] is not None)
+        if not filled['title'] or not filled['description']:
+            raise Exception("Không tìm thấy ô tiêu đề hoặc mô tả")
+        
+        if fields['tags'] is not None:
+            waiter.element(By.CSS_SELECTOR, "ytcp-form-input-container#tags-container", 'present',
+                           label='tags container')
+            tags_input = self.driver.execute_script(CLEAR_TAGS_JS)
+            if not tags_input:
+                raise Exception("Không tìm thấy ô nhập tag")
+            tags_input.send_keys(fields['tags'] + ',')
+        
+        if fields.get('playlist'):
+            if not self.driver.execute_async_script(SELECT_PLAYLIST_JS, fields['playlist']):
+                raise Exception(f"Không tìm thấy playlist: {fields['playlist']}")
+        
+        if fields['thumbnail']:
+            thumbnail = thumbnail_preparer.get(fields['thumbnail'])
+            thumbnail_input = self.driver.find_element(
+                By.CSS_SELECTOR, "ytcp-thumbnail-uploader input[type='file'], input#file-loader")
+            thumbnail_input.send_keys(os.path.abspath(thumbnail))
+        
+        # Nút lưu chỉ bật khi có trường thay đổi; không bật thì không có gì để lưu
         try:
-            # Get popup elements
-            popup_elements = self._handle_edit_popup()
-            
-            # Update title
-            title_input = popup_elements["title_input"]
-            title_input.clear()
-            title_input.send_keys(new_title)
-            
-            # Update description
-            desc_input = popup_elements["desc_input"]
-            desc_input.clear()
-            desc_input.send_keys(new_desc)
-            
-            # Update tags
-            tags_container = popup_elements["tags_container"]
-            tags_container.clear()
-            tags_container.send_keys(new_tags)
-            
-            # Update thumbnail if provided
-            if thumbnail_path:
-                thumbnail_uploader = popup_elements["thumbnail_uploader"]
-                thumbnail_input = thumbnail_uploader.find_element(By.CSS_SELECTOR, "input[type='file']")
-                thumbnail_input.send_keys(thumbnail_path)
-                
-            # Save changes
-            save_button = self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "ytcp-button#save-button"))
-            )
-            save_button.click()
+            waiter.until(lambda driver: not self._save_disabled(driver), timeout=3, label='save enabled')
+        except TimeoutException:
+            print(f"{video_id}: không có thay đổi cần lưu")
+            return
+        
+        # Save changes
+        waiter.click(By.CSS_SELECTOR, "ytcp-button#save", label='save button')
+        
+        # Nút lưu chuyển từ bật sang vô hiệu khi Studio đã lưu xong
+        try:
+            waiter.until(self._save_disabled, label='save confirmed')
+        except TimeoutException:
+            raise Exception("Studio chưa xác nhận lưu thay đổi")
+
+    def _save_disabled(self, driver):
+        button = driver.find_element(By.CSS_SELECTOR, "ytcp-button#save")
+        return button.get_attribute('disabled') is not None or button.get_attribute('aria-disabled') == 'true'
+
+    def _set_visibility(self, video_id, slot):
+        waiter = self.waiter
+        row = waiter.element(By.XPATH, f"//ytcp-video-row[.//a[contains(@href, '/video/{video_id}/')]]",
+                             'present', label='video row')
+        visibility_button = row.find_element(By.CSS_SELECTOR, "ytcp-video-visibility-select")
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", visibility_button)
+        visibility_button.click()
+        
+        popup = self._handle_visibility_popup()
+        if slot is None:
+            popup["public_radio"].click()
+        else:
+            if not popup["schedule_radio"].is_displayed():
+                # Mục đặt lịch đang thu gọn
+                waiter.click(By.CSS_SELECTOR, "ytcp-video-visibility-dialog #second-container-expand-button",
+                             label='schedule expand')
+            popup["schedule_radio"].click()
             
-            # Wait for save completion
-            self.wait.until(
-                EC.invisibility_of_element_located((By.CSS_SELECTOR, "ytcp-uploads-dialog"))
-            )
+            popup["date_picker"].click()
+            date_input = waiter.element(By.CSS_SELECTOR, "ytcp-date-picker tp-yt-paper-input input",
+                                        label='date input')
+            self._type_value(date_input, format_studio_date(slot, date_input.get_attribute('value') or ''))
             
-            if self.progress_updated:
-                self.progress_updated.emit(90, "Đã lưu thay đổi")
-                
-        except Exception as e:
-            raise Exception(f"Lỗi khi cập nhật thông tin video: {str(e)}")
-
-class EditVideoStatus:
-    def __init__(self, driver, progress_callback=None):
-        self.driver = driver
-        self.wait = WebDriverWait(self.driver, 20)
-        self.progress_updated = progress_callback
-
-    def start_edit_process(self):
-        try:
-            self._navigate_to_content()
-            self._check_login()
-            self._access_content_tab()
-            self._access_uploads_tab()
-            video_list = self._get_video_list()
-            return self._process_videos(video_list)
-        except Exception as e:
-            raise Exception(f"Lỗi trong quá trình sửa trạng thái: {str(e)}")
-
-    # Các phương thức navigation giống EditVideoInfo
-    
-    def _process_videos(self, video_list):
-        results = []
-        for video in video_list:
-            try:
-                # Tìm và click vào menu visibility
-                visibility_button = video.find_element(
-                    By.CSS_SELECTOR, 
-                    "ytcp-video-visibility-select"
-                )
-                visibility_button.click()
-                
-                # Xử lý popup visibility
-                self._handle_visibility_popup()
-                
-                results.append({"status": "success", "video": video})
-            except Exception as e:
-                results.append({"status": "error", "video": video, "error": str(e)})
+            time_inputs = popup["time_input"].find_elements(By.CSS_SELECTOR, "input")
+            time_input = time_inputs[0] if time_inputs else popup["time_input"]
+            self._type_value(time_input, format_studio_time(slot, time_input.get_attribute('value') or ''))
         
-        return results
+        waiter.click(By.CSS_SELECTOR, "ytcp-video-visibility-dialog #save-button", label='visibility save')
+        if not waiter.gone(By.CSS_SELECTOR, "ytcp-video-visibility-dialog", label='visibility dialog closed'):
+            raise Exception("Studio chưa xác nhận trạng thái mới")
+
+    def _type_value(self, element, value):
+        element.send_keys(Keys.CONTROL, 'a')
+        element.send_keys(value, Keys.ENTER)
 
     def _handle_visibility_popup(self):
         # Xử lý popup visibility
-        visibility_dialog = self.wait.until(
-            EC.presence_of_element_located((
-                By.CSS_SELECTOR, 
-                "ytcp-video-visibility-dialog"
-            ))
-        )
+        visibility_dialog = self.waiter.element(
+            By.CSS_SELECTOR, "ytcp-video-visibility-dialog", label='visibility dialog')
         
         # Các elements trong popup
         schedule_radio = visibility_dialog.find_element(By.CSS_SELECTOR, "#schedule-radio-button")
@@ -1751,6 +2022,68 @@ class EditVideoStatus:
             "time_input": time_input
         }
 
+class EditVideoStatus(EditVideoInfo):
+    collisions = ()
+
+    def start_edit_process(self, plan, count, channel):
+        # plan None: chuyển sang Public; ngược lại đặt lịch theo từng slot của plan
+        try:
+            rows = self._open_video_list()
+            return self._process_videos(rows, plan, count, channel)
+        except Exception as e:
+            raise Exception(f"Lỗi trong quá trình sửa trạng thái: {str(e)}")
+        finally:
+            print(self.waiter.report())
+
+    # Các phương thức navigation kế thừa từ EditVideoInfo
+    
+    def _process_videos(self, rows, plan, count, channel):
+        scheduled = publish_schedule.upcoming(channel)
+        targets = [row for row in rows
+                   if row['id'] not in scheduled and not self._is_published(row['visibility'])][:count]
+        if not targets:
+            raise Exception("Không có video nào cần đổi trạng thái")
+        
+        # Tính toàn bộ lịch một lần, slot trùng với video đã có lịch được dời sang slot trống kế tiếp
+        collisions = []
+        if plan:
+            slots, collisions = plan.free_slots(len(targets), scheduled.values())
+        else:
+            slots = [None] * len(targets)
+        self.collisions = collisions
+        print(f"Tìm thấy {len(rows)} video, sẽ đổi trạng thái {len(targets)} video")
+        for slot in collisions:
+            print(f"Slot {slot:%Y-%m-%d %H:%M} đã có video khác, dời sang slot kế tiếp")
+        
+        results = []
+        for index, (row, slot) in enumerate(zip(targets, slots)):
+            started = time.perf_counter()
+            result = {"video_id": row['id'], "title": row['title'], "publish_at": slot}
+            try:
+                self._set_visibility(row['id'], slot)
+                if slot:
+                    publish_schedule.record(channel, row['id'], slot)
+                result.update(status="success", seconds=time.perf_counter() - started)
+            except Exception as e:
+                print(f"Lỗi xử lý video {index + 1}: {str(e)}")
+                result.update(status="error", seconds=time.perf_counter() - started, error=str(e))
+            results.append(result)
+            
+            if self.progress_updated:
+                progress = 40 + (60 * (index + 1) // len(targets))
+                self.progress_updated.emit(progress, f"Đã đổi trạng thái video {index + 1}/{len(targets)}")
+        
+        for result in results:
+            when = f"{result['publish_at']:%Y-%m-%d %H:%M}" if result['publish_at'] else "public"
+            status = "OK" if result["status"] == "success" else f"ERROR {result['error']}"
+            print(f"{result['video_id']} -> {when}: {result['seconds']:.1f}s {status}")
+        return results
+
+    def _is_published(self, visibility):
+        visibility = ' '.join((visibility or '').lower().split())
+        # Ô có thể kèm ngày phía sau nhãn ("Scheduled Jan 5, 2026")
+        return any(visibility == label or visibility.startswith(label + ' ') for label in PUBLISHED_VISIBILITY)
+
 class DragDropListWidget(QListWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -1850,9 +2183,7 @@ class AntiBQManagerDialog(QDialog):
             QMessageBox.warning(self, "Lỗi", "Vui lòng nhập đầy đủ tiêu đề và nội dung!")
             return
 
-        data = self.load_data()
-        data[title] = content
-        self.save_data(data)
+        anti_bq_store.set(title, content)
         self.update_content_list()
         self.clear_fields()
         QMessageBox.information(self, "Thành công", "Đã lưu nội dung!")
@@ -1861,10 +2192,10 @@ class AntiBQManagerDialog(QDialog):
         current_item = self.content_list.currentItem()
         if current_item:
             title = current_item.text()
-            data = self.load_data()
-            if title in data:
+            content = anti_bq_store.get(title)
+            if content is not None:
                 self.title_edit.setText(title)
-                self.content_edit.setText(data[title])
+                self.content_edit.setText(content)
 
     def delete_selected(self):
         current_item = self.content_list.currentItem()
@@ -1874,35 +2205,23 @@ class AntiBQManagerDialog(QDialog):
                                        QMessageBox.Yes | QMessageBox.No)
             if reply == QMessageBox.Yes:
                 title = current_item.text()
-                data = self.load_data()
-                if title in data:
-                    del data[title]
-                    self.save_data(data)
-                    self.update_content_list()
-                    self.clear_fields()
+                anti_bq_store.delete(title)
+                self.update_content_list()
+                self.clear_fields()
 
     def load_data(self):
-        try:
-            with open('anti_bq_content.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
+        return anti_bq_store.load()
 
     def get_content_for_title(self, video_title):
-        data = self.load_data()
-        # Tìm nội dung phù hợp nhất dựa trên tiêu đề video
-        for saved_title, content in data.items():
-            if video_title.lower().find(saved_title.lower()) != -1:
-                return content
-        return None
+        # Tìm nội dung phù hợp nhất (tiêu đề mẫu dài nhất) nằm trong tiêu đề video
+        return title_matcher.get_content(video_title)
 
     def save_data(self, data):
-        with open('anti_bq_content.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        anti_bq_store.save(data)
 
     def update_content_list(self):
         self.content_list.clear()
-        data = self.load_data()
+        _, data = anti_bq_store.snapshot()
         self.content_list.addItems(sorted(data.keys()))
 
     def clear_fields(self):
@@ -1911,20 +2230,86 @@ class AntiBQManagerDialog(QDialog):
 
     def load_content(self, item):
         title = item.text()
-        data = self.load_data()
-        if title in data:
+        content = anti_bq_store.get(title)
+        if content is not None:
             self.title_edit.setText(title)
-            self.content_edit.setText(data[title])
+            self.content_edit.setText(content)
 
     def load_saved_content(self):
         """Load and display previously saved content in the list"""
         try:
-            data = self.load_data()
+            _, data = anti_bq_store.snapshot()
             self.content_list.clear()
             self.content_list.addItems(sorted(data.keys()))
         except Exception as e:
             QMessageBox.warning(self, "Lỗi", f"Không thể tải nội dung đã lưu: {str(e)}")
 
+class MissingTemplatesDialog(QDialog):
+    """Collect dispute content for every asset title found without a template."""
+
+    def __init__(self, titles, parent=None):
+        super().__init__(parent)
+        self.titles = titles
+        self.setWindowTitle("Nhập nội dung kháng còn thiếu")
+        self.setMinimumWidth(900)
+        self.setMinimumHeight(500)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(f"Có {len(self.titles)} nội dung bản quyền chưa có nội dung kháng. "
+                                "Để trống những dòng muốn bỏ qua."))
+
+        self.table = QTableWidget(len(self.titles), 2)
+        self.table.setHorizontalHeaderLabels(["Tiêu đề nội dung", "Nội dung kháng"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        for row, title in enumerate(self.titles):
+            title_item = QTableWidgetItem(title)
+            title_item.setFlags(title_item.flags() & ~Qt.ItemIsEditable)
+            self.table.setItem(row, 0, title_item)
+            self.table.setItem(row, 1, QTableWidgetItem(""))
+
+        # Điền nhanh cùng một nội dung cho các dòng còn trống
+        fill_layout = QHBoxLayout()
+        self.fill_edit = QLineEdit()
+        fill_btn = QPushButton("Điền vào dòng trống")
+        fill_btn.clicked.connect(self.fill_empty_rows)
+        fill_layout.addWidget(self.fill_edit)
+        fill_layout.addWidget(fill_btn)
+
+        btn_layout = QHBoxLayout()
+        save_btn = QPushButton("Lưu và tiếp tục")
+        skip_btn = QPushButton("Bỏ qua tất cả")
+        save_btn.clicked.connect(self.save_and_close)
+        skip_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(save_btn)
+        btn_layout.addWidget(skip_btn)
+
+        layout.addWidget(self.table)
+        layout.addLayout(fill_layout)
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+
+    def fill_empty_rows(self):
+        text = self.fill_edit.text().strip()
+        if not text:
+            return
+        for row in range(self.table.rowCount()):
+            if not self.table.item(row, 1).text().strip():
+                self.table.item(row, 1).setText(text)
+
+    def save_and_close(self):
+        entries = {}
+        for row in range(self.table.rowCount()):
+            content = self.table.item(row, 1).text().strip()
+            if content:
+                entries[self.table.item(row, 0).text()] = content
+        if entries:
+            # Ghi một lần cho cả lô
+            anti_bq_store.update(entries)
+        self.accept()
+
 class AntiBQWorker(QThread):
     progress_updated = pyqtSignal(int, str)
     process_complete = pyqtSignal()
@@ -1933,221 +2318,81 @@ class AntiBQWorker(QThread):
     request_confirmation = pyqtSignal(str, str)
     input_received = pyqtSignal(str)
     confirmation_received = pyqtSignal(bool)
-    show_continue_dialog = pyqtSignal(str)
+    missing_templates = pyqtSignal(list)
+    templates_ready = pyqtSignal()
 
-    def __init__(self, channel_frame, manager):
+    def __init__(self, channel_frame, manager, debug_port=None):
         super().__init__()
         self.channel_frame = channel_frame
         self.manager = manager
+        self.debug_port = debug_port
+        self.dispute_bucket = dispute_limits.get(channel_frame.get_anti_bq_profile_key())
         self.driver = None
         self.is_browser_hidden = False
         self.input_text = None
         self.confirmation_result = None
-        show_continue_dialog = pyqtSignal(str, name='showContinueDialog')
-
-    def close_webdriver_processes(self):
-        try:
-                for process in psutil.process_iter(['pid', 'name']):
-                    # Only target chromedriver.exe and geckodriver.exe
-                    if process.info['name'] in ['chromedriver.exe', 'geckodriver.exe']:
-                        psutil.Process(process.info['pid']).terminate()
-                time.sleep(2)
-        except Exception as e:
-            print(f"Error closing WebDriver processes: {e}")
 
     def setup_firefox_driver(self):
         selected_profile = self.channel_frame.anti_bq_profile_combo.currentText()
         profile_id = self.channel_frame.profiles_dict[selected_profile]
         profile_path = os.path.expanduser(f'~\\AppData\\Roaming\\Mozilla\\Firefox\\Profiles\\{profile_id}')
         
-        firefox_options = webdriver.FirefoxOptions()
-        firefox_options.binary_location = r"C:/Program Files/Mozilla Firefox/firefox.exe"
-        firefox_options.add_argument("-profile")
-        firefox_options.add_argument(os.fspath(profile_path))
-        
-        self.driver = webdriver.Firefox(options=firefox_options)
-        self.driver.set_window_size(1320, 960)
-
-    def get_chrome_version(self, chrome_path):
-        try:
-            chrome_dir = os.path.dirname(chrome_path)
-            chrome_exe = os.path.join(chrome_dir, 'App', 'Chrome-bin', 'chrome.exe')
-            version_info = win32api.GetFileVersionInfo(chrome_exe, '\\')
-            ms = version_info['FileVersionMS']
-            ls = version_info['FileVersionLS']
-            version = f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
-            return version
-        except Exception as e:
-            print(f"Version detection error: {str(e)}")
-            return None
+        self.driver = launch_firefox_driver(profile_path, self.channel_frame.lean_mode_cb.isChecked())
 
     def setup_chrome_driver(self):
-        try:
-            chrome_path = self.channel_frame.anti_bq_chrome_path_edit.text().strip()
-            
-            # Get Chrome version automatically
-            chrome_version = self.get_chrome_version(chrome_path)
-            if not chrome_version:
-                raise Exception("Unable to detect Chrome version")
-                
-            print(f"Detected Chrome version: {chrome_version}")
-            
-            options = webdriver.ChromeOptions()
-            options.binary_location = chrome_path
-            
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--remote-debugging-port=9222')
-            
-            data_dir = os.path.join(os.path.dirname(chrome_path), 'Data')
-            if os.path.exists(data_dir):
-                options.add_argument(f'--user-data-dir={data_dir}')
-            
-            # Use detected version for ChromeDriver
-            driver_path = ChromeDriverManager(driver_version=chrome_version).install()
-            service = Service(executable_path=driver_path)
-            service.creation_flags = CREATE_NO_WINDOW
-            
-            self.driver = webdriver.Chrome(service=service, options=options)
-            self.driver.set_window_size(1320, 960)
-            
-            print("Chrome driver setup successful")
-            
-        except Exception as e:
-            print(f"Chrome setup error: {str(e)}")
-            raise Exception(f"Failed to setup Chrome: {str(e)}")
+        chrome_path = self.channel_frame.anti_bq_chrome_path_edit.text().strip()
+        self.driver = launch_chrome_driver(chrome_path, self.debug_port,
+                                           lean=self.channel_frame.lean_mode_cb.isChecked())
+        print("Chrome driver setup successful")
 
-    def download_chromedriver(self, chrome_version):
-        try:
-            # Create storage directory
-            user_home = os.path.expanduser('~')
-            chromedriver_dir = os.path.join(user_home, 'AppData', 'Local', 'ChromeDriver')
-            os.makedirs(chromedriver_dir, exist_ok=True)
-            
-            # Extract major version from Chrome Portable
-            major_version = chrome_version.split('.')[0]
-            
-            # Set driver version based on Chrome version
-            driver_version_map = {
-                "129": "129.0.6668.59",
-                "128": "128.0.6462.59",
-                # Add more versions as needed
-            }
-            
-            driver_version = driver_version_map.get(major_version)
-            if not driver_version:
-                raise Exception(f"Unsupported Chrome version: {major_version}")
-                
-            # Download matching ChromeDriver
-            from webdriver_manager.chrome import ChromeDriverManager
-            driver_path = ChromeDriverManager(driver_version=driver_version).install()
-            
-            # Move to our managed location
-            final_path = os.path.join(chromedriver_dir, f"chromedriver_{major_version}.exe")
-            import shutil
-            shutil.copy2(driver_path, final_path)
-            
-            return final_path
-            
-        except Exception as e:
-            raise Exception(f"ChromeDriver download failed: {str(e)}")
-
-    def find_existing_chromedriver(self, driver_dir, chrome_version):
-        try:
-            for root, dirs, files in os.walk(driver_dir):
-                if 'chromedriver.exe' in files:
-                    driver_path = os.path.join(root, 'chromedriver.exe')
-                    # Verify driver version matches Chrome version
-                    import subprocess
-                    output = subprocess.check_output([driver_path, '--version']).decode()
-                    if f"ChromeDriver {chrome_version}." in output:
-                        return driver_path
-            return None
-        except:
-            return None
-   
-    # Modify get_dispute_text method
     def get_dispute_text(self, claim_title):
-        data = self.manager.load_data()
-        
-        for saved_title, content in data.items():
-            if saved_title.lower() in claim_title.lower():
-                return content
-                
-        # Emit signals and wait for response
-        self.request_confirmation.emit(
-            "Nội dung kháng cáo không tìm thấy",
-            f"Không tìm thấy nội dung kháng cáo cho video '{claim_title}'.\nBạn có muốn thêm nội dung mới không?"
-        )
-        
-        # Use event loop to wait for response
-        loop = QEventLoop()
-        self.confirmation_received.connect(loop.quit)
-        loop.exec_()
-        
-        if self.confirmation_result:
-            self.request_input.emit(
-                "Nhập nội dung kháng cáo",
-                f"Nhập nội dung kháng cáo cho video '{claim_title}':"
-            )
-            
-            # Wait for input
-            loop = QEventLoop()
-            self.input_received.connect(loop.quit)
-            loop.exec_()
-            
-            if self.input_text:
-                data[claim_title] = self.input_text
-                self.manager.save_data(data)
-                return self.input_text
-                
-        return None
+        # Không hỏi người dùng giữa chừng: nội dung còn thiếu đã được nhập ở bước quét trước
+        return title_matcher.get_content(claim_title)
 
     def match_claim_title(self, claim_title):
-        # Load saved content data
-        data = self.manager.load_data()
-        
-        # Try to find matching title
-        for saved_title in data.keys():
-            if saved_title.lower() in claim_title.lower():
-                return True
-        return False
+        return title_matcher.match(claim_title) is not None
+
+    def create_driver(self):
+        if self.channel_frame.anti_bq_firefox_radio.isChecked():
+            print("Using Firefox for Anti-BQ")
+            self.setup_firefox_driver()
+        else:
+            # Validate Chrome path before setup
+            chrome_path = self.channel_frame.anti_bq_chrome_path_edit.text().strip()
+            print(f"Chrome path for validation: {chrome_path}")
+            
+            if not chrome_path:
+                raise Exception("Chrome path is empty. Please select Chrome executable file")
+            if not os.path.exists(chrome_path):
+                raise Exception(f"Chrome file not found at: {chrome_path}")
+            if not chrome_path.lower().endswith('.exe'):
+                raise Exception("Selected file must be an executable (.exe) file")
+                
+            print("Chrome path validated successfully")
+            self.setup_chrome_driver()
+        return self.driver
 
     def run(self):
-        process_complete = pyqtSignal()  # Thêm signal này
+        session_key = self.channel_frame.get_anti_bq_profile_key()
+        healthy = True
         try:
-            self.close_webdriver_processes()
-            
-            if self.channel_frame.anti_bq_firefox_radio.isChecked():
-                print("Using Firefox for Anti-BQ")
-                self.setup_firefox_driver()
-            else:
-                # Validate Chrome path before setup
-                chrome_path = self.channel_frame.anti_bq_chrome_path_edit.text().strip()
-                print(f"Chrome path for validation: {chrome_path}")
-                
-                if not chrome_path:
-                    raise Exception("Chrome path is empty. Please select Chrome executable file")
-                if not os.path.exists(chrome_path):
-                    raise Exception(f"Chrome file not found at: {chrome_path}")
-                if not chrome_path.lower().endswith('.exe'):
-                    raise Exception("Selected file must be an executable (.exe) file")
-                    
-                print("Chrome path validated successfully")
-                self.setup_chrome_driver()
+            self.driver = session_pool.acquire(session_key, self.create_driver)
+            if not self.channel_frame.anti_bq_firefox_radio.isChecked():
                 self.channel_frame.toggle_browser_btn.setEnabled(True)
             self.process_anti_bq()
             self.process_complete.emit()  # Emit signal khi hoàn thành
         except Exception as e:
+            healthy = False
             self.error_occurred.emit(str(e))
         finally:
             if self.driver:
-                self.driver.quit()
+                session_pool.release(session_key, self.driver, healthy)
+                self.driver = None
             self.channel_frame.toggle_browser_btn.setEnabled(False)
 
     def process_anti_bq(self):
-        wait = WebDriverWait(self.driver, 10)
+        self.waiter = StudioWaiter(self.driver, 10)
+        waiter = self.waiter
         
         try:
             # 1. Navigate to content page
@@ -2159,7 +2404,7 @@ class AntiBQWorker(QThread):
             # 2. Wait for page load
             # Check login status by avatar button
             print("Checking login status...")
-            avatar = wait.until(EC.visibility_of_element_located((By.XPATH, YTS.AVATAR_BTN)))
+            waiter.element(By.XPATH, YTS.AVATAR_BTN, label='login avatar')
             print("Đang tìm thông tin đăng nhập")
             self.progress_updated.emit(20, "Đang kiểm tra login")
 
@@ -2167,7 +2412,7 @@ class AntiBQWorker(QThread):
             print("\nStep 3: Looking for Videos tab...")
             try:
                 print("Looking for content tab...")
-                content_tab = wait.until(EC.visibility_of_element_located((By.XPATH, YTS.CONTENT_TAB)))
+                content_tab = waiter.element(By.XPATH, YTS.CONTENT_TAB, label='content tab')
                 print("đã tìm thấy tabs content")
                 content_tab.click()
                 self.progress_updated.emit(30, "Đang vào trang content")
@@ -2179,7 +2424,7 @@ class AntiBQWorker(QThread):
             print("\nStep 4: Video tabs...")
             try:
                 print("Looking for videos container...")
-                videos_container = wait.until(EC.visibility_of_element_located((By.XPATH, YTS.UPLOADS_TAB)))
+                videos_container = waiter.element(By.XPATH, YTS.UPLOADS_TAB, label='uploads tab')
                 print("đã tìm thấy tab video")
                 videos_container.click()
                 self.progress_updated.emit(40, "Đang tiến hành kháng BQ")
@@ -2187,71 +2432,27 @@ class AntiBQWorker(QThread):
                 print(f"Error accessing Uploads tab: {str(e)}")
                 raise Exception(f"Không thể truy cập tab Uploads: {str(e)}")
 
+            unattended = self.channel_frame.anti_bq_unattended_cb.isChecked()
+            if unattended:
+                self.apply_copyright_filter()
+
             # 5. Process copyright claims
             print("\nStep 5: Processing copyright claims...")
             try:
-                current_page = 1
-                while True:
-                    print(f"\nProcessing Page {current_page}")
-                    # Find and process videos on current page
-                    video_list = wait.until(EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, YTS.VIDEO_LIST)))
-                    
-                    video_rows = video_list.find_elements(
-                        By.CSS_SELECTOR, YTS.VIDEO_ROW)
-                    print(f"Found {len(video_rows)} videos to process")
-                    
-                    # Process each video row sequentially
-                    for index, row in enumerate(video_rows):
-                        print(f"Processing video {index + 1}/{len(video_rows)}")
-                        
-                        # Tìm restriction_elem trong phạm vi của row hiện tại
-                        restriction_elem = row.find_element(By.ID, YTS.RESTRICTIONS_TEXT)
-                        restriction_text = restriction_elem.text.strip()
-                        print(f"Restriction text: {restriction_text}")
-                        
-                        if restriction_text in YTS.COPYRIGHT_TEXTS:
-                            print("Copyright restriction found, processing...")
-                            
-                            self.driver.execute_script(
-                                "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
-                                restriction_elem)
-                            time.sleep(2)
-                            
-                            restriction_elem.click()
-                            time.sleep(1)
-                            
-                            see_details = wait.until(EC.visibility_of_element_located(
-                                (By.XPATH, YTS.SEE_DETAIL_BUTTON)))
-                            see_details.click()
-                            print("Clicked See details button")
-                        
-                            self.process_copyright_claims()
-                        
-                        time.sleep(1)
-                    
-                    print(f"\nCompleted processing page {current_page}")
-                    
-                    # Check for next page and ask user
-                    if self.has_next_page():
-                        # Emit signal to show dialog in main thread
-                        process_next = self.show_continue_dialog.emit(
-                            f"Đã hoàn thành xử lý trang {current_page}. Bạn có muốn tiếp tục xử lý trang tiếp theo không?")
-                        
-                        if process_next:
-                            current_page += 1
-                            self.go_to_next_page()
-                            time.sleep(2)
-                            self.progress_updated.emit(70, f"Đang xử lý trang {current_page}")
-                        else:
-                            print("User chose to stop processing")
-                            break
-                    else:
-                        print("No more pages available")
-                        break
+                # Thu thập id video bị hạn chế trước, sau đó mở thẳng trang bản quyền của từng video
+                claim_queue = self.collect_claimed_videos(unattended)
+                print(f"\nCollected {len(claim_queue)} videos with copyright claims")
+                claim_queue = self.skip_handled_videos(claim_queue)
+                
+                # Bước 1: chỉ đọc, gom toàn bộ tiêu đề chưa có nội dung kháng để nhập một lần
+                missing = self.prescan_claims(claim_queue)
+                if missing:
+                    self.request_missing_templates(missing)
+                
+                # Bước 2: gửi kháng cáo, không còn hộp thoại chặn giữa chừng
+                self.process_claim_queue(claim_queue)
                 
                 self.progress_updated.emit(100, "Hoàn thành xử lý kháng BQ")
-                self.process_complete.emit()
                 
             except Exception as e:
                 print(f"\nError during copyright claim processing: {str(e)}")
@@ -2260,233 +2461,358 @@ class AntiBQWorker(QThread):
         except Exception as e:
             print(f"\nFatal error in process_anti_bq: {str(e)}")
             raise
+        finally:
+            print(waiter.report())
+
+    def apply_copyright_filter(self):
+        # Chỉ tải các video có claim bản quyền thay vì duyệt toàn bộ kênh
+        waiter = self.waiter
+        waiter.element(By.CSS_SELECTOR, YTS.VIDEO_LIST, 'present', label='video list')
+        base_url = self.driver.current_url.split('?')[0]
+        self.driver.get(f"{base_url}?filter={quote(json.dumps(STUDIO_COPYRIGHT_FILTER))}")
+        waiter.element(By.CSS_SELECTOR, YTS.VIDEO_LIST, 'present', label='filtered video list')
+        
+        page_size = self.driver.execute_async_script(SET_MAX_PAGE_SIZE_JS)
+        if page_size:
+            print(f"Rows per page set to {page_size}")
+            waiter.settled(selector=YTS.VIDEO_LIST, label='page size reload')
+        else:
+            print("Could not change rows per page, keeping default")
 
-    def process_copyright_claims(self):
-        wait = WebDriverWait(self.driver, 10)
+    def ask_confirmation(self, title, message):
+        # Hỏi ở luồng giao diện và chờ câu trả lời
+        self.confirmation_result = None
+        # Kết nối trước khi phát tín hiệu để không lỡ câu trả lời đến sớm
+        loop = QEventLoop()
+        self.confirmation_received.connect(loop.quit)
+        self.request_confirmation.emit(title, message)
+        loop.exec_()
+        self.confirmation_received.disconnect(loop.quit)
+        return bool(self.confirmation_result)
+
+    def collect_claimed_videos(self, unattended=False):
+        waiter = self.waiter
+        queue = []
+        seen = set()
+        current_page = 1
+        while True:
+            print(f"\nScanning Page {current_page}")
+            waiter.element(By.CSS_SELECTOR, YTS.VIDEO_LIST, 'present', label='video list')
+            
+            rows = self.scan_video_rows()
+            claimed_rows = [row for row in rows if row['restriction'] in YTS.COPYRIGHT_TEXTS]
+            print(f"Found {len(rows)} videos, {len(claimed_rows)} with copyright restriction")
+            
+            for row in claimed_rows:
+                if not row['id']:
+                    print(f"Không đọc được id của video: {row['title']}")
+                    continue
+                if row['id'] not in seen:
+                    seen.add(row['id'])
+                    queue.append(row)
+            
+            # Check for next page and ask user
+            if self.has_next_page():
+                process_next = unattended or self.ask_confirmation(
+                    "Tiếp tục?",
+                    f"Đã quét xong trang {current_page}. Bạn có muốn tiếp tục quét trang tiếp theo không?")
+                
+                if process_next:
+                    current_page += 1
+                    self.go_to_next_page()
+                    self.progress_updated.emit(45, f"Đang quét trang {current_page}")
+                else:
+                    print("User chose to stop scanning")
+                    break
+            else:
+                print("No more pages available")
+                break
+        return queue
+
+    def skip_handled_videos(self, queue):
+        # Chỉ bỏ video mà mọi claim từng thấy trên trang bản quyền đều đã kháng xong;
+        # số claim ở danh sách video chỉ là cận dưới (đọc từ tooltip) nên không dùng làm căn cứ duy nhất,
+        # không đọc được (None) thì luôn mở lại trang bản quyền
+        covered = dispute_ledger.covered_videos(video['id'] for video in queue)
+        remaining = [video for video in queue
+                     if video['id'] not in covered or video['claims'] is None
+                     or covered[video['id']] < video['claims']]
+        skipped = len(queue) - len(remaining)
+        if skipped:
+            print(f"Ledger: skipping {skipped} videos whose claims are all disputed")
+        return remaining
+
+    def prescan_claims(self, queue):
+        missing = []
+        for position, video in enumerate(queue):
+            try:
+                self.open_copyright_page(video['id'])
+                video['scanned_claims'] = self.read_claims()
+                dispute_ledger.record_seen(video['id'], [claim['id'] for claim in video['scanned_claims']])
+            except Exception as e:
+                print(f"Pre-scan failed for video {video['id']}: {str(e)}")
+                video['scanned_claims'] = None
+                continue
+            done_claims = dispute_ledger.done_claims(video['id'])
+            for claim in video['scanned_claims']:
+                if claim['disputed'] and claim['id'] not in done_claims:
+                    dispute_ledger.record(video['id'], claim['id'], claim['asset_title'], ALREADY_DISPUTED)
+                elif claim['id'] in done_claims:
+                    claim['disputed'] = True
+            for claim in video['scanned_claims']:
+                title = claim['asset_title']
+                if not claim['disputed'] and title not in missing and title_matcher.match(title) is None:
+                    missing.append(title)
+            self.progress_updated.emit(45 + int((position + 1) * 5 / len(queue)),
+                                       f"Đã quét {position + 1}/{len(queue)} video")
+        print(f"Pre-scan: {len(missing)} asset titles without dispute content")
+        return missing
+
+    def request_missing_templates(self, titles):
+        # Chờ giao diện nhập xong nội dung cho các tiêu đề còn thiếu (một hộp thoại cho cả lô)
+        loop = QEventLoop()
+        self.templates_ready.connect(loop.quit)
+        self.missing_templates.emit(titles)
+        loop.exec_()
+        self.templates_ready.disconnect(loop.quit)
+
+    def process_claim_queue(self, queue, max_attempts=3):
+        # Hàng đợi phẳng theo id video: lỗi thì đưa lại cuối hàng đợi, không cần dựng lại trang danh sách
+        pending = deque((video, 1) for video in queue)
+        total = len(queue)
+        done = 0
+        self.failed_videos = []
+        while pending:
+            video, attempt = pending.popleft()
+            scanned = video.get('scanned_claims')
+            if scanned is not None and all(claim['disputed'] for claim in scanned):
+                print(f"Skipping video {video['id']}: all claims already disputed")
+                done += 1
+                continue
+            print(f"Processing video {done + 1}/{total}: {video['title']} ({video['id']}), attempt {attempt}")
+            try:
+                self.open_copyright_page(video['id'])
+                self.process_copyright_claims(video['id'])
+            except Exception as e:
+                print(f"Error processing video {video['id']}: {str(e)}")
+                if attempt < max_attempts:
+                    pending.append((video, attempt + 1))
+                    continue
+                self.failed_videos.append(video)
+            done += 1
+            self.progress_updated.emit(50 + int(done * 50 / total),
+                                       f"Đã xử lý {done}/{total} video có bản quyền")
+        if self.failed_videos:
+            print(f"Failed videos: {', '.join(video['id'] for video in self.failed_videos)}")
+
+    def open_copyright_page(self, video_id):
+        self.driver.get(STUDIO_COPYRIGHT_URL.format(video_id=video_id))
+        self.waiter.element(By.CSS_SELECTOR, YTS.CLAIMS_CONTAINER, 'present', label='copyright page')
+
+    def scan_video_rows(self):
+        # Một round trip trả về id, tiêu đề, hạn chế, chế độ hiển thị và số claim của mọi hàng
+        started = time.perf_counter()
+        rows = self.driver.execute_script(
+            VIDEO_ROWS_SNAPSHOT_JS, YTS.VIDEO_LIST, YTS.VIDEO_ROW, YTS.RESTRICTIONS_TEXT) or []
+        for row in rows:
+            row['restriction'] = row['restriction'].strip()
+        print(f"Scanned {len(rows)} rows in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return rows
+
+    def process_copyright_claims(self, video_id):
+        waiter = self.waiter
         
         try:
-            while True:
-                # Add explicit wait for claims container
-                time.sleep(1)
-                claims_container = wait.until(EC.presence_of_element_located((
-                    By.CSS_SELECTOR, YTS.CLAIMS_CONTAINER)))
-                
-                claim_rows = wait.until(EC.presence_of_all_elements_located((
-                    By.XPATH, YTS.CLAIM_ROW
-                )))
-                
-                print(f"Found {len(claim_rows)} claim rows")
+            # Add explicit wait for claims container
+            waiter.element(By.CSS_SELECTOR, YTS.CLAIMS_CONTAINER, 'present', label='claims container')
+            waiter.element(By.XPATH, YTS.CLAIM_ROW, 'present', label='claim rows')
+            
+            # Đọc danh sách claim một lần, sau đó chỉ đồng bộ lại trạng thái sau mỗi lần kháng
+            claims = {claim['id']: claim for claim in self.read_claims()}
+            dispute_ledger.record_seen(video_id, list(claims))
+            completed = {claim_id for claim_id, claim in claims.items() if claim['disputed']}
+            # Claim đã gửi kháng ở lượt trước nhưng Studio chưa hiện trạng thái
+            completed |= dispute_ledger.done_claims(video_id) & set(claims)
+            pending = [claim_id for claim_id in claims if claim_id not in completed]
+            total_claims = len(claims)
+            print(f"Found {total_claims} claims, {len(pending)} not disputed")
+            
+            for claim_id in pending:
+                if claim_id in completed:
+                    continue
+                claim = claims[claim_id]
+                asset_title = claim['asset_title']
+                print(f"Processing claim {len(completed) + 1}/{total_claims}: {asset_title}")
                 
-                unprocessed_found = False
-                processed_count = 0
-                total_claims = len(claim_rows)
+                dispute_text = self.get_dispute_text(asset_title)
+                if not dispute_text:
+                    print(f"Skipping dispute - no content provided for: {asset_title}")
+                    dispute_ledger.record(video_id, claim_id, asset_title, SKIPPED)
+                    completed.add(claim_id)
+                    continue
                 
-                for row in claim_rows:
-                    try:
-                        dispute_status = row.find_elements(By.CSS_SELECTOR, YTS.DISPUTE_STATUS)
-                        if dispute_status:
-                            processed_count += 1
-                            continue
-                            
-                        unprocessed_found = True
-                        print(f"Processing claim {processed_count + 1}/{total_claims}")
-                        
-                        # Scroll row into view
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", row)
-                        time.sleep(1)
-                        
-                        # Get asset title
-                        asset_title = row.find_element(
-                            By.CSS_SELECTOR, 
-                            YTS.ASSET_TITLE
-                        ).text
-                        print(f"Processing claim: {asset_title}")
-                        
-                        # Click action button with retry
-                        max_retries = 3
-                        for attempt in range(max_retries):
-                            try:
-                                action_button = row.find_element(
-                                    By.CSS_SELECTOR,
-                                    YTS.ACTIONS_BUTTON
-                                )
-                                self.driver.execute_script("arguments[0].click();", action_button)
-                                time.sleep(2)
-                                break
-                            except Exception as e:
-                                if attempt == max_retries - 1:
-                                    raise e
-                                time.sleep(1)
-                        
-                        # Process the dispute with retry mechanism
-                        retry_count = 0
-                        while retry_count < 3:
-                            try:
-                                self.handle_dispute_popup(asset_title)
-                                break
-                            except Exception as e:
-                                retry_count += 1
-                                if retry_count == 3:
-                                    raise e
-                                print(f"Retrying dispute process attempt {retry_count}/3")
-                                time.sleep(2)
-                                
-                        break  # Successfully processed one claim
-                        
-                    except Exception as e:
-                        print(f"Error processing individual claim: {str(e)}")
-                        # Try to recover by closing any open dialogs
+                try:
+                    # Giới hạn số kháng cáo gửi đi của kênh này
+                    waited = self.dispute_bucket.acquire()
+                    if waited >= 1:
+                        print(f"Rate limit: waited {waited:.0f}s before next dispute")
+                    row = self.find_claim_row(claim)
+                    
+                    # Scroll row into view
+                    self.driver.execute_script("arguments[0].scrollIntoView(true);", row)
+                    
+                    # Click action button with retry
+                    max_retries = 3
+                    for attempt in range(max_retries):
                         try:
-                            actions = ActionChains(self.driver)
-                            actions.send_keys(Keys.ESCAPE).perform()
-                            time.sleep(2)
-                        except:
-                            pass
-                        continue
-                
-                if not unprocessed_found:
-                    print("All claims in this video have been processed")
-                    # Add retry mechanism for closing dialog
-                    for _ in range(3):
+                            action_button = row.find_element(
+                                By.CSS_SELECTOR,
+                                YTS.ACTIONS_BUTTON
+                            )
+                            self.driver.execute_script("arguments[0].click();", action_button)
+                            break
+                        except Exception as e:
+                            if attempt == max_retries - 1:
+                                raise e
+                            waiter.settled(label='claim row re-render')
+                            row = self.find_claim_row(claim)
+                    
+                    # Process the dispute with retry mechanism
+                    retry_count = 0
+                    while retry_count < 3:
                         try:
-                            close_button = wait.until(EC.element_to_be_clickable((
-                                By.CSS_SELECTOR, 
-                                YTS.CLOSE_DIALOG
-                            )))
-                            close_button.click()
-                            time.sleep(3)
+                            self.handle_dispute_popup(asset_title, dispute_text)
                             break
-                        except:
-                            time.sleep(1)
-                    break
+                        except Exception as e:
+                            retry_count += 1
+                            if retry_count == 3:
+                                raise e
+                            print(f"Retrying dispute process attempt {retry_count}/3")
+                            waiter.settled(label='dispute retry')
+                    dispute_ledger.record(video_id, claim_id, asset_title, SUBMITTED, dispute_text)
                     
-                time.sleep(2)
+                except Exception as e:
+                    print(f"Error processing individual claim: {str(e)}")
+                    dispute_ledger.record(video_id, claim_id, asset_title, FAILED, dispute_text)
+                    # Try to recover by closing any open dialogs
+                    try:
+                        actions = ActionChains(self.driver)
+                        actions.send_keys(Keys.ESCAPE).perform()
+                        waiter.settled(label='escape dialog')
+                    except:
+                        pass
+                
+                # Claim đã thử (kháng xong, bỏ qua hoặc lỗi) không bị quét lại trong lượt này
+                completed.add(claim_id)
+                
+                # Chờ danh sách claim cập nhật trạng thái sau khi gửi kháng cáo
+                waiter.settled(label='claims refresh')
+                self.sync_claims(claims, completed)
+            
+            print("All claims in this video have been processed")
+            # Add retry mechanism for closing dialog
+            for _ in range(3):
+                try:
+                    waiter.click(By.CSS_SELECTOR, YTS.CLOSE_DIALOG, label='close claims dialog')
+                    waiter.gone(By.CSS_SELECTOR, YTS.CLAIMS_CONTAINER, label='claims dialog closed')
+                    break
+                except:
+                    waiter.settled(label='close dialog retry')
                 
         except Exception as e:
             print(f"Error in process_copyright_claims: {str(e)}")
             raise Exception(f"Lỗi khi xử lý claim: {str(e)}")
 
-    def handle_dispute_popup(self, asset_title):
-        wait = WebDriverWait(self.driver, 10)
+    def read_claims(self):
+        return self.driver.execute_script(
+            CLAIM_ROWS_SNAPSHOT_JS, YTS.CLAIM_ROW, YTS.ASSET_TITLE, YTS.DISPUTE_STATUS) or []
+
+    def sync_claims(self, claims, completed):
+        # Chỉ cập nhật những claim có trạng thái hoặc vị trí thay đổi
+        for claim in self.read_claims():
+            known = claims.get(claim['id'])
+            if known is None:
+                continue
+            if claim['disputed'] and not known['disputed']:
+                print(f"Claim disputed: {claim['asset_title']}")
+                completed.add(claim['id'])
+            if claim['index'] != known['index'] or claim['disputed'] != known['disputed']:
+                known.update(claim)
+
+    def find_claim_row(self, claim):
+        rows = self.driver.find_elements(By.XPATH, YTS.CLAIM_ROW)
+        if claim['index'] >= len(rows):
+            raise Exception(f"Claim row not found: {claim['asset_title']}")
+        return rows[claim['index']]
+
+    def handle_dispute_popup(self, asset_title, dispute_text):
+        waiter = self.waiter
         
         try:
             # Click dispute option
-            dispute_option = wait.until(EC.visibility_of_element_located((
-                By.XPATH, 
-                YTS.DISPUTE_OPTION
-            )))
+            dispute_option = waiter.element(By.XPATH, YTS.DISPUTE_OPTION, 'clickable', label='dispute option')
             dispute_option.click()
             print(" Select Option Dispute")
-            time.sleep(1)
 
             # Click confirm 
             try:
-                confirm_btn = wait.until(EC.visibility_of_element_located((
-                    By.XPATH, YTS.CONFIRM_BUTTON
-                )))
+                confirm_btn = waiter.element(By.XPATH, YTS.CONFIRM_BUTTON, 'clickable', label='confirm button')
             except:
-                confirm_btn = wait.until(EC.visibility_of_element_located((
-                    By.XPATH, YTS.CONTINUE_BUTTON
-                )))
+                confirm_btn = waiter.element(By.XPATH, YTS.CONTINUE_BUTTON, 'clickable', label='continue button')
             confirm_btn.click()
             print("Click button to next step")
-            time.sleep(1)
 
             # Click continue Overview
-            confirm_btn_Overview = wait.until(EC.visibility_of_element_located((
-                By.XPATH,YTS.CONTINUE_BUTTON
-            )))
+            waiter.settled(label='overview step')
+            confirm_btn_Overview = waiter.element(By.XPATH, YTS.CONTINUE_BUTTON, 'clickable', label='overview continue')
             confirm_btn_Overview.click()
             print("Click button on Overview")
-            time.sleep(1)
 
             #Radio button list select
-            radio_btn_list = wait.until(EC.visibility_of_element_located((By.XPATH, YTS.RADIO_GROUP)))
+            radio_btn_list = waiter.element(By.XPATH, YTS.RADIO_GROUP, label='reason radio group')
             second_radio = radio_btn_list.find_element(By.XPATH, YTS.LICENSE_RADIO_BUTTON)
             second_radio.click()
             print("Select License radio button")
-            time.sleep(1)  
 
             # Click continue Reason
-            confirm_btn_Reason = wait.until(EC.visibility_of_element_located((
-                By.XPATH, YTS.CONTINUE_BUTTON
-            )))
+            confirm_btn_Reason = waiter.element(By.XPATH, YTS.CONTINUE_BUTTON, 'clickable', label='reason continue')
             confirm_btn_Reason.click()
             print("Click button next in Reason")
-            time.sleep(1)
 
             #Review check box tick
-            review_checkbox = wait.until(EC.visibility_of_element_located((By.XPATH, YTS.REVIEW_CHECKBOX)))
+            review_checkbox = waiter.element(By.XPATH, YTS.REVIEW_CHECKBOX, 'clickable', label='review checkbox')
             review_checkbox.click()
             print("click CheckBox accept")
-            time.sleep(1)
 
             # Click continue Details
-            continue_btn_Details = wait.until(EC.visibility_of_element_located((
-                By.XPATH, YTS.CONTINUE_BUTTON
-            )))
+            continue_btn_Details = waiter.element(By.XPATH, YTS.CONTINUE_BUTTON, 'clickable', label='details continue')
             continue_btn_Details.click()
             print("Click button Next in Details")
-            time.sleep(1)
-
-            dispute_text = self.get_dispute_text(asset_title)
-            if not dispute_text:
-                # Show dialog to get new content from user
-                reply = QMessageBox.question(
-                    None,
-                    "Nội dung kháng cáo không tìm thấy",
-                    f"Không tìm thấy nội dung kháng cáo cho video '{asset_title}'.\nBạn có muốn thêm nội dung mới không?",
-                    QMessageBox.Yes | QMessageBox.No
-                )
-                
-                if reply == QMessageBox.Yes:
-                    dialog = QInputDialog()
-                    dialog.setWindowTitle("Nhập nội dung kháng cáo")
-                    dialog.setLabelText(f"Nhập nội dung kháng cáo cho video '{asset_title}':")
-                    dialog.resize(500, 200)
-                    
-                    if dialog.exec_():
-                        dispute_text = dialog.textValue()
-                        # Save new content
-                        data = self.manager.load_data()
-                        data[asset_title] = dispute_text
-                        self.manager.save_data(data)
-                    else:
-                        print(f"Skipping dispute - user cancelled input for: {asset_title}")
-                        return
-                else:
-                    print(f"Skipping dispute - no content provided for: {asset_title}")
-                    return
 
             # Continue with the dispute process
-            textarea = wait.until(EC.visibility_of_element_located((
-                By.XPATH, YTS.RATIONALE_TEXTAREA
-            )))
+            textarea = waiter.element(By.XPATH, YTS.RATIONALE_TEXTAREA, label='rationale textarea')
             textarea.click()
             textarea.clear()
             textarea.send_keys(dispute_text)
             print("insert content coppyright to text area")
             
             # Find all checkboxes first
-            checkboxes = wait.until(EC.presence_of_all_elements_located((
-                By.XPATH, YTS.FORM_CHECKBOXES
-            )))
+            waiter.element(By.XPATH, YTS.FORM_CHECKBOXES, 'present', label='form checkboxes')
+            checkboxes = self.driver.find_elements(By.XPATH, YTS.FORM_CHECKBOXES)
 
             # Click each checkbox in order
             for i, checkbox in enumerate(checkboxes[:3]):  # Limit to first 3 checkboxes
                 print(f"Clicking checkbox {i+1}")
                 checkbox.click()
-                time.sleep(1)
+                waiter.settled(quiet_ms=100, timeout=1, label='checkbox toggled')
 
             # Fill signature
-            signature = wait.until(EC.presence_of_element_located(
-                (By.ID, YTS.SIGNATURE_FIELD)))
+            signature = waiter.element(By.ID, YTS.SIGNATURE_FIELD, 'present', label='signature field')
             signature.send_keys("Khanhtbk")
             print("Đã nhập signature")
             
             # Submit dispute
-            submit_btn = wait.until(EC.element_to_be_clickable(
-                (By.ID, YTS.SUBMIT_BUTTON)))
+            submit_btn = waiter.element(By.ID, YTS.SUBMIT_BUTTON, 'clickable', label='submit button')
             submit_btn.click()
             print("Click button accept")
             print("Đang kiểm tra thông tin BQ khác...")
@@ -2496,26 +2822,21 @@ class AntiBQWorker(QThread):
 
             while retry_count < max_retries:
                 try:
-                    close_Dispute_submitted = wait.until(EC.element_to_be_clickable((
-                        By.XPATH, YTS.CLOSE_SUMBITIED_DISPUTE
-                    )))
+                    close_Dispute_submitted = waiter.element(By.XPATH, YTS.CLOSE_SUMBITIED_DISPUTE, 'clickable',
+                                                             label='dispute submitted')
                     self.driver.execute_script("arguments[0].click();", close_Dispute_submitted)
-                    time.sleep(3)
                     
                     # Kiểm tra nếu nút close đã biến mất
-                    try:
-                        wait.until_not(EC.presence_of_element_located((
-                            By.XPATH, YTS.CLOSE_SUMBITIED_DISPUTE
-                        )))
+                    if waiter.gone(By.XPATH, YTS.CLOSE_SUMBITIED_DISPUTE, label='submitted dialog closed'):
                         print("Close button successfully disappeared")
                         break
-                    except TimeoutException:
-                        retry_count += 1
-                        if retry_count == max_retries:
-                            # Thử phương án khác nếu không click được
-                            actions = ActionChains(self.driver)
-                            actions.send_keys(Keys.ESCAPE).perform()
-                            time.sleep(1)
+
+                    retry_count += 1
+                    if retry_count == max_retries:
+                        # Thử phương án khác nếu không click được
+                        actions = ActionChains(self.driver)
+                        actions.send_keys(Keys.ESCAPE).perform()
+                        waiter.settled(label='escape dialog')
                 except Exception:
                     break
 
@@ -2540,15 +2861,9 @@ class AntiBQWorker(QThread):
             By.XPATH, 
             YTS.NEXT_PAGE_CONTINUE
         )
+        first_row_text = self.driver.find_element(By.CSS_SELECTOR, YTS.VIDEO_ROW).text
         next_button.click()
-        time.sleep(2)  # Wait for page load
-
-    def show_continue_dialog(self, message):
-        reply = QMessageBox.question(self, 'Tiếp tục?', message,
-                                   QMessageBox.Yes | QMessageBox.No)
-        return reply == QMessageBox.Yes
-
-    def show_confirmation_dialog(self, title, message):
-        reply = QMessageBox.question(self, title, message,
-                                   QMessageBox.Yes | QMessageBox.No)
-        return reply == QMessageBox.Yes
\ No newline at end of file
+        # Wait for page load: hàng đầu của trang cũ được thay bằng video khác
+        self.waiter.until(
+            lambda driver: driver.find_element(By.CSS_SELECTOR, YTS.VIDEO_ROW).text != first_row_text,
+            label='next page load')
\ No newline at end of file
@@ -0,0 +1,160 @@
+import os
+import re
+import csv
+import json
+from datetime import datetime
+
+
+# Giới hạn của YouTube Studio
+MAX_TITLE_LENGTH = 100
+MAX_DESCRIPTION_LENGTH = 5000
+MAX_TAGS_LENGTH = 500
+THUMBNAIL_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
+PUBLISH_FORMATS = ('%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S', '%d/%m/%Y %H:%M')
+
+VIDEO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+# Tên cột được chấp nhận -> tên trường chuẩn
+COLUMN_ALIASES = {
+    'key': 'key', 'file': 'key', 'filename': 'key', 'file_name': 'key', 'video_id': 'key', 'id': 'key',
+    'title': 'title',
+    'description': 'description', 'desc': 'description',
+    'tags': 'tags',
+    'thumbnail': 'thumbnail', 'thumb': 'thumbnail',
+    'playlist': 'playlist',
+    'publish_at': 'publish_at', 'publish_time': 'publish_at', 'schedule': 'publish_at',
+}
+
+
+def parse_publish_time(value):
+    for fmt in PUBLISH_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class VideoManifest:
+    """Per-video metadata read from a CSV or JSONL file.
+
+    Rows are keyed by file name or video id and are always streamed from
+    disk, so validation and editing never hold the whole manifest in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.base_dir = os.path.dirname(os.path.abspath(path))
+
+    def rows(self):
+        # (số dòng, row đã chuẩn hóa), đọc dần từ file
+        if self.path.lower().endswith(('.jsonl', '.ndjson')):
+            yield from self._jsonl_rows()
+        else:
+            yield from self._csv_rows()
+
+    def _csv_rows(self):
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, self._normalize(record)
+
+    def _jsonl_rows(self):
+        with open(self.path, 'r', encoding='utf-8-sig') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, {'error': f"JSON không hợp lệ: {e}"}
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, {'error': "Mỗi dòng phải là một object JSON"}
+                    continue
+                yield line_number, self._normalize(record)
+
+    def _normalize(self, record):
+        row = {'key': '', 'title': None, 'description': None, 'tags': None,
+               'thumbnail': None, 'playlist': None, 'publish_at': None}
+        for column, value in record.items():
+            field = COLUMN_ALIASES.get(str(column).strip().lower())
+            if not field or value is None:
+                continue
+            if field == 'tags' and isinstance(value, list):
+                value = ','.join(str(tag) for tag in value)
+            value = str(value).strip()
+            if value:
+                row[field] = value
+        row['key'] = row['key'] or ''
+        if row['thumbnail'] and not os.path.isabs(row['thumbnail']):
+            row['thumbnail'] = os.path.join(self.base_dir, row['thumbnail'])
+        return row
+
+    def is_video_id(self, key):
+        return bool(VIDEO_ID_PATTERN.match(key)) and not os.path.splitext(key)[1]
+
+    def match_name(self, key):
+        # Studio đặt tiêu đề mặc định của video mới upload bằng tên file bỏ đuôi
+        return os.path.splitext(os.path.basename(key))[0]
+
+    def validate_row(self, row, now=None):
+        if 'error' in row:
+            return [row['error']]
+        errors = []
+        if not row['key']:
+            errors.append("Thiếu tên file hoặc video id")
+        title = row['title']
+        if title is not None:
+            if len(title) > MAX_TITLE_LENGTH:
+                errors.append(f"Tiêu đề dài {len(title)} ký tự (tối đa {MAX_TITLE_LENGTH})")
+            if '<' in title or '>' in title:
+                errors.append("Tiêu đề không được chứa < hoặc >")
+        description = row['description']
+        if description is not None:
+            if len(description) > MAX_DESCRIPTION_LENGTH:
+                errors.append(f"Mô tả dài {len(description)} ký tự (tối đa {MAX_DESCRIPTION_LENGTH})")
+            if '<' in description or '>' in description:
+                errors.append("Mô tả không được chứa < hoặc >")
+        if row['tags'] is not None and len(row['tags']) > MAX_TAGS_LENGTH:
+            errors.append(f"Tag dài {len(row['tags'])} ký tự (tối đa {MAX_TAGS_LENGTH})")
+        thumbnail = row['thumbnail']
+        if thumbnail is not None:
+            if not thumbnail.lower().endswith(THUMBNAIL_EXTENSIONS):
+                errors.append(f"Thumbnail không phải ảnh: {thumbnail}")
+            elif not os.path.isfile(thumbnail):
+                errors.append(f"Không tìm thấy thumbnail: {thumbnail}")
+        if row['publish_at'] is not None:
+            publish_at = parse_publish_time(row['publish_at'])
+            if publish_at is None:
+                errors.append(f"Thời gian đăng không hợp lệ: {row['publish_at']}")
+            elif publish_at <= (now or datetime.now()):
+                errors.append(f"Thời gian đăng đã qua: {row['publish_at']}")
+        return errors
+
+    def validate(self, max_errors=50):
+        """Check every row against Studio limits in one streaming pass.
+
+        Returns (row_count, errors) where errors is a list of "line N: ..."
+        strings, truncated to max_errors.
+        """
+        now = datetime.now()
+        errors = []
+        keys = set()
+        count = 0
+        try:
+            for line_number, row in self.rows():
+                count += 1
+                problems = self.validate_row(row, now)
+                key = row.get('key')
+                if key:
+                    if key in keys:
+                        problems.append(f"Trùng khóa: {key}")
+                    keys.add(key)
+                for problem in problems:
+                    if len(errors) < max_errors:
+                        errors.append(f"Dòng {line_number}: {problem}")
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            errors.append(f"Không đọc được manifest: {e}")
+        return count, errors
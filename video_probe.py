@@ -0,0 +1,284 @@
+import os
+import mmap
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Các box MP4 chứa box con cần đi vào
+MP4_CONTAINERS = (b'moov', b'trak', b'mdia', b'mvex')
+
+# ID phần tử EBML (Matroska/WebM)
+EBML_HEADER = 0x1A45DFA3
+EBML_DOCTYPE = 0x4282
+MKV_SEGMENT = 0x18538067
+MKV_INFO = 0x1549A966
+MKV_TIMECODE_SCALE = 0x2AD7B1
+MKV_DURATION = 0x4489
+MKV_TRACKS = 0x1654AE6B
+MKV_TRACK_ENTRY = 0xAE
+MKV_VIDEO = 0xE0
+MKV_PIXEL_WIDTH = 0xB0
+MKV_PIXEL_HEIGHT = 0xBA
+MKV_CLUSTER = 0x1F43B675
+
+
+class ProbeError(Exception):
+    pass
+
+
+def _mp4_boxes(data, start, end):
+    # (loại box, vị trí dữ liệu, vị trí kết thúc) của các box nằm trong [start, end)
+    offset = start
+    while offset + 8 <= end:
+        size, kind = struct.unpack_from('>I4s', data, offset)
+        header = 8
+        if size == 1:
+            if offset + 16 > end:
+                raise ProbeError("Box MP4 bị cắt")
+            size = struct.unpack_from('>Q', data, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header:
+            raise ProbeError(f"Box MP4 {kind!r} hỏng")
+        if offset + size > end:
+            raise ProbeError(f"File bị cắt giữa box {kind.decode('latin-1')}")
+        yield kind, offset + header, offset + size
+        offset += size
+
+
+def _probe_mp4(data):
+    info = {}
+    kinds = set()
+    for kind, body, end in _mp4_boxes(data, 0, len(data)):
+        kinds.add(kind)
+        if kind == b'moov':
+            _read_moov(data, body, end, info)
+    if b'moov' not in kinds:
+        raise ProbeError("Thiếu box moov (file chưa ghi xong?)")
+    if b'mdat' not in kinds:
+        raise ProbeError("Thiếu dữ liệu video (box mdat)")
+    if not info.get('duration') and info.get('fragment_duration') and info.get('timescale'):
+        # MP4 phân mảnh: mvhd ghi 0, thời lượng thật nằm trong mvex/mehd
+        info['duration'] = info['fragment_duration'] / info['timescale']
+    if not info.get('duration') and b'moof' not in kinds:
+        raise ProbeError("Không đọc được thời lượng (mvhd)")
+    # MP4 phân mảnh không có mehd: Studio vẫn nhận, chỉ không biết thời lượng
+    return {key: info[key] for key in ('duration', 'width', 'height') if info.get(key)}
+
+
+def _read_moov(data, start, end, info):
+    for kind, body, box_end in _mp4_boxes(data, start, end):
+        if kind == b'mvhd':
+            version = data[body]
+            if version == 1:
+                timescale, duration = struct.unpack_from('>IQ', data, body + 20)
+            else:
+                timescale, duration = struct.unpack_from('>II', data, body + 12)
+            if timescale:
+                info['timescale'] = timescale
+                if duration:
+                    info['duration'] = duration / timescale
+        elif kind == b'mehd':
+            fmt = '>Q' if data[body] == 1 else '>I'
+            info['fragment_duration'] = struct.unpack_from(fmt, data, body + 4)[0]
+        elif kind == b'tkhd' and not info.get('width'):
+            # Chiều rộng/cao (fixed 16.16) nằm ở 8 byte cuối của tkhd
+            width, height = struct.unpack_from('>II', data, box_end - 8)
+            if width and height:
+                info['width'], info['height'] = width >> 16, height >> 16
+        elif kind in MP4_CONTAINERS:
+            _read_moov(data, body, box_end, info)
+
+
+def _vint(data, offset, end, keep_marker):
+    if offset >= end:
+        raise ProbeError("File MKV bị cắt")
+    first = data[offset]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8 or offset + length > end:
+        raise ProbeError("Phần tử EBML hỏng")
+    value = first if keep_marker else first & (mask - 1)
+    unknown = value == mask - 1
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+        unknown = unknown and byte == 0xFF
+    return value, offset + length, unknown
+
+
+def _ebml_elements(data, start, end):
+    # (id, vị trí dữ liệu, vị trí kết thúc); kích thước "không xác định" kéo tới hết vùng cha
+    offset = start
+    while offset < end:
+        element_id, offset, _ = _vint(data, offset, end, True)
+        size, offset, unknown = _vint(data, offset, end, False)
+        element_end = end if unknown else offset + size
+        yield element_id, offset, element_end, unknown
+        offset = element_end
+
+
+def _ebml_uint(data, start, end):
+    return int.from_bytes(data[start:end], 'big')
+
+
+def _probe_mkv(data):
+    info = {}
+    elements = _ebml_elements(data, 0, len(data))
+    element_id, body, end, _ = next(elements)
+    if element_id != EBML_HEADER:
+        raise ProbeError("Thiếu EBML header")
+    for child_id, child, child_end, _ in _ebml_elements(data, body, end):
+        if child_id == EBML_DOCTYPE and data[child:child_end] not in (b'matroska', b'webm'):
+            raise ProbeError(f"DocType lạ: {data[child:child_end]!r}")
+
+    for element_id, body, end, unknown in elements:
+        if element_id != MKV_SEGMENT:
+            continue
+        if not unknown and end > len(data):
+            raise ProbeError("File bị cắt giữa Segment")
+        _read_segment(data, body, min(end, len(data)), info)
+        break
+    else:
+        raise ProbeError("Thiếu Segment")
+    if not info.get('duration'):
+        raise ProbeError("Không đọc được thời lượng (Segment/Info)")
+    return info
+
+
+def _read_segment(data, start, end, info):
+    for element_id, body, element_end, unknown in _ebml_elements(data, start, end):
+        if element_end > end:
+            raise ProbeError("File bị cắt giữa Segment")
+        if element_id == MKV_INFO:
+            scale = 1000000
+            duration = None
+            for child_id, child, child_end, _ in _ebml_elements(data, body, element_end):
+                if child_id == MKV_TIMECODE_SCALE:
+                    scale = _ebml_uint(data, child, child_end)
+                elif child_id == MKV_DURATION:
+                    fmt = '>d' if child_end - child == 8 else '>f'
+                    duration = struct.unpack_from(fmt, data, child)[0]
+            if duration:
+                info['duration'] = duration * scale / 1e9
+        elif element_id == MKV_TRACKS:
+            _read_tracks(data, body, element_end, info)
+        elif element_id == MKV_CLUSTER:
+            # Info và Tracks luôn đứng trước cluster đầu tiên khi file ghi đúng chuẩn
+            if 'duration' in info or unknown:
+                break
+
+
+def _read_tracks(data, start, end, info):
+    for entry_id, entry, entry_end, _ in _ebml_elements(data, start, end):
+        if entry_id != MKV_TRACK_ENTRY:
+            continue
+        for child_id, child, child_end, _ in _ebml_elements(data, entry, entry_end):
+            if child_id != MKV_VIDEO:
+                continue
+            for video_id, value, value_end, _ in _ebml_elements(data, child, child_end):
+                if video_id == MKV_PIXEL_WIDTH:
+                    info['width'] = _ebml_uint(data, value, value_end)
+                elif video_id == MKV_PIXEL_HEIGHT:
+                    info['height'] = _ebml_uint(data, value, value_end)
+            return
+
+
+def _probe_avi(data):
+    # RIFF 'AVI ' -> LIST 'hdrl' -> 'avih' nằm ở vị trí cố định
+    riff_size = struct.unpack_from('<I', data, 4)[0]
+    if riff_size + 8 > len(data):
+        raise ProbeError("File AVI bị cắt")
+    if len(data) < 72 or data[24:28] != b'avih':
+        raise ProbeError("Thiếu header avih")
+    micro_per_frame, = struct.unpack_from('<I', data, 32)
+    total_frames, = struct.unpack_from('<I', data, 48)
+    width, height = struct.unpack_from('<II', data, 64)
+    if not micro_per_frame or not total_frames:
+        raise ProbeError("Không đọc được thời lượng (avih)")
+    return {'duration': micro_per_frame * total_frames / 1e6, 'width': width, 'height': height}
+
+
+def probe_video(path):
+    """Read duration, resolution and bitrate from a video's container headers.
+
+    The file is memory-mapped and only header boxes/elements are touched,
+    so a multi-GB file costs a few page reads. Returns a dict with path,
+    size, duration, width, height, bitrate and error (None when the file
+    looks uploadable).
+    """
+    result = {'path': path, 'size': 0, 'duration': None, 'width': None, 'height': None,
+              'bitrate': None, 'error': None}
+    try:
+        result['size'] = os.path.getsize(path)
+        if not result['size']:
+            raise ProbeError("File rỗng")
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:4] == b'\x1a\x45\xdf\xa3':
+                info = _probe_mkv(data)
+            elif data[:4] == b'RIFF' and data[8:12] == b'AVI ':
+                info = _probe_avi(data)
+            elif data[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip'):
+                info = _probe_mp4(data)
+            else:
+                raise ProbeError("Không nhận ra định dạng MP4/MKV/AVI")
+        result.update(info)
+        if result['duration']:
+            result['bitrate'] = result['size'] * 8 / result['duration']
+    except ProbeError as e:
+        result['error'] = str(e)
+    except (OSError, ValueError, IndexError, struct.error) as e:
+        result['error'] = f"Không đọc được file: {e}"
+    return result
+
+
+def format_probe(result):
+    if result['error']:
+        return result['error']
+    parts = ["không rõ thời lượng"]
+    if result['duration']:
+        minutes, seconds = divmod(int(result['duration']), 60)
+        hours, minutes = divmod(minutes, 60)
+        parts = [f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"]
+    if result['width'] and result['height']:
+        parts.append(f"{result['width']}x{result['height']}")
+    if result['bitrate']:
+        parts.append(f"{result['bitrate'] / 1e6:.1f} Mbps")
+    size_mb = result['size'] / 1024 ** 2
+    parts.append(f"{size_mb / 1024:.2f} GB" if size_mb >= 1024 else f"{size_mb:.0f} MB")
+    return " · ".join(parts)
+
+
+class VideoProber:
+    """Probe container headers of many files in a thread pool.
+
+    mmap reads release the GIL while waiting on disk, so threads overlap
+    the seeks of files spread over slow or network drives.
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def probe_many(self, paths):
+        paths = list(paths)
+        if len(paths) < 2:
+            return [probe_video(path) for path in paths]
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return list(self.executor.map(probe_video, paths))
+
+    def shutdown(self):
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+
+video_prober = VideoProber()
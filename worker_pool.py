@@ -0,0 +1,95 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+import socket
+
+
+def find_free_port():
+    # Hỏi hệ điều hành một cổng trống để mỗi phiên Chrome có cổng debug riêng
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class ChannelWorkerPool(QObject):
+    """Run one QThread worker per channel, at most max_workers at a time.
+
+    Two channels that share a browser profile are never run together, so every
+    running session owns its profile and debugging port.
+    """
+    channel_started = pyqtSignal(object)
+    channel_progress = pyqtSignal(object, int, str)
+    channel_finished = pyqtSignal(object, bool, str)
+    all_finished = pyqtSignal()
+
+    def __init__(self, worker_factory, profile_key, max_workers=2, parent=None):
+        super().__init__(parent)
+        self.worker_factory = worker_factory
+        self.profile_key = profile_key
+        self.max_workers = max(1, max_workers)
+        self.pending = []
+        self.running = {}
+        self.done_workers = []
+        self.errors = {}
+        self.busy_profiles = set()
+        self.total = 0
+        self.finished_count = 0
+        self.active = False
+
+    def start(self, channel_frames):
+        self.pending = list(channel_frames)
+        self.done_workers = []
+        self.errors = {}
+        self.total = len(self.pending)
+        self.finished_count = 0
+        self.active = True
+        self._fill()
+
+    def is_running(self):
+        return bool(self.running or self.pending)
+
+    def set_max_workers(self, max_workers):
+        self.max_workers = max(1, max_workers)
+        # Pool đang rảnh chỉ lưu giá trị cho lượt sau
+        if self.active:
+            self._fill()
+
+    def _fill(self):
+        index = 0
+        while index < len(self.pending) and len(self.running) < self.max_workers:
+            channel_frame = self.pending[index]
+            key = self.profile_key(channel_frame)
+            if key in self.busy_profiles:
+                # Profile đang được kênh khác dùng, để lại chờ lượt sau
+                index += 1
+                continue
+            self.pending.pop(index)
+            self._start_channel(channel_frame, key)
+
+        if self.active and not self.running and not self.pending:
+            self.active = False
+            self.all_finished.emit()
+
+    def _start_channel(self, channel_frame, key):
+        worker = self.worker_factory(channel_frame, find_free_port())
+        self.running[channel_frame] = (worker, key)
+        self.busy_profiles.add(key)
+
+        worker.progress_updated.connect(
+            lambda value, message, frame=channel_frame: self.channel_progress.emit(frame, value, message))
+        worker.error_occurred.connect(
+            lambda error, frame=channel_frame: self.errors.__setitem__(frame, error))
+        worker.finished.connect(lambda frame=channel_frame: self._on_worker_finished(frame))
+
+        self.channel_started.emit(channel_frame)
+        worker.start()
+
+    def _on_worker_finished(self, channel_frame):
+        worker, key = self.running.pop(channel_frame, (None, None))
+        # Giữ tham chiếu để QThread không bị hủy khi vừa kết thúc
+        self.done_workers.append(worker)
+        self.busy_profiles.discard(key)
+        self.finished_count += 1
+
+        error = self.errors.get(channel_frame, "")
+        self.channel_finished.emit(channel_frame, not error, error)
+        self._fill()